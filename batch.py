@@ -0,0 +1,214 @@
+"""Пакетный OCR (+ перевод) без GUI для архивов скриншотов и сканов.
+
+Тот же пайплайн, что у хоткея: ocr.preprocess_for_ocr -> OCR (Windows OCR с
+фоллбеком на Tesseract или только Tesseract) -> translater.translate_text.
+Изображения обрабатываются в ProcessPoolExecutor, в каждом процессе движки
+прогреваются один раз (initializer), результаты пишутся построчно в JSONL по
+мере готовности. Повторный запуск с тем же --output пропускает уже
+обработанные файлы, так что прерванный ночной прогон можно продолжить.
+
+    python batch.py screenshots/ --output results.jsonl
+    python batch.py "scans/**/*.png" --lang en --translate --workers 4 --output out.jsonl
+    python ocr.py batch screenshots/ --output results.jsonl
+
+Строка результата: {"path", "ok", "text", "translation", "lang", "engine",
+"timings_ms": {...}, "error", "worker"}.
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp"}
+# Сколько задач держать в очереди на процесс (чтобы не создавать 100k futures сразу)
+PENDING_PER_WORKER = 4
+
+_CYRILLIC_RE = re.compile(r"[А-Яа-яЁё]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+def collect_images(inputs, recursive=True):
+    """Файлы изображений из каталогов, масок и путей; отсортированы, без повторов."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*") if recursive else os.path.join(item, "*")
+            candidates = glob.glob(pattern, recursive=recursive)
+        elif glob.has_magic(item):
+            candidates = glob.glob(item, recursive=True)
+        else:
+            candidates = [item]
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def load_done(output_path, retry_failed=False):
+    """Пути, уже записанные в JSONL (для продолжения прерванного прогона)."""
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # недописанная строка после прерывания
+            if record.get("ok") or not retry_failed:
+                done.add(record.get("path"))
+    return done
+
+
+def guess_direction(text, lang):
+    """Направление перевода как у хоткея: ru -> en, иначе en -> ru (universal — по алфавиту)."""
+    if lang == "universal":
+        lang = "ru" if len(_CYRILLIC_RE.findall(text)) >= len(_LATIN_RE.findall(text)) else "en"
+    return ("ru", "en") if lang == "ru" else ("en", "ru")
+
+
+# --- процесс-воркер ---
+_worker = {}
+
+
+def _init_worker(engine, lang, translate):
+    """Прогрев в каждом процессе: Qt без окна, OCR движок, переводчик."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import logging
+    from PyQt5 import QtGui
+    import ocr
+    # Построчные INFO-логи предобработки на тысячах файлов только мешают
+    logging.getLogger().setLevel(logging.WARNING)
+
+    _worker["app"] = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([sys.argv[0]])
+    _worker.update(engine=engine, lang=lang, translate=translate, ocr=ocr)
+    ocr.ensure_tesseract()
+    if engine == "windows":
+        if lang == "universal":
+            ocr._get_universal_ocr_engine()
+        else:
+            ocr._get_windows_ocr_engine({"en": "en-US", "ru": "ru-RU"}.get(lang, lang))
+    if translate:
+        import translater
+        _worker["translater"] = translater
+        config = translater.get_cached_translator_config()
+        translator_engine = config.get("translator_engine", "Google").lower()
+        if translator_engine == "argos":
+            translater.warm_up_argos()
+        else:
+            translater.warm_up_http(translator_engine)
+
+
+def process_image(path):
+    """Один файл: загрузка -> предобработка -> OCR -> перевод. Не бросает исключений."""
+    from PyQt5 import QtGui
+    ocr = _worker["ocr"]
+    lang = _worker["lang"]
+    record = {"path": path, "ok": False, "text": "", "translation": None, "lang": lang,
+              "engine": None, "timings_ms": {}, "error": None, "worker": os.getpid()}
+    timings = record["timings_ms"]
+    try:
+        started = time.perf_counter()
+        qimage = QtGui.QImage(path)
+        if qimage.isNull():
+            raise ValueError("cannot read image")
+        timings["load"] = (time.perf_counter() - started) * 1000
+        qimage = ocr.preprocess_for_ocr(qimage, timings)
+        started = time.perf_counter()
+        text, record["engine"] = ocr.recognize_image(qimage, lang, _worker["engine"])
+        timings["ocr"] = (time.perf_counter() - started) * 1000
+        record["text"] = text.strip()
+        if _worker["translate"] and record["text"]:
+            source_code, target_code = guess_direction(record["text"], lang)
+            started = time.perf_counter()
+            record["translation"] = _worker["translater"].translate_text(record["text"], source_code, target_code)
+            timings["translate"] = (time.perf_counter() - started) * 1000
+            record["direction"] = f"{source_code}-{target_code}"
+        record["ok"] = True
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def run_batch(paths, output, engine="windows", lang="ru", translate=False, workers=None, progress=True):
+    """Обрабатывает paths и дописывает результаты в output (JSONL). Возвращает сводку."""
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    summary = {"total": len(paths), "ok": 0, "failed": 0}
+    started = time.perf_counter()
+    out = open(output, "a", encoding="utf-8") if output else sys.stdout
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(engine, lang, translate))
+    pending = set()
+    queue = iter(paths)
+    try:
+        while True:
+            # Ограниченное окно задач: память не растёт с размером архива
+            for path in queue:
+                pending.add(executor.submit(process_image, path))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    break
+            if not pending:
+                break
+            finished, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                summary["ok" if record["ok"] else "failed"] += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()  # строка на диске сразу — прогон можно прервать в любой момент
+            if progress:
+                done = summary["ok"] + summary["failed"]
+                print(f"\r{done}/{len(paths)} processed, {summary['failed']} failed", end="", file=sys.stderr)
+    except KeyboardInterrupt:
+        for future in pending:
+            future.cancel()
+        summary["interrupted"] = True
+    finally:
+        executor.shutdown(wait=not summary.get("interrupted"), cancel_futures=True)
+        if out is not sys.stdout:
+            out.close()
+        if progress:
+            print(file=sys.stderr)
+    summary["elapsed_sec"] = time.perf_counter() - started
+    summary["images_per_sec"] = (summary["ok"] + summary["failed"]) / summary["elapsed_sec"] if paths else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch OCR (+ translation) over image files")
+    parser.add_argument("inputs", nargs="+", help="каталоги, маски (\"dir/**/*.png\") или файлы")
+    parser.add_argument("--output", "-o", help="JSONL с результатами (по умолчанию stdout, без продолжения)")
+    parser.add_argument("--engine", choices=("windows", "tesseract"), default=None,
+                        help="по умолчанию — ocr_engine из config.json")
+    parser.add_argument("--lang", choices=("ru", "en", "universal"), default="ru", help="язык текста на изображениях")
+    parser.add_argument("--translate", action="store_true", help="переводить распознанный текст")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-recursive", action="store_true")
+    parser.add_argument("--retry-failed", action="store_true", help="повторить файлы с ошибкой из прошлого прогона")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    engine = args.engine
+    if engine is None:
+        import ocr
+        engine = ocr.get_cached_ocr_config().get("ocr_engine", "Windows").lower()
+
+    paths = collect_images(args.inputs, recursive=not args.no_recursive)
+    done = load_done(args.output, retry_failed=args.retry_failed)
+    todo = [p for p in paths if p not in done]
+    if not args.quiet:
+        print(f"{len(paths)} images found, {len(paths) - len(todo)} already processed, {len(todo)} to go",
+              file=sys.stderr)
+    summary = run_batch(todo, args.output, engine=engine, lang=args.lang, translate=args.translate,
+                        workers=args.workers, progress=not args.quiet)
+    summary["skipped"] = len(paths) - len(todo)
+    if not args.quiet:
+        print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary["failed"] or summary.get("interrupted") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
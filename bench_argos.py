@@ -0,0 +1,120 @@
+"""Бенчмарк офлайн-перевода: сегменты/сек на CPU.
+
+Сравнивает прежний путь (Argos, translation.translate() на каждый сегмент)
+с пакетным OfflineTranslationEngine при разных настройках ctranslate2:
+
+    python bench_argos.py
+    python bench_argos.py --direction en-ru --segments 200 --beam-size 1 --intra-threads 4
+    python bench_argos.py --json
+
+Требует установленных моделей Argos ru<->en.
+"""
+import argparse
+import json
+import sys
+import time
+
+import translater
+
+SAMPLE_SEGMENTS = {
+    "ru": [
+        "Нажмите кнопку, чтобы продолжить.",
+        "Файл не найден.",
+        "Настройки сохранены успешно.",
+        "Подключение к серверу потеряно, повторите попытку позже.",
+        "Выберите область экрана с текстом.",
+        "Версия 2.4.1 доступна для загрузки.",
+        "Сегодня хорошая погода.",
+        "Ошибка при чтении конфигурации.",
+    ],
+    "en": [
+        "Click the button to continue.",
+        "File not found.",
+        "Settings saved successfully.",
+        "Connection to the server was lost, please try again later.",
+        "Select an area of the screen with text.",
+        "Version 2.4.1 is available for download.",
+        "The weather is nice today.",
+        "Error while reading the configuration.",
+    ],
+}
+
+
+def make_segments(source_code, count):
+    base = SAMPLE_SEGMENTS[source_code]
+    # Номер в конце делает сегменты уникальными (без выигрыша от дедупликации)
+    return [f"{base[i % len(base)]} ({i})" for i in range(count)]
+
+
+def bench_per_call(source_code, target_code, segments):
+    translation_obj = translater._get_translation_object(source_code, target_code)
+    if translation_obj is None:
+        raise RuntimeError(f"No Argos model for {source_code}->{target_code}")
+    translation_obj.translate(segments[0])  # загрузка модели вне замера
+    started = time.perf_counter()
+    for segment in segments:
+        translation_obj.translate(segment)
+    return time.perf_counter() - started
+
+
+def bench_batched(source_code, target_code, segments, settings):
+    engine = translater.OfflineTranslationEngine(source_code, target_code, **settings)
+    engine.load()  # загрузка модели вне замера
+    started = time.perf_counter()
+    engine.translate_segments(segments)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    defaults = translater.get_offline_engine_settings()
+    parser = argparse.ArgumentParser(description="Argos offline translation throughput benchmark")
+    parser.add_argument("--direction", default="ru-en", choices=("ru-en", "en-ru"))
+    parser.add_argument("--segments", type=int, default=100)
+    parser.add_argument("--inter-threads", type=int, default=defaults["inter_threads"])
+    parser.add_argument("--intra-threads", type=int, default=defaults["intra_threads"])
+    parser.add_argument("--beam-size", type=int, default=defaults["beam_size"])
+    parser.add_argument("--compute-type", default=defaults["compute_type"])
+    parser.add_argument("--max-batch-size", type=int, default=defaults["max_batch_size"])
+    parser.add_argument("--skip-per-call", action="store_true", help="не замерять прежний путь")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not translater.models_installed_ru_en():
+        print("Argos ru<->en models are not installed", file=sys.stderr)
+        return 2
+
+    source_code, target_code = args.direction.split("-")
+    segments = make_segments(source_code, args.segments)
+    settings = {
+        "inter_threads": args.inter_threads,
+        "intra_threads": args.intra_threads,
+        "beam_size": args.beam_size,
+        "compute_type": args.compute_type,
+        "max_batch_size": args.max_batch_size,
+    }
+
+    results = {"direction": args.direction, "segments": len(segments), "settings": settings}
+    if not args.skip_per_call:
+        elapsed = bench_per_call(source_code, target_code, segments)
+        results["per_call_sec"] = elapsed
+        results["per_call_segments_per_sec"] = len(segments) / elapsed
+    elapsed = bench_batched(source_code, target_code, segments, settings)
+    results["batched_sec"] = elapsed
+    results["batched_segments_per_sec"] = len(segments) / elapsed
+    if "per_call_sec" in results:
+        results["speedup"] = results["per_call_sec"] / elapsed
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.direction}, {len(segments)} segments, settings: {settings}")
+        if "per_call_sec" in results:
+            print(f"  per-call (Argos):  {results['per_call_segments_per_sec']:8.1f} seg/s  ({results['per_call_sec']:.2f} s)")
+        print(f"  batched (ct2):     {results['batched_segments_per_sec']:8.1f} seg/s  ({results['batched_sec']:.2f} s)")
+        if "speedup" in results:
+            print(f"  speedup:           {results['speedup']:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
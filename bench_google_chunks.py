@@ -0,0 +1,157 @@
+"""Проверка POST/чанкинга Google-адаптера на локальном сервере-заглушке.
+
+Поднимает http.server, который отвечает в формате translate_a/single
+(перевод = текст в верхнем регистре) со случайной задержкой, чтобы ответы
+приходили не по порядку. Проверяет, что:
+
+* запросы идут POST-ом, текст — в теле, а не в URL;
+* каждый кусок не длиннее GOOGLE_CHUNK_CHARS;
+* склеенный результат совпадает с ожидаемым (порядок кусков сохранён);
+* куски отправляются параллельно.
+
+    python bench_google_chunks.py
+    python bench_google_chunks.py --chars 20000 --delay-ms 80 --json
+
+Код возврата 1, если проверка не прошла.
+"""
+import argparse
+import concurrent.futures
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import translater
+
+SENTENCES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "Настройки сохранены успешно!",
+    "Connection to the server was lost, please try again later.",
+    "Is this the real life?",
+    "Версия 2.4.1 доступна для загрузки…",
+]
+
+
+class StandInState:
+    def __init__(self, delay_ms):
+        self.delay_ms = delay_ms
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.get_requests = 0
+        self.active = 0
+        self.max_active = 0
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with state.lock:
+                state.get_requests += 1
+            self.send_error(414 if len(self.path) > 2000 else 405)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = urllib.parse.parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+            text = body.get('q', [''])[0]
+            with state.lock:
+                state.chunks.append(text)
+                state.active += 1
+                state.max_active = max(state.max_active, state.active)
+            time.sleep(random.uniform(0, state.delay_ms) / 1000.0)
+            with state.lock:
+                state.active -= 1
+            payload = json.dumps([[[text.upper(), text, None, None]], None, "auto"]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def make_text(chars, rng):
+    parts = []
+    total = 0
+    while total < chars:
+        sentence = rng.choice(SENTENCES)
+        sep = "\n" if rng.random() < 0.15 else " "
+        parts.append(sentence + sep)
+        total += len(sentence) + 1
+    return ''.join(parts)
+
+
+def run(text, workers):
+    translater._google_chunk_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    started = time.perf_counter()
+    result = translater._google_request(text, 'en', 'ru')
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Google adapter chunking check against a local stand-in server")
+    parser.add_argument("--chars", type=int, default=10000)
+    parser.add_argument("--delay-ms", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    state = StandInState(args.delay_ms)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    translater.GOOGLE_TRANSLATE_URL = f'http://127.0.0.1:{server.server_address[1]}/translate_a/single'
+
+    text = make_text(args.chars, random.Random(args.seed))
+    problems = []
+    try:
+        sequential, sequential_sec = run(text, 1)
+        state.chunks.clear()
+        state.max_active = 0
+        parallel, parallel_sec = run(text, translater.HTTP_POOL_MAXSIZE)
+    finally:
+        server.shutdown()
+        translater._google_chunk_executor = None
+
+    expected = text.upper()
+    if parallel != expected or sequential != expected:
+        problems.append("stitched translation does not match the source order")
+    if state.get_requests:
+        problems.append(f"{state.get_requests} GET requests were sent")
+    longest = max((len(c) for c in state.chunks), default=0)
+    if longest > translater.GOOGLE_CHUNK_CHARS:
+        problems.append(f"chunk of {longest} chars exceeds {translater.GOOGLE_CHUNK_CHARS}")
+    if len(state.chunks) > 1 and state.max_active < 2:
+        problems.append("chunks were not sent in parallel")
+
+    results = {
+        "chars": len(text),
+        "chunks": len(state.chunks),
+        "longest_chunk": longest,
+        "max_parallel": state.max_active,
+        "sequential_sec": sequential_sec,
+        "parallel_sec": parallel_sec,
+        "problems": problems,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['chars']} chars -> {results['chunks']} chunks (longest {longest}, "
+              f"limit {translater.GOOGLE_CHUNK_CHARS}), up to {state.max_active} in parallel")
+        print(f"  sequential: {sequential_sec * 1000:8.1f} ms")
+        print(f"  parallel:   {parallel_sec * 1000:8.1f} ms")
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        if not problems:
+            print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
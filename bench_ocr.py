@@ -0,0 +1,293 @@
+"""Бенчмарк OCR: точность (CER/WER), задержка по этапам и пиковая память.
+
+Корпус — изображения экранного текста с эталонным текстом: разные шрифты,
+размеры, тёмная/светлая тема, кириллица/латиница, числа. По умолчанию
+корпус рендерится детерминированно через QPainter (описание в SAMPLES),
+свой корпус (например, настоящие скриншоты) задаётся каталогом с
+manifest.json: [{"file": "a.png", "text": "...", "lang": "ru"}, ...].
+
+Каждое доступное CPU-движок (Tesseract, Windows OCR) прогоняется через тот
+же пайплайн, что и захват (ocr.preprocess_for_ocr), без окна:
+
+    python bench_ocr.py
+    python bench_ocr.py --engine tesseract --json --output ocr_results.json
+    python bench_ocr.py --corpus my_screens/ --baseline ocr_results.json
+
+С --baseline сравнивает с прошлым прогоном и возвращает код 1, если CER
+вырос больше чем на --cer-tolerance или медианная задержка этапа — больше
+чем на --latency-tolerance.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from PyQt5 import QtCore, QtGui
+
+import ocr
+
+THEMES = {
+    "light": ("#ffffff", "#000000"),
+    "dark": ("#1e1e1e", "#d4d4d4"),
+}
+
+# (текст, язык, шрифт, размер pt, тема)
+SAMPLES = [
+    ("Файл не найден", "ru", "Segoe UI", 9, "light"),
+    ("Настройки сохранены успешно", "ru", "Segoe UI", 11, "dark"),
+    ("Подключение к серверу потеряно", "ru", "Arial", 14, "light"),
+    ("Выберите область экрана с текстом", "ru", "Times New Roman", 12, "dark"),
+    ("Версия 2.4.1 от 12.03.2024", "ru", "Consolas", 10, "light"),
+    ("Итого: 1 254,90 руб.", "ru", "Arial", 20, "dark"),
+    ("Щёлкните правой кнопкой мыши", "ru", "Segoe UI", 8, "light"),
+    ("File not found", "en", "Segoe UI", 9, "dark"),
+    ("Settings saved successfully", "en", "Arial", 11, "light"),
+    ("Connection to the server was lost", "en", "Times New Roman", 14, "dark"),
+    ("Error 404 at line 1273", "en", "Consolas", 10, "dark"),
+    ("Total: $3,499.00 (incl. VAT 20%)", "en", "Arial", 12, "light"),
+    ("The quick brown fox jumps over the lazy dog", "en", "Segoe UI", 20, "light"),
+    ("Click the button to continue", "en", "Segoe UI", 8, "dark"),
+]
+
+
+# --- корпус ---
+def render_sample(text, font_family, point_size, theme):
+    background, foreground = THEMES[theme]
+    font = QtGui.QFont(font_family, point_size)
+    metrics = QtGui.QFontMetrics(font)
+    width = metrics.horizontalAdvance(text) + 12
+    height = metrics.height() + 8
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor(background))
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+    painter.setFont(font)
+    painter.setPen(QtGui.QColor(foreground))
+    painter.drawText(image.rect(), QtCore.Qt.AlignCenter, text)
+    painter.end()
+    return image
+
+
+def generate_corpus(directory):
+    os.makedirs(directory, exist_ok=True)
+    manifest = []
+    for i, (text, lang, font, size, theme) in enumerate(SAMPLES):
+        name = f"{i:02d}_{lang}_{theme}_{size}pt.png"
+        render_sample(text, font, size, theme).save(os.path.join(directory, name))
+        manifest.append({"file": name, "text": text, "lang": lang, "font": font, "size": size, "theme": theme})
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_corpus(directory):
+    with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- метрики ---
+def levenshtein(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def normalize_text(text):
+    return ' '.join(text.split())
+
+
+def error_rates(reference, hypothesis):
+    """(правки символов, длина эталона, правки слов, число слов эталона)."""
+    reference, hypothesis = normalize_text(reference), normalize_text(hypothesis)
+    ref_words, hyp_words = reference.split(), hypothesis.split()
+    return levenshtein(reference, hypothesis), len(reference), levenshtein(ref_words, hyp_words), len(ref_words)
+
+
+# --- движки ---
+def available_engines():
+    engines = {}
+    try:
+        if ocr.configure_tesseract(download_models=False):
+            engines["tesseract"] = lambda qimage, lang: ocr.recognize_tesseract_text(qimage, lang)
+    except ImportError:
+        pass
+    if ocr._WINRT_AVAILABLE:
+        def windows(qimage, lang):
+            return ocr.recognize_windows_text(ocr.qimage_to_softwarebitmap(qimage), lang)
+        engines["windows"] = windows
+    return engines
+
+
+def process_peak_rss():
+    """Пиковый RSS процесса в байтах (None, если недоступно)."""
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", None) or info.rss
+    except ImportError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def run_sample(corpus_dir, entry, recognize):
+    timings = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    qimage = QtGui.QImage(os.path.join(corpus_dir, entry["file"]))
+    timings["load"] = (time.perf_counter() - started) * 1000
+    qimage = ocr.preprocess_for_ocr(qimage, timings)
+    text = ""
+    if recognize is not None:
+        started = time.perf_counter()
+        text = recognize(qimage, entry.get("lang", "ru"))
+        timings["recognize"] = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, timings, peak
+
+
+def bench_engine(corpus_dir, corpus, name, recognize, repeat):
+    stage_samples = {}
+    char_edits = char_total = word_edits = word_total = 0
+    by_group = {}
+    samples = []
+    peak_python = 0
+    for entry in corpus:
+        text = ""
+        for _ in range(repeat):
+            text, timings, peak = run_sample(corpus_dir, entry, recognize)
+            peak_python = max(peak_python, peak)
+            for stage, ms in timings.items():
+                stage_samples.setdefault(stage, []).append(ms)
+        sample = {"file": entry["file"], "recognized": text}
+        if recognize is not None:
+            ce, cn, we, wn = error_rates(entry["text"], text)
+            char_edits += ce
+            char_total += cn
+            word_edits += we
+            word_total += wn
+            sample.update(cer=ce / max(cn, 1), wer=we / max(wn, 1))
+            for key in ("lang", "theme"):
+                if key in entry:
+                    group = by_group.setdefault(f"{key}={entry[key]}", [0, 0])
+                    group[0] += ce
+                    group[1] += cn
+        samples.append(sample)
+
+    stages = {
+        stage: {"p50_ms": statistics.median(values), "p95_ms": sorted(values)[int(0.95 * (len(values) - 1))],
+                "total_ms": sum(values)}
+        for stage, values in stage_samples.items()
+    }
+    result = {"stages": stages, "peak_python_bytes": peak_python, "samples": samples}
+    if recognize is not None:
+        result.update(
+            cer=char_edits / max(char_total, 1),
+            wer=word_edits / max(word_total, 1),
+            cer_by_group={group: edits / max(total, 1) for group, (edits, total) in sorted(by_group.items())},
+        )
+    return result
+
+
+def compare_with_baseline(results, baseline, cer_tolerance, latency_tolerance):
+    problems = []
+    for name, current in results["engines"].items():
+        previous = baseline.get("engines", {}).get(name)
+        if previous is None:
+            continue
+        if "cer" in current and "cer" in previous and current["cer"] > previous["cer"] + cer_tolerance:
+            problems.append(f"{name}: CER {previous['cer']:.3f} -> {current['cer']:.3f}")
+        for stage, stats in current["stages"].items():
+            before = previous.get("stages", {}).get(stage)
+            if before and before["p50_ms"] > 0.05 and stats["p50_ms"] > before["p50_ms"] * (1 + latency_tolerance):
+                problems.append(f"{name}: stage '{stage}' p50 {before['p50_ms']:.2f} -> {stats['p50_ms']:.2f} ms")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCR accuracy/latency benchmark (offscreen)")
+    parser.add_argument("--corpus", help="каталог с manifest.json (по умолчанию — сгенерированный корпус)")
+    parser.add_argument("--generate", action="store_true", help="сгенерировать корпус в --corpus")
+    parser.add_argument("--engine", action="append", help="tesseract / windows / none (только предобработка)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="JSON прошлого прогона для проверки регрессий")
+    parser.add_argument("--cer-tolerance", type=float, default=0.01)
+    parser.add_argument("--latency-tolerance", type=float, default=0.25)
+    parser.add_argument("--output")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication(sys.argv[:1])
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)  # пайплайн логирует каждый этап
+
+    corpus_dir = args.corpus or os.path.join(tempfile.gettempdir(), "clickntranslate_ocr_corpus")
+    if args.generate or not args.corpus:
+        generate_corpus(corpus_dir)
+    corpus = load_corpus(corpus_dir)
+
+    engines = available_engines()
+    engines["none"] = None
+    selected = args.engine or list(engines)
+    missing = [name for name in selected if name not in engines]
+    if missing:
+        print(f"OCR engine(s) not available: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    results = {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "corpus": corpus_dir,
+                 "samples": len(corpus), "repeat": args.repeat, "qt_platform": app.platformName()},
+        "engines": {},
+    }
+    for name in selected:
+        results["engines"][name] = bench_engine(corpus_dir, corpus, name, engines[name], args.repeat)
+    results["meta"]["peak_rss_bytes"] = process_peak_rss()
+
+    problems = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare_with_baseline(results, json.load(f), args.cer_tolerance, args.latency_tolerance)
+    results["problems"] = problems
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"Corpus: {len(corpus)} images ({corpus_dir}), repeat {args.repeat}")
+        for name, r in results["engines"].items():
+            accuracy = f"CER {r['cer']:.3f}  WER {r['wer']:.3f}" if "cer" in r else "preprocessing only"
+            print(f"{name}: {accuracy}  peak python alloc {r['peak_python_bytes'] / 1024:.0f} KiB")
+            for stage, stats in r["stages"].items():
+                print(f"  {stage:10s} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+            for group, cer in r.get("cer_by_group", {}).items():
+                print(f"  CER {group:12s} {cer:.3f}")
+        rss = results["meta"]["peak_rss_bytes"]
+        if rss:
+            print(f"Peak RSS: {rss / 1024 / 1024:.1f} MiB")
+        for problem in problems:
+            print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
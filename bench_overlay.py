@@ -0,0 +1,155 @@
+"""Бенчмарк отрисовки оверлея выделения: время кадра при перетаскивании рамки.
+
+Оверлей растягивается на виртуальный рабочий стол заданного размера
+(по умолчанию 7680x2160 — два 4K монитора), затем имитируется
+перетаскивание: mousePress и серия mouseMove, после каждого события
+обрабатывается очередь (в т.ч. отрисовка). Для каждого кадра меряется время
+и площадь перерисованной области. Сравниваются частичная перерисовка
+(ScreenCaptureOverlay.PARTIAL_REPAINT) и полная, как было раньше, а также
+частичная в режиме frozen_screen_capture (фон — снимок экрана; снимок здесь
+синтетический, т.к. offscreen-платформа не умеет захватывать экран).
+
+    python bench_overlay.py
+    python bench_overlay.py --width 11520 --height 2160 --steps 300 --json
+
+Без дисплея работает с QT_QPA_PLATFORM=offscreen (выставляется автоматически).
+Абсолютные числа на Windows выше (layered window), но соотношение то же.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+import ocr
+
+
+def summarize(values):
+    ordered = sorted(values)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {"p50": pct(50), "p90": pct(90), "p99": pct(99), "mean": statistics.fmean(ordered), "max": ordered[-1]}
+
+
+def drag_path(width, height, steps):
+    """Диагональное перетаскивание с небольшими шагами, как рукой."""
+    start = QtCore.QPoint(width // 5, height // 5)
+    end = QtCore.QPoint(width // 5 + width // 3, height // 5 + height // 3)
+    points = []
+    for i in range(1, steps + 1):
+        t = i / steps
+        points.append(QtCore.QPoint(int(start.x() + (end.x() - start.x()) * t),
+                                    int(start.y() + (end.y() - start.y()) * t)))
+    return start, points
+
+
+def synthetic_snapshot(width, height):
+    """Два «монитора» с градиентом вместо настоящего снимка экрана."""
+    shots = []
+    half = width // 2
+    for x in (0, half):
+        pixmap = QtGui.QPixmap(half, height)
+        painter = QtGui.QPainter(pixmap)
+        gradient = QtGui.QLinearGradient(0, 0, half, height)
+        gradient.setColorAt(0, QtGui.QColor("#1e1e1e"))
+        gradient.setColorAt(1, QtGui.QColor("#f0f0f0"))
+        painter.fillRect(pixmap.rect(), gradient)
+        painter.end()
+        shots.append((QtCore.QRect(x, 0, half, height), pixmap, 1.0))
+    return shots
+
+
+def run(app, width, height, steps, partial, frozen=False):
+    ocr.ScreenCaptureOverlay.PARTIAL_REPAINT = partial
+    overlay = ocr.ScreenCaptureOverlay(mode="copy", defer_show=True)
+    overlay.setGeometry(0, 0, width, height)
+    if frozen:
+        overlay._frozen_shots = synthetic_snapshot(width, height)
+    overlay.show()
+    app.processEvents()
+
+    painted = []
+    original_paint = overlay.paintEvent
+
+    def counting_paint(event):
+        painted.append(sum(r.width() * r.height() for r in event.region().rects()))
+        original_paint(event)
+
+    overlay.paintEvent = counting_paint
+    start, points = drag_path(width, height, steps)
+
+    def send(event_type, pos, button):
+        buttons = QtCore.Qt.LeftButton
+        event = QtGui.QMouseEvent(event_type, QtCore.QPointF(pos), button, buttons, QtCore.Qt.NoModifier)
+        QtWidgets.QApplication.sendEvent(overlay, event)
+
+    send(QtCore.QEvent.MouseButtonPress, start, QtCore.Qt.LeftButton)
+    app.processEvents()
+    frame_ms = []
+    for pos in points:
+        painted_before = len(painted)
+        started = time.perf_counter()
+        send(QtCore.QEvent.MouseMove, pos, QtCore.Qt.NoButton)
+        app.processEvents()
+        if len(painted) > painted_before:
+            frame_ms.append((time.perf_counter() - started) * 1000)
+    overlay.start_point = None  # mouseRelease не шлём: он запустил бы OCR
+    overlay.hide()
+    overlay.deleteLater()
+    app.processEvents()
+    pixels = painted[1:] or [0]
+    return {
+        "frames": len(frame_ms),
+        "frame_ms": summarize(frame_ms) if frame_ms else None,
+        "painted_pixels_mean": statistics.fmean(pixels),
+        "screen_pixels": width * height,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Selection overlay frame-time benchmark")
+    parser.add_argument("--width", type=int, default=7680)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--output", help="сохранить результаты в JSON файл")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    results = {
+        "desktop": f"{args.width}x{args.height}",
+        "platform": QtGui.QGuiApplication.platformName(),
+        "full_repaint": run(app, args.width, args.height, args.steps, partial=False),
+        "partial_repaint": run(app, args.width, args.height, args.steps, partial=True),
+        "frozen_partial": run(app, args.width, args.height, args.steps, partial=True, frozen=True),
+    }
+    ocr.ScreenCaptureOverlay.PARTIAL_REPAINT = True
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Overlay drag on {results['desktop']} ({results['platform']}), {args.steps} mouse moves")
+        for name in ("full_repaint", "partial_repaint", "frozen_partial"):
+            r = results[name]
+            f = r["frame_ms"] or {}
+            share = r["painted_pixels_mean"] / r["screen_pixels"] * 100
+            print(f"  {name:16} p50 {f.get('p50', 0):7.2f}  p90 {f.get('p90', 0):7.2f}  p99 {f.get('p99', 0):7.2f} ms"
+                  f"  repainted {share:5.1f}% of the desktop per frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Проверка памяти оверлеев перевода: 1000 захватов подряд не должны копить окна.
+
+Имитирует длинную сессию в режиме translation_display_mode = "overlay":
+show_translation_dialog вызывается N раз с разными переводами, часть оверлеев
+пользователь закрывает кликом, часть остаётся открытой до вытеснения. После
+каждого блока захватов считаются живые QWidget и память Python (tracemalloc).
+
+Проверки (код выхода 1, если хоть одна не прошла):
+* живых виджетов не больше, чем помещается в TranslationOverlayPool
+  (MAX_VISIBLE + MAX_IDLE окон);
+* память во второй половине прогона не растёт больше, чем на --max-growth-kb.
+
+    python bench_overlay_memory.py
+    python bench_overlay_memory.py --captures 5000 --json
+
+Без дисплея работает с QT_QPA_PLATFORM=offscreen (выставляется автоматически).
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from PyQt5 import QtWidgets
+
+import config_store
+
+
+def sample_translation(i):
+    words = ["overlay", "перевод", "capture", "строка", "memory", "окно"]
+    return "\n".join(" ".join(words[(i + j + k) % len(words)] for k in range(6 + i % 5)) for j in range(1 + i % 4))
+
+
+def live_state(app):
+    app.processEvents()
+    # deleteLater выполняется в цикле событий — отдельный проход для DeferredDelete
+    QtWidgets.QApplication.sendPostedEvents(None, 52)  # QEvent.DeferredDelete
+    app.processEvents()
+    gc.collect()
+    return len(QtWidgets.QApplication.allWidgets()), tracemalloc.get_traced_memory()[0]
+
+
+def run(app, captures, close_every):
+    import main
+    pool = main.get_translation_overlay_pool()
+    parent = QtWidgets.QWidget()  # в приложении это оверлей выделения из пула
+    widgets_before, _ = live_state(app)
+    samples = []
+    for i in range(captures):
+        text = sample_translation(i)
+        main.show_translation_dialog(parent, text, auto_copy=False, theme="Темная",
+                                     coords={"x": 40 + i % 300, "y": 60, "width": 420, "height": 160},
+                                     original_text=text)
+        if close_every and i % close_every == 0 and pool.visible:
+            pool.visible[-1].close()  # клик по оверлею
+        if (i + 1) % max(1, captures // 10) == 0:
+            widgets, memory = live_state(app)
+            samples.append({"captures": i + 1, "widgets": widgets - widgets_before, "python_bytes": memory})
+    return samples, dict(pool.stats), pool
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translation overlay memory regression check")
+    parser.add_argument("--captures", type=int, default=1000)
+    parser.add_argument("--close-every", type=int, default=3, help="закрывать каждый N-й оверлей кликом (0 — никогда)")
+    parser.add_argument("--max-growth-kb", type=float, default=256.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    config_store._store = config_store.ConfigStore(
+        data={"translation_display_mode": "overlay", "overlay_opacity": 85}, persist=False)
+
+    tracemalloc.start()
+    samples, stats, pool = run(app, args.captures, args.close_every)
+    tracemalloc.stop()
+
+    # Один оверлей = окно + QTextBrowser с его viewport и полосами прокрутки
+    per_overlay = len(pool.visible[0].findChildren(QtWidgets.QWidget)) + 1 if pool.visible else 0
+    widget_limit = (pool.MAX_VISIBLE + pool.MAX_IDLE) * per_overlay
+    half = samples[len(samples) // 2]["python_bytes"]
+    growth_kb = (samples[-1]["python_bytes"] - half) / 1024
+    checks = {
+        "widgets_bounded": samples[-1]["widgets"] <= widget_limit,
+        "memory_flat": growth_kb <= args.max_growth_kb,
+    }
+    results = {"captures": args.captures, "pool": stats, "widget_limit": widget_limit,
+               "second_half_growth_kb": growth_kb, "samples": samples, "checks": checks}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.captures} simulated captures, pool {stats}")
+        for s in samples:
+            print(f"  after {s['captures']:6}: {s['widgets']:4} live widgets, python heap {s['python_bytes'] / 1024:9.1f} KB")
+        print(f"  widgets <= {widget_limit}: {'ok' if checks['widgets_bounded'] else 'FAIL'};"
+              f" second-half growth {growth_kb:.1f} KB: {'ok' if checks['memory_flat'] else 'FAIL'}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Бенчмарк обновления оверлея перевода на больших переводах.
+
+Сценарии (для каждого — время одного обновления, p50/p90/max):
+* zoom       — Ctrl+колесо: тот же текст, другой размер шрифта;
+* live_same  — Live режим прислал тот же перевод с теми же метриками;
+* live_new   — Live режим прислал новый перевод.
+
+Режим legacy повторяет прежнее поведение: на каждое обновление заново
+разбиваем текст на абзацы, строим HTML и разбираем его через setHtml.
+
+    python bench_overlay_render.py
+    python bench_overlay_render.py --lines 400 --repeat 50 --json
+
+Без дисплея работает с QT_QPA_PLATFORM=offscreen (выставляется автоматически).
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from PyQt5 import QtWidgets
+
+import main
+
+
+def summarize(values):
+    ordered = sorted(values)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {"p50": pct(50), "p90": pct(90), "max": ordered[-1], "mean": statistics.fmean(ordered)}
+
+
+def make_translation(lines, seed=0):
+    words = ["перевод", "оверлей", "строка", "документ", "шрифт", "экран", "текст", "абзац"]
+    out = []
+    for i in range(lines):
+        n = 6 + (i * 7 + seed) % 9
+        out.append(" ".join(words[(i + k + seed) % len(words)] for k in range(n)))
+    return "\n".join(out)
+
+
+def legacy_update(overlay):
+    main._PARAGRAPH_CACHE.clear()
+    overlay.text_browser.setHtml(main.format_translation_html(
+        overlay.translated_text, overlay.text_color, overlay.current_font_size, overlay.current_line_height))
+
+
+def timed(app, repeat, step):
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        step(i)
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def run(app, lines, repeat, legacy):
+    texts = [make_translation(lines, seed) for seed in range(repeat + 1)]
+    overlay = main.TranslationOverlay(texts[0], 0, 0, 900, 700, font_size=14, line_height=1.35)
+    overlay.show()
+    app.processEvents()
+    update = legacy_update if legacy else (lambda ov: ov._update_html())
+    results = {}
+
+    def zoom(i):
+        overlay.current_font_size = 12 + i % 8
+        update(overlay)
+    results["zoom"] = timed(app, repeat, zoom)
+
+    def live_same(i):
+        overlay.translated_text, overlay.current_font_size = texts[0], 14
+        update(overlay)
+    live_same(0)
+    results["live_same"] = timed(app, repeat, live_same)
+
+    def live_new(i):
+        overlay.translated_text = texts[i + 1]
+        update(overlay)
+    results["live_new"] = timed(app, repeat, live_new)
+
+    overlay.close()
+    overlay.deleteLater()
+    return results
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Translation overlay update benchmark")
+    parser.add_argument("--lines", type=int, default=200, help="строк в переводе")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--output", help="сохранить результаты в JSON файл")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = {
+        "lines": args.lines,
+        "chars": len(make_translation(args.lines)),
+        "legacy": run(app, args.lines, args.repeat, legacy=True),
+        "cached": run(app, args.lines, args.repeat, legacy=False),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Translation overlay updates, {results['lines']} lines / {results['chars']} chars")
+        for scenario in ("zoom", "live_same", "live_new"):
+            old, new = results["legacy"][scenario], results["cached"][scenario]
+            print(f"  {scenario:10} legacy p50 {old['p50']:8.2f} ms   cached p50 {new['p50']:8.2f} ms"
+                  f"   (p90 {old['p90']:.2f} -> {new['p90']:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,127 @@
+"""Бенчмарк холодного старта main.py на основе `python -X importtime`.
+
+Запускает импорт модуля в чистом интерпретаторе, разбирает отчёт importtime
+и проверяет бюджет старта:
+
+    python bench_startup.py                 # отчёт + проверка бюджета
+    python bench_startup.py --budget-ms 250 # свой бюджет
+    python bench_startup.py --json          # машиночитаемый вывод
+
+Код возврата 1, если бюджет превышен или при старте импортирован модуль из
+списка ленивых (LAZY_MODULES) — так регрессия ловится в CI/перед релизом.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Бюджет на импорт main.py (без создания QApplication), мс
+DEFAULT_BUDGET_MS = 400
+
+# Модули, которые НЕ должны импортироваться при старте (грузятся лениво/в фоне)
+LAZY_MODULES = (
+    "requests",
+    "argostranslate",
+    "ctranslate2",
+    "sentencepiece",
+    "stanza",
+    "translater",
+    "settings_window",
+    "psutil",
+    "webbrowser",
+)
+
+
+def run_importtime(module="main", runs=3):
+    """Импортирует module в отдельном процессе runs раз, возвращает лучший прогон.
+
+    Результат: {"total_us": int, "modules": {name: (self_us, cumulative_us)}}.
+    """
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=repo_dir,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, QT_QPA_PLATFORM="offscreen"),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+        result = parse_importtime(proc.stderr, module)
+        if best is None or result["total_us"] < best["total_us"]:
+            best = result
+    return best
+
+
+def parse_importtime(stderr_text, module="main"):
+    """Разбирает строки вида 'import time: self [us] | cumulative | imported package'."""
+    modules = {}
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # строка-заголовок
+        name = parts[2].strip()
+        modules[name] = (self_us, cumulative_us)
+    total_us = modules.get(module, (0, 0))[1]
+    return {"total_us": total_us, "modules": modules}
+
+
+def check_budget(result, budget_ms=DEFAULT_BUDGET_MS):
+    """Возвращает список нарушений (пустой — всё в порядке)."""
+    problems = []
+    total_ms = result["total_us"] / 1000.0
+    if total_ms > budget_ms:
+        problems.append(f"startup import time {total_ms:.1f} ms exceeds budget {budget_ms} ms")
+    for name in result["modules"]:
+        top = name.split(".")[0]
+        if top in LAZY_MODULES:
+            problems.append(f"module '{name}' is imported eagerly at startup")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for main.py")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run_importtime(args.module, args.runs)
+    problems = check_budget(result, args.budget_ms)
+    heaviest = sorted(result["modules"].items(), key=lambda kv: kv[1][0], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "total_ms": result["total_us"] / 1000.0,
+            "budget_ms": args.budget_ms,
+            "heaviest": [{"module": name, "self_ms": s / 1000.0, "cumulative_ms": c / 1000.0}
+                         for name, (s, c) in heaviest],
+            "problems": problems,
+        }, ensure_ascii=False, indent=2))
+    else:
+        print(f"import {args.module}: {result['total_us'] / 1000.0:.1f} ms (budget {args.budget_ms} ms)")
+        print("Heaviest modules (self time):")
+        for name, (self_us, cumulative_us) in heaviest:
+            print(f"  {self_us / 1000.0:8.2f} ms  {cumulative_us / 1000.0:8.2f} ms  {name}")
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        if not problems:
+            print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Бенчмарк памяти переводов: построение индекса и поиск на N записях.
+
+Генерирует синтетическую историю (строки логов и интерфейса с разными
+числами/именами), затем замеряет задержку поиска для точных, нечётких и
+отсутствующих в памяти строк. Нечёткие запросы двух видов:
+
+* fuzzy — отличаются от записи только числами/именами из истории; почти все
+  решаются по точному шаблону с плейсхолдерами, без триграммного индекса;
+* word_sub / word_ins / word_del — в сохранённой строке заменено, вставлено
+  или удалено слово, которого нет в словаре истории. Такого шаблона в памяти
+  нет, поэтому поиск идёт через кандидатов по триграммам и Жаккару.
+  candidate_rate — доля запросов, для которых индекс нашёл кандидата выше
+  порога, прошедшего дешёвую проверку адаптируемости (hit — кандидат удалось
+  адаптировать, остальное — отказ адаптации).
+
+    python bench_tm.py
+    python bench_tm.py --entries 100000 --queries 2000 --json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+import translation_memory
+
+TEMPLATES = [
+    ("Error {n} at line {m}", "Ошибка {n} в строке {m}"),
+    ("Connection to {host} failed after {n} attempts", "Не удалось подключиться к {host} после {n} попыток"),
+    ("User {name} joined the channel", "Пользователь {name} присоединился к каналу"),
+    ("Downloaded {n} of {m} files", "Загружено {n} из {m} файлов"),
+    ("Welcome back, {name}!", "С возвращением, {name}!"),
+    ("Build {ident} finished in {n} seconds", "Сборка {ident} завершена за {n} секунд"),
+]
+NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi"]
+WORDS = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "lambda", "theta", "zeta"]
+# Слова, которых нет в истории: правка ими гарантированно даёт новый шаблон
+EDIT_WORDS = ["Mallory", "Trent", "Victor", "Walter", "now", "again", "remote", "quickly"]
+
+
+def _fill(template, rng):
+    return template.format(
+        n=rng.randint(0, 99999), m=rng.randint(0, 9999), name=rng.choice(NAMES),
+        host=f"srv{rng.randint(1, 500)}.example.com", ident=f"build_{rng.randint(1, 9999)}",
+    )
+
+
+def make_pair(rng, i):
+    if i % 2:
+        src_t, tgt_t = rng.choice(TEMPLATES)
+        values = dict(n=rng.randint(0, 99999), m=rng.randint(0, 9999), name=rng.choice(NAMES),
+                      host=f"srv{rng.randint(1, 500)}.example.com", ident=f"build_{rng.randint(1, 9999)}")
+        return src_t.format(**values), tgt_t.format(**values)
+    # Уникальные фразы, чтобы индекс не состоял из одних шаблонов
+    words = rng.sample(WORDS, 4) + [str(i)]
+    source = " ".join(words).capitalize()
+    return source, f"[ru] {source}"
+
+
+def word_edit(source, kind, rng):
+    """Правка на уровне слова: sub — замена, ins — вставка, del — удаление."""
+    words = source.split()
+    pos = rng.randrange(len(words))
+    if kind == "word_sub":
+        words[pos] = rng.choice(EDIT_WORDS)
+    elif kind == "word_ins":
+        words.insert(pos, rng.choice(EDIT_WORDS))
+    elif len(words) > 3:
+        del words[pos]
+    return " ".join(words)
+
+
+def make_edit_queries(memory, pairs, kind, count, rng):
+    """Запросы-правки, шаблона которых нет в памяти (только путь через триграммы)."""
+    queries = []
+    while len(queries) < count:
+        query = word_edit(rng.choice(pairs)[0], kind, rng)
+        if translation_memory.mask_placeholders(query)[0] not in memory._templates:
+            queries.append(query)
+    return queries
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translation memory benchmark")
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=translation_memory.DEFAULT_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    memory = translation_memory.TranslationMemory(threshold=args.threshold)
+    pairs = [make_pair(rng, i) for i in range(args.entries)]
+    started = time.perf_counter()
+    for source, translation in pairs:
+        memory.add(source, translation)
+    build_sec = time.perf_counter() - started
+
+    queries = {
+        "exact": [rng.choice(pairs)[0] for _ in range(args.queries)],
+        "fuzzy": [_fill(rng.choice(TEMPLATES)[0], rng) for _ in range(args.queries)],
+        "miss": [f"Completely unrelated sentence number {rng.random()}" for _ in range(args.queries)],
+    }
+    for kind in ("word_sub", "word_ins", "word_del"):
+        queries[kind] = make_edit_queries(memory, pairs, kind, args.queries, rng)
+    results = {"entries": len(memory), "build_sec": build_sec, "threshold": args.threshold, "lookups": {}}
+    for kind, texts in queries.items():
+        timings = []
+        hits = 0
+        candidates_before = memory.stats["fuzzy_hits"] + memory.stats["rejected"]
+        for text in texts:
+            t0 = time.perf_counter()
+            if memory.lookup(text) is not None:
+                hits += 1
+            timings.append((time.perf_counter() - t0) * 1000)
+        results["lookups"][kind] = {
+            "hit_rate": hits / len(texts),
+            # fuzzy_hits считает и попадания по шаблону, поэтому только для правок
+            "candidate_rate": ((memory.stats["fuzzy_hits"] + memory.stats["rejected"] - candidates_before) / len(texts)
+                               if kind.startswith("word_") else None),
+            "p50_ms": statistics.median(timings),
+            "p95_ms": percentile(timings, 95),
+            "max_ms": max(timings),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['entries']} entries indexed in {build_sec:.2f} s (threshold {args.threshold})")
+        for kind, r in results["lookups"].items():
+            candidate = f"{r['candidate_rate']:6.1%}" if r["candidate_rate"] is not None else "     -"
+            print(f"  {kind:8s} hit {r['hit_rate']:6.1%}  candidate {candidate}  p50 {r['p50_ms']:7.3f} ms  "
+                  f"p95 {r['p95_ms']:7.3f} ms  max {r['max_ms']:7.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""Бенчмарк движков перевода на локальных mock-серверах.
+
+Для каждого онлайн-движка поднимается http.server в формате его API
+(Google translate_a/single, MyMemory /get, Lingva /api/v1, LibreTranslate
+/translate) с настраиваемым профилем: задержка, разброс, доля ошибок 500 и
+доля ответов 429. Адаптеры translater.py направляются на эти серверы, так
+что замеряется весь клиентский путь: пул соединений, асинхронный клиент,
+квоты, фоллбеки, словарь и память переводов.
+
+Сценарии:
+  adapters        — каждый адаптер отдельно (+ Argos, если модели установлены);
+  translate_text  — сквозная задержка translate_text по движкам;
+  fallback        — основной движок отвечает 500: цена перехода на запасной;
+  throttle        — основной движок отвечает 429: проактивный обход по квотам;
+  cache           — повторяющаяся нагрузка: доля ответов без HTTP (словарь/TM).
+
+    python bench_translation.py
+    python bench_translation.py --requests 200 --profile google=latency:40,jitter:10,error:0.05
+    python bench_translation.py --scenario fallback --scenario cache --output bench_results.json
+
+Данные (словарь, квоты) пишутся во временный каталог, data/ не трогается.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config_store
+import dictionary
+import quota
+import translater
+import translation_memory
+
+ONLINE_ENGINES = ("google", "mymemory", "lingva", "libretranslate")
+SCENARIOS = ("adapters", "translate_text", "fallback", "throttle", "cache")
+
+DEFAULT_PROFILES = {
+    "google": {"latency": 40.0, "jitter": 10.0, "error": 0.0, "throttle": 0.0},
+    "mymemory": {"latency": 80.0, "jitter": 20.0, "error": 0.0, "throttle": 0.0},
+    "lingva": {"latency": 120.0, "jitter": 30.0, "error": 0.0, "throttle": 0.0},
+    "libretranslate": {"latency": 150.0, "jitter": 30.0, "error": 0.0, "throttle": 0.0},
+}
+
+SAMPLE_TEXTS = [
+    "Connection to the server was lost",
+    "File not found",
+    "Settings saved successfully",
+    "Click the button to continue",
+    "Select an area of the screen with text",
+    "The weather is nice today",
+]
+
+
+# --- mock-серверы ---
+class MockEngine:
+    """Состояние одного mock-сервера: профиль и счётчики."""
+
+    def __init__(self, name, profile, seed=0):
+        self.name = name
+        self.profile = dict(profile)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.server = None
+
+    def respond(self, text):
+        """Возвращает (status, перевод) согласно профилю и ждёт задержку."""
+        with self.lock:
+            self.requests += 1
+            roll = self.rng.random()
+            delay = max(0.0, self.rng.gauss(self.profile["latency"], self.profile["jitter"])) / 1000.0
+            if roll < self.profile["throttle"]:
+                self.throttled += 1
+                status = 429
+            elif roll < self.profile["throttle"] + self.profile["error"]:
+                self.errors += 1
+                status = 500
+            else:
+                status = 200
+        time.sleep(delay)
+        # Префикс движка позволяет понять, кто обслужил запрос
+        return status, f"{self.name}:{text.upper()}"
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+def make_handler(engine):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, как у настоящих API
+        disable_nagle_algorithm = True  # иначе заголовки и тело ждут delayed ACK (+40 мс)
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return self.rfile.read(length).decode("utf-8")
+
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            if engine.name == "mymemory" and parsed.path == "/get":
+                text = urllib.parse.parse_qs(parsed.query).get("q", [""])[0]
+                status, translated = engine.respond(text)
+                self._send(status, {"responseStatus": status, "responseData": {"translatedText": translated}})
+            elif engine.name == "lingva" and parsed.path.startswith("/api/v1/"):
+                text = urllib.parse.unquote(parsed.path.split("/", 5)[5])
+                status, translated = engine.respond(text)
+                self._send(status, {"translation": translated})
+            else:
+                self._send(404, {})
+
+        def do_POST(self):
+            parsed = urllib.parse.urlparse(self.path)
+            if engine.name == "google" and parsed.path == "/translate_a/single":
+                text = urllib.parse.parse_qs(self._read_body(), keep_blank_values=True).get("q", [""])[0]
+                status, translated = engine.respond(text)
+                self._send(status, [[[translated, text, None, None]], None, "auto"])
+            elif engine.name == "libretranslate" and parsed.path == "/translate":
+                text = json.loads(self._read_body() or "{}").get("q", "")
+                status, translated = engine.respond(text)
+                self._send(status, {"translatedText": translated})
+            else:
+                self._send(404, {})
+
+    return Handler
+
+
+def start_mock_servers(profiles, seed):
+    engines = {}
+    for i, name in enumerate(ONLINE_ENGINES):
+        engine = MockEngine(name, profiles[name], seed + i)
+        engine.server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(engine))
+        engine.server.daemon_threads = True
+        threading.Thread(target=engine.server.serve_forever, daemon=True).start()
+        engines[name] = engine
+    translater.GOOGLE_TRANSLATE_URL = f"{engines['google'].url}/translate_a/single"
+    translater.MYMEMORY_URL = f"{engines['mymemory'].url}/get"
+    translater.LINGVA_INSTANCES = [engines["lingva"].url]
+    translater.LIBRETRANSLATE_INSTANCES = [engines["libretranslate"].url]
+    return engines
+
+
+# --- окружение translater ---
+_NO_LIMITS = {name: {"rate": 1e6, "burst": 1e6, "daily_chars": None} for name in ONLINE_ENGINES}
+
+
+def use_config(**overrides):
+    """Подменяет общий конфиг (config.json не читается и не пишется)."""
+    config = {
+        "translator_engine": "Google",
+        "dictionary_fast_path": False,
+        "translation_memory": False,
+        "engine_limits": _NO_LIMITS,
+    }
+    config.update(overrides)
+    config_store._store = config_store.ConfigStore(data=config, persist=False)
+    return config
+
+
+def isolate_state(tmp_dir):
+    """Словарь, квоты и память переводов — во временном каталоге и с чистого листа."""
+    if dictionary._dictionary is not None:
+        dictionary._dictionary.close()
+    dictionary._dictionary = dictionary.OfflineDictionary(path=f"{tmp_dir}/dictionary.sqlite")
+    quota._manager = quota.QuotaManager(_NO_LIMITS, path=f"{tmp_dir}/quota_usage.json")
+    translation_memory._history_loading = True  # историю пользователя не подмешиваем
+    translation_memory._memories.clear()
+
+
+def summarize(latencies_ms):
+    if not latencies_ms:
+        return {"count": 0}
+    ordered = sorted(latencies_ms)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1],
+    }
+
+
+def timed_calls(func, texts):
+    """Вызывает func(text) для каждого текста; возвращает (латентности, результаты, ошибки)."""
+    latencies, results, errors = [], [], 0
+    for text in texts:
+        started = time.perf_counter()
+        try:
+            results.append(func(text))
+        except Exception:
+            errors += 1
+            results.append(None)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, results, errors
+
+
+def served_by(results):
+    counts = {}
+    for result in results:
+        name = result.split(":", 1)[0] if result and ":" in result else "none"
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def unique_texts(n, tag):
+    return [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} {tag} {i}" for i in range(n)]
+
+
+# --- сценарии ---
+def bench_adapters(engines, n):
+    adapters = {
+        "google": translater.google_translate,
+        "mymemory": translater.mymemory_translate,
+        "lingva": translater.lingva_translate,
+        "libretranslate": translater.libretranslate,
+    }
+    use_config()
+    results = {}
+    for name, adapter in adapters.items():
+        latencies, _, errors = timed_calls(lambda t, a=adapter: a(t, "en", "ru"), unique_texts(n, f"adapter-{name}"))
+        results[name] = dict(summarize(latencies), errors=errors)
+    results["argos"] = bench_argos(n)
+    return results
+
+
+def bench_argos(n):
+    if not translater.models_installed_ru_en():
+        return {"skipped": "Argos ru<->en models are not installed"}
+    use_config(translator_engine="Argos")
+    translater._translate_with_engines("Warm up", "en", "ru")  # загрузка модели вне замера
+    latencies, _, errors = timed_calls(lambda t: translater._translate_with_engines(t, "en", "ru"),
+                                       unique_texts(n, "argos"))
+    return dict(summarize(latencies), errors=errors)
+
+
+def bench_translate_text(engines, n):
+    results = {}
+    for name in ONLINE_ENGINES:
+        use_config(translator_engine=name)
+        latencies, outputs, errors = timed_calls(lambda t: translater.translate_text(t, "en", "ru"),
+                                                 unique_texts(n, f"e2e-{name}"))
+        results[name] = dict(summarize(latencies), errors=errors, served_by=served_by(outputs))
+    return results
+
+
+def bench_fallback(engines, n, primary="google"):
+    use_config(translator_engine=primary)
+    healthy, _, _ = timed_calls(lambda t: translater.translate_text(t, "en", "ru"), unique_texts(n, "healthy"))
+    saved = dict(engines[primary].profile)
+    engines[primary].profile["error"] = 1.0
+    try:
+        failing, outputs, errors = timed_calls(lambda t: translater.translate_text(t, "en", "ru"),
+                                               unique_texts(n, "fallback"))
+    finally:
+        engines[primary].profile = saved
+    healthy_stats, failing_stats = summarize(healthy), summarize(failing)
+    return {
+        "primary": primary,
+        "healthy": healthy_stats,
+        "primary_failing": dict(failing_stats, errors=errors, served_by=served_by(outputs)),
+        "fallback_cost_p50_ms": failing_stats["p50_ms"] - healthy_stats["p50_ms"],
+    }
+
+
+def bench_throttle(engines, n, primary="google"):
+    use_config(translator_engine=primary)
+    saved = dict(engines[primary].profile)
+    engines[primary].profile["throttle"] = 1.0
+    requests_before = engines[primary].requests
+    try:
+        latencies, outputs, errors = timed_calls(lambda t: translater.translate_text(t, "en", "ru"),
+                                                 unique_texts(n, "throttle"))
+    finally:
+        engines[primary].profile = saved
+    return dict(
+        summarize(latencies),
+        primary=primary,
+        errors=errors,
+        served_by=served_by(outputs),
+        # При проактивном обходе до 429-го движка доходят лишь единичные запросы
+        primary_requests=engines[primary].requests - requests_before,
+    )
+
+
+def make_cached_workload(n, rng):
+    """Нагрузка как у OCR логов: точные повторы, те же строки с другими числами, новые."""
+    templates = ["Error {} at line {}", "Downloaded {} of {} files", "Build {} finished in {} seconds"]
+    words = ["File", "Settings", "Cancel", "Open", "Save"]
+    seen = []
+    workload = []
+    for i in range(n):
+        roll = rng.random()
+        if seen and roll < 0.3:
+            text = rng.choice(seen)
+        elif roll < 0.7:
+            text = rng.choice(templates).format(rng.randint(1, 9999), rng.randint(1, 999))
+        elif roll < 0.85:
+            text = rng.choice(words)
+        else:
+            text = f"Unique sentence number {i} for the benchmark"
+        seen.append(text)
+        workload.append(text)
+    return workload
+
+
+def bench_cache(engines, n, seed):
+    use_config(translator_engine="google", dictionary_fast_path=True, translation_memory=True)
+    workload = make_cached_workload(n, random.Random(seed))
+    requests_before = sum(e.requests for e in engines.values())
+    hit_latencies, miss_latencies = [], []
+    for text in workload:
+        before = sum(e.requests for e in engines.values())
+        started = time.perf_counter()
+        translater.translate_text(text, "en", "ru")
+        elapsed = (time.perf_counter() - started) * 1000
+        (miss_latencies if sum(e.requests for e in engines.values()) > before else hit_latencies).append(elapsed)
+    http_requests = sum(e.requests for e in engines.values()) - requests_before
+    return {
+        "requests": n,
+        "http_requests": http_requests,
+        "hit_rate": 1 - http_requests / n if n else 0.0,
+        "hits": summarize(hit_latencies),
+        "misses": summarize(miss_latencies),
+        "dictionary": dict(dictionary.get_dictionary().stats),
+        "translation_memory": translation_memory.get_stats(),
+    }
+
+
+def parse_profile(spec):
+    """'google=latency:40,jitter:10,error:0.05' -> ('google', {...})."""
+    name, _, values = spec.partition("=")
+    if name not in DEFAULT_PROFILES:
+        raise argparse.ArgumentTypeError(f"unknown engine '{name}'")
+    profile = {}
+    for item in filter(None, values.split(",")):
+        key, _, value = item.partition(":")
+        if key not in DEFAULT_PROFILES[name]:
+            raise argparse.ArgumentTypeError(f"unknown profile key '{key}'")
+        profile[key] = float(value)
+    return name, profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translation engine benchmark against local mock servers")
+    parser.add_argument("--requests", type=int, default=50, help="запросов на сценарий/движок")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="по умолчанию — все")
+    parser.add_argument("--profile", action="append", type=parse_profile, default=[],
+                        help="engine=latency:MS,jitter:MS,error:RATE,throttle:RATE")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="записать JSON с результатами в файл")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    profiles = {name: dict(profile) for name, profile in DEFAULT_PROFILES.items()}
+    for name, profile in args.profile:
+        profiles[name].update(profile)
+
+    engines = start_mock_servers(profiles, args.seed)
+    scenarios = args.scenario or list(SCENARIOS)
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "seed": args.seed,
+            "profiles": profiles,
+        },
+    }
+    # translater печатает выбранный движок на каждый перевод — в отчёт это не нужно
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        for scenario in scenarios:
+            isolate_state(tmp_dir)
+            if scenario == "adapters":
+                results[scenario] = bench_adapters(engines, args.requests)
+            elif scenario == "translate_text":
+                results[scenario] = bench_translate_text(engines, args.requests)
+            elif scenario == "fallback":
+                results[scenario] = bench_fallback(engines, args.requests)
+            elif scenario == "throttle":
+                results[scenario] = bench_throttle(engines, args.requests)
+            elif scenario == "cache":
+                results[scenario] = bench_cache(engines, args.requests, args.seed)
+            quota.get_quota_manager().flush()
+        dictionary.get_dictionary().close()
+    results["connections"] = translater.get_connection_stats()
+    results["mock_servers"] = {name: {"requests": e.requests, "errors": e.errors, "throttled": e.throttled}
+                               for name, e in engines.items()}
+    for engine in engines.values():
+        engine.server.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_summary(results)
+    return 0
+
+
+def _fmt(stats):
+    if not stats.get("count"):
+        return "no samples"
+    return (f"p50 {stats['p50_ms']:7.1f}  p90 {stats['p90_ms']:7.1f}  p99 {stats['p99_ms']:7.1f}  "
+            f"mean {stats['mean_ms']:7.1f} ms")
+
+
+def print_summary(results):
+    if "adapters" in results:
+        print("Adapters:")
+        for name, stats in results["adapters"].items():
+            line = stats["skipped"] if "skipped" in stats else f"{_fmt(stats)}  errors {stats['errors']}"
+            print(f"  {name:15s} {line}")
+    if "translate_text" in results:
+        print("translate_text end-to-end:")
+        for name, stats in results["translate_text"].items():
+            print(f"  {name:15s} {_fmt(stats)}  served by {stats['served_by']}")
+    if "fallback" in results:
+        r = results["fallback"]
+        print(f"Fallback ({r['primary']} returns 500):")
+        print(f"  healthy         {_fmt(r['healthy'])}")
+        print(f"  failing         {_fmt(r['primary_failing'])}  served by {r['primary_failing']['served_by']}")
+        print(f"  cost (p50)      {r['fallback_cost_p50_ms']:+.1f} ms")
+    if "throttle" in results:
+        r = results["throttle"]
+        print(f"Throttle ({r['primary']} returns 429):")
+        print(f"  {'':15s} {_fmt(r)}  served by {r['served_by']}, {r['primary_requests']} requests to {r['primary']}")
+    if "cache" in results:
+        r = results["cache"]
+        print(f"Cache: {r['hit_rate']:.1%} of {r['requests']} requests served without HTTP")
+        print(f"  hits            {_fmt(r['hits'])}")
+        print(f"  misses          {_fmt(r['misses'])}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
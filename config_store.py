@@ -0,0 +1,336 @@
+"""Единый источник настроек config.json внутри процесса.
+
+Раньше main.get_cached_config, ocr.get_cached_ocr_config и
+translater.get_cached_translator_config держали по своей копии конфига и
+делали stat() файла на каждое обращение — в том числе из paintEvent оверлея
+на каждой перерисовке во время выделения. Теперь:
+
+* чтение — из словаря в памяти, без системных вызовов (словарь заменяется
+  целиком при изменении, поэтому читать можно из любого потока без блокировок);
+* типизированные геттеры get_bool/get_int/get_float/get_str с дефолтами;
+* изменения через set()/update() сразу видны в памяти, подписчики получают
+  {ключ: значение} (subscribe() — колбэки, qt_signals() — Qt-сигнал в GUI поток);
+* запись на диск — в фоновом потоке, с задержкой SAVE_DELAY_SEC (серия
+  изменений пишется один раз), атомарно: временный файл + os.replace;
+* если файл успел изменить другой процесс (ocr.py, запущенный отдельно),
+  записываются только изменённые здесь ключи поверх его версии — чужие
+  ключи не затираются целым файлом;
+* правки файла извне (другой процесс, ручное редактирование) тот же поток
+  замечает раз в WATCH_INTERVAL_SEC и перечитывает конфиг.
+
+    from config_store import get_config_store
+    store = get_config_store()
+    if store.get_bool("no_screen_dimming"): ...
+    store.set("last_ocr_language", "en")
+"""
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Задержка записи после последнего изменения
+SAVE_DELAY_SEC = 0.5
+# Как часто проверять, не изменился ли файл извне
+WATCH_INTERVAL_SEC = 2.0
+
+_MISSING = object()
+# Метка в _dirty_keys: конфиг заменён целиком, версию с диска не подмешиваем
+_WHOLE_FILE = object()
+
+
+def _get_data_file(filename):
+    if hasattr(sys, '_MEIPASS'):
+        app_dir = sys._MEIPASS
+    else:
+        app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+    data_dir = os.path.join(app_dir, "data")
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    return os.path.join(data_dir, filename)
+
+
+class ConfigStore:
+    """Конфиг в памяти + отложенная атомарная запись. persist=False — только память (бенчмарки)."""
+
+    def __init__(self, path=None, data=None, persist=True):
+        self.path = path or _get_data_file("config.json")
+        self.persist = persist
+        self._lock = threading.Condition()
+        self._write_lock = threading.Lock()  # flush() из фонового потока и при выходе
+        self._listeners = []
+        self._dirty_since = None  # time.monotonic() первого незаписанного изменения
+        self._dirty_keys = set()  # ключи, изменённые здесь и ещё не записанные
+        self._mtime = None
+        self._thread = None
+        self._stopped = False
+        self._data = dict(data) if data is not None else self._read_file()
+
+    # --- чтение (без блокировок и системных вызовов) ---
+    def snapshot(self):
+        """Текущий конфиг целиком. Словарь не изменять — он общий для всех читателей."""
+        return self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def get_bool(self, key, default=False):
+        value = self._data.get(key, default)
+        return value if isinstance(value, bool) else default
+
+    def get_int(self, key, default=0):
+        value = self._data.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key, default=0.0):
+        value = self._data.get(key, default)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_str(self, key, default=""):
+        value = self._data.get(key, default)
+        return value if isinstance(value, str) else default
+
+    # --- изменение ---
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, changes):
+        """Меняет ключи в памяти, уведомляет подписчиков и планирует запись на диск."""
+        with self._lock:
+            current = self._data
+            changed = {k: v for k, v in changes.items() if current.get(k, _MISSING) != v}
+            if not changed:
+                return {}
+            data = dict(current)
+            data.update(changed)
+            self._data = data
+            self._mark_dirty(changed)
+        self._notify(changed)
+        return changed
+
+    def replace(self, data):
+        """Заменяет конфиг целиком (сброс настроек). Удалённые ключи приходят подписчикам как None."""
+        with self._lock:
+            current = self._data
+            changed = {k: v for k, v in data.items() if current.get(k, _MISSING) != v}
+            changed.update({k: None for k in current if k not in data})
+            self._data = dict(data)
+            self._mark_dirty([_WHOLE_FILE, *changed])
+        if changed:
+            self._notify(changed)
+        return changed
+
+    def reload(self):
+        """Перечитывает файл (после записи в обход store); незаписанные ключи остаются своими."""
+        return self._apply_external(self._read_file())
+
+    # --- подписки ---
+    def subscribe(self, callback, keys=None):
+        """callback(changed: dict) после каждого изменения (в потоке, который его сделал).
+        keys — интересующие ключи. Возвращает функцию отписки."""
+        entry = (callback, frozenset(keys) if keys else None)
+        with self._lock:
+            self._listeners.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._listeners:
+                    self._listeners.remove(entry)
+        return unsubscribe
+
+    def _notify(self, changed):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback, keys in listeners:
+            if keys is not None and keys.isdisjoint(changed):
+                continue
+            try:
+                callback(changed)
+            except Exception as e:
+                logging.warning(f"Config listener failed: {e}")
+
+    # --- хранение ---
+    def _read_file(self):
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"Failed to read config: {e}")
+            return dict(getattr(self, "_data", {}))
+
+    def _apply_external(self, data):
+        """Принимает версию с диска; ключи, ещё не записанные отсюда, остаются своими."""
+        with self._lock:
+            current = self._data
+            keys = (set(data) | set(current)) - self._dirty_keys
+            changed = {k: data.get(k) for k in keys if data.get(k, _MISSING) != current.get(k, _MISSING)}
+            if changed:
+                merged = dict(current)
+                for key in changed:
+                    if key in data:
+                        merged[key] = data[key]
+                    else:
+                        merged.pop(key, None)
+                self._data = merged
+        if changed:
+            self._notify(changed)
+        return changed
+
+    def _mark_dirty(self, keys):
+        # Вызывается под self._lock
+        if not self.persist:
+            return
+        self._dirty_keys.update(keys)
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        self._ensure_thread()
+        self._lock.notify()
+
+    def _ensure_thread(self):
+        if self.persist and self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="config-store", daemon=True)
+            self._thread.start()
+
+    def start_watching(self):
+        """Запускает фоновый поток (запись + отслеживание правок извне)."""
+        with self._lock:
+            self._ensure_thread()
+
+    def _run(self):
+        next_watch = time.monotonic() + WATCH_INTERVAL_SEC
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                deadline = next_watch
+                if self._dirty_since is not None:
+                    deadline = min(deadline, self._dirty_since + SAVE_DELAY_SEC)
+                if deadline > now:
+                    self._lock.wait(deadline - now)
+                    continue
+                save_due = self._dirty_since is not None and self._dirty_since + SAVE_DELAY_SEC <= now
+            if save_due:
+                self.flush()
+            elif now >= next_watch:
+                next_watch = now + WATCH_INTERVAL_SEC
+                self._check_external()
+
+    def _check_external(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+        logging.info("config.json changed on disk, reloading")
+        self._apply_external(self._read_file())
+
+    def _merge_with_disk(self, data, keys, known_mtime):
+        """Если файл изменён другим процессом — его версия + наши изменённые ключи."""
+        if _WHOLE_FILE in keys:
+            return data
+        try:
+            if os.path.getmtime(self.path) == known_mtime:
+                return data
+            with open(self.path, "r", encoding="utf-8") as f:
+                disk = json.load(f)
+        except Exception:
+            return data  # файла нет или он повреждён — пишем свою версию целиком
+        if not isinstance(disk, dict):
+            return data
+        merged = dict(disk)
+        for key in keys:
+            if key in data:
+                merged[key] = data[key]
+            else:
+                merged.pop(key, None)
+        return merged
+
+    def flush(self):
+        """Записывает незаписанные изменения сразу (при выходе, перед запуском подпроцесса)."""
+        with self._write_lock:
+            with self._lock:
+                if self._dirty_since is None or not self.persist:
+                    return
+                self._dirty_since = None
+                keys, self._dirty_keys = self._dirty_keys, set()
+                data, known_mtime = self._data, self._mtime
+            merged = self._merge_with_disk(data, keys, known_mtime)
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=4)
+                os.replace(tmp_path, self.path)
+                with self._lock:
+                    self._mtime = os.path.getmtime(self.path)
+            except Exception as e:
+                logging.warning(f"Failed to save config: {e}")
+                with self._lock:
+                    self._dirty_keys |= keys
+                    if self._dirty_since is None:
+                        self._dirty_since = time.monotonic()  # повторим в следующем цикле
+                return
+        if merged is not data:
+            self._apply_external(merged)  # подхватываем ключи, записанные другим процессом
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._stopped = True
+            self._lock.notify()
+
+
+class _QtConfigSignals:
+    """Мост подписки в Qt: сигнал changed(dict) доставляется в поток получателя."""
+
+    def __init__(self, store):
+        from PyQt5 import QtCore
+
+        class Signals(QtCore.QObject):
+            changed = QtCore.pyqtSignal(dict)
+
+        self.qobject = Signals()
+        self.changed = self.qobject.changed
+        store.subscribe(self.changed.emit)
+
+
+_store = None
+_store_lock = threading.Lock()
+_qt_signals = None
+
+
+def get_config_store():
+    """Общий ConfigStore процесса (config.json в каталоге data)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = ConfigStore()
+                store.start_watching()
+                atexit.register(store.flush)
+                _store = store
+    return _store
+
+
+def qt_signals():
+    """Qt-сигнал об изменениях конфига: qt_signals().changed.connect(slot)."""
+    global _qt_signals
+    if _qt_signals is None:
+        with _store_lock:
+            if _qt_signals is None:
+                _qt_signals = _QtConfigSignals(get_config_store())
+    return _qt_signals
@@ -0,0 +1,298 @@
+"""Офлайн-словарь ru<->en для коротких фраз (быстрый путь перед движками).
+
+Значительная часть захватов Ctrl+Alt+T — одно слово или подпись из 2–3 слов.
+Для них translate_text сначала смотрит в локальный словарь (SQLite в
+data/dictionary.sqlite, индексированный поиск — доли миллисекунды) и только
+при промахе идёт в Google/Argos.
+
+Поиск двухступенчатый: точное совпадение формы (в нижнем регистре), затем
+совпадение по основе после простой морфологической нормализации (отсечение
+окончаний), чтобы «файлы»/«файла» находили «файл». Основа — грубое
+отсечение окончаний («открыто» и «открытие» дают одну основу), поэтому второй
+шаг ищет только среди записей, импортированных из настоящего словаря
+(origin='dict'). Выученные из движков переводы (origin='learned') находятся
+только по точной форме.
+
+Словарных данных в репозитории нет: словарь импортируется из TSV
+(исходник<TAB>перевод, например выгрузка FreeDict или Wiktionary):
+
+    python dictionary.py build words_ru_en.tsv --direction ru-en
+    python dictionary.py lookup "настройки" --direction ru-en
+
+Дополнительно словарь пополняется удачными переводами коротких фраз из полных
+движков. Без импортированного TSV быстрый путь возвращает только такие
+повторы — по сути это кэш переводов на диске. Выученные записи обновляются
+свежим переводом движка и удаляются при смене движка перевода (set_engine) и
+очистке истории (forget_learned).
+"""
+import concurrent.futures
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# Порог «короткого» ввода для быстрого пути
+MAX_WORDS = 3
+MAX_CHARS = 40
+
+_RU_ENDINGS = sorted([
+    "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "иях", "ях", "ах", "ия", "ие", "ий", "ую", "юю",
+    "ой", "ей", "ый", "ая", "яя", "ое", "ее", "ые", "ов", "ев", "ом", "ем", "ам", "ям",
+    "ых", "их", "ью", "ть", "ти", "ет", "ит", "ут", "ют", "ат", "ят", "ешь", "ишь",
+    "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+], key=len, reverse=True)
+
+_WORD_RE = re.compile(r"[\w'-]+", re.UNICODE)
+_STRIP_CHARS = " \t\r\n.,:;!?…\"'«»()[]{}"
+
+
+def get_app_dir():
+    if hasattr(sys, '_MEIPASS'):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(sys.argv[0]))
+
+
+def get_data_file(filename):
+    data_dir = os.path.join(get_app_dir(), "data")
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    return os.path.join(data_dir, filename)
+
+
+def normalize_surface(text):
+    """Нижний регистр, ё→е, схлопнутые пробелы, без обрамляющей пунктуации."""
+    text = ' '.join(text.strip(_STRIP_CHARS).split())
+    return text.lower().replace('ё', 'е')
+
+
+def _stem_ru(word):
+    for ending in _RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[:-len(ending)]
+    return word
+
+
+def _stem_en(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    if len(word) > 4 and word.endswith(("ches", "shes", "xes", "zes")):
+        return word[:-2]
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def stem_phrase(text, lang):
+    """Основа фразы для поиска по словоформам."""
+    stem = _stem_ru if lang == "ru" else _stem_en
+    return ' '.join(stem(w) for w in _WORD_RE.findall(normalize_surface(text)))
+
+
+def is_short_text(text):
+    stripped = text.strip()
+    if not stripped or len(stripped) > MAX_CHARS or '\n' in stripped:
+        return False
+    words = _WORD_RE.findall(stripped)
+    # Одни числа переводить не нужно — пусть решает основной движок
+    return 0 < len(words) <= MAX_WORDS and any(not w.isdigit() for w in words)
+
+
+def _match_case(source, translation):
+    """Переносит регистр исходника на перевод (Файл → File, OK → ОК)."""
+    letters = [c for c in source if c.isalpha()]
+    if letters and all(c.isupper() for c in letters) and len(letters) > 1:
+        return translation.upper()
+    if letters and source.strip(_STRIP_CHARS)[:1].isupper():
+        return translation[:1].upper() + translation[1:]
+    return translation
+
+
+class OfflineDictionary:
+    """Словарь на SQLite: (direction, surface) -> перевод, индекс по основе."""
+
+    def __init__(self, path=None):
+        self.path = path or get_data_file("dictionary.sqlite")
+        self._conn = None
+        self._lock = threading.Lock()
+        self._engine = None
+        self._learn_executor = None
+        self.stats = {"lookups": 0, "hits": 0, "stem_hits": 0, "learned": 0, "total_ms": 0.0}
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " direction TEXT NOT NULL,"
+                " surface TEXT NOT NULL,"
+                " stem TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " origin TEXT NOT NULL DEFAULT 'dict',"
+                " PRIMARY KEY (direction, surface)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_stem ON entries (direction, stem)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def lookup(self, text, source_code, target_code):
+        """Перевод короткой фразы или None при промахе."""
+        direction = f"{source_code}-{target_code}"
+        surface = normalize_surface(text)
+        if not surface:
+            return None
+        started = time.perf_counter()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT translation FROM entries WHERE direction = ? AND surface = ?",
+                (direction, surface),
+            ).fetchone()
+            stem_hit = False
+            if row is None:
+                # По основе — только словарные записи: выученная «Открыто» → «Open»
+                # не должна отвечать на «Открытие»
+                row = conn.execute(
+                    "SELECT translation FROM entries WHERE direction = ? AND stem = ? AND origin = 'dict'"
+                    " ORDER BY length(surface) LIMIT 1",
+                    (direction, stem_phrase(text, source_code)),
+                ).fetchone()
+                stem_hit = row is not None
+            self.stats["lookups"] += 1
+            self.stats["total_ms"] += (time.perf_counter() - started) * 1000
+            if row is None:
+                return None
+            self.stats["hits"] += 1
+            if stem_hit:
+                self.stats["stem_hits"] += 1
+        return _match_case(text, row[0])
+
+    def add_entries(self, pairs, source_code, target_code, origin="dict"):
+        """Добавляет пары (исходник, перевод). Словарные записи не перетираются выученными."""
+        direction = f"{source_code}-{target_code}"
+        rows = []
+        for source, translation in pairs:
+            surface = normalize_surface(source)
+            translation = translation.strip()
+            if surface and translation:
+                rows.append((direction, surface, stem_phrase(source, source_code), translation, origin))
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            if origin == "dict":
+                conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+            else:
+                # Свежий перевод движка заменяет выученный, словарную запись — нет
+                conn.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (direction, surface) DO UPDATE SET translation = excluded.translation"
+                    " WHERE entries.origin = 'learned'", rows)
+            conn.commit()
+        return len(rows)
+
+    def forget_learned(self):
+        """Удаляет переводы, выученные из движков (очистка истории, смена движка)."""
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute("DELETE FROM entries WHERE origin = 'learned'").rowcount
+            conn.commit()
+        return count
+
+    def set_engine(self, engine):
+        """Текущий движок перевода. Если выученное получено другим движком (в том числе
+        в прошлом запуске) — выученные записи удаляются."""
+        if engine == self._engine:
+            return
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'learned_engine'").fetchone()
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('learned_engine', ?)", (engine,))
+            conn.commit()
+            self._engine = engine
+        if row is not None and row[0] != engine:
+            count = self.forget_learned()
+            print(f"Translator changed ({row[0]} -> {engine}), forgot {count} learned dictionary entries")
+
+    def learn(self, text, translation, source_code, target_code):
+        """Запоминает удачный перевод короткой фразы из полного движка."""
+        if not is_short_text(text) or not translation or not translation.strip():
+            return
+        if normalize_surface(text) == normalize_surface(translation):
+            return  # движок вернул исходник — это не перевод
+        if self._learn_executor is None:
+            with self._lock:
+                if self._learn_executor is None:
+                    self._learn_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="dictionary-learn")
+        self._learn_executor.submit(self._learn_sync, text, translation, source_code, target_code)
+
+    def _learn_sync(self, text, translation, source_code, target_code):
+        try:
+            if self.add_entries([(text, translation.strip(_STRIP_CHARS))], source_code, target_code, origin="learned"):
+                self.stats["learned"] += 1
+        except Exception as e:
+            print(f"Dictionary learn failed: {e}")
+
+    def build_from_tsv(self, tsv_path, source_code, target_code):
+        """Импорт TSV (исходник<TAB>перевод[<TAB>...]); возвращает число записей."""
+        pairs = []
+        with open(tsv_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 2 and not line.startswith("#"):
+                    pairs.append((parts[0], parts[1]))
+        return self.add_entries(pairs, source_code, target_code, origin="dict")
+
+
+_dictionary = None
+_dictionary_lock = threading.Lock()
+
+
+def get_dictionary():
+    global _dictionary
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                _dictionary = OfflineDictionary()
+    return _dictionary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline ru<->en dictionary")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="import a TSV file")
+    build.add_argument("tsv")
+    build.add_argument("--direction", default="ru-en", choices=("ru-en", "en-ru"))
+    look = sub.add_parser("lookup", help="look up a word or short phrase")
+    look.add_argument("text")
+    look.add_argument("--direction", default="ru-en", choices=("ru-en", "en-ru"))
+    args = parser.parse_args()
+
+    src, tgt = args.direction.split("-")
+    dictionary = get_dictionary()
+    if args.command == "build":
+        count = dictionary.build_from_tsv(args.tsv, src, tgt)
+        print(f"Imported {count} entries into {dictionary.path}")
+    else:
+        started = time.perf_counter()
+        result = dictionary.lookup(args.text, src, tgt)
+        print(f"{result!r} ({(time.perf_counter() - started) * 1000:.3f} ms)")
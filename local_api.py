@@ -0,0 +1,355 @@
+"""Локальный HTTP API: OCR и перевод силами уже запущенного приложения.
+
+Скрипты, расширение браузера и тестовые стенды раньше могли только запускать
+main.py/ocr.py подпроцессом — с холодным стартом OCR движков, HTTP сессии и
+моделей Argos. Сервис работает внутри процесса приложения и переиспользует
+прогретые движки, словарь и память переводов.
+
+Включается в config.json: "local_api": true (порт — "local_api_port",
+по умолчанию 8765). Слушает только 127.0.0.1.
+
+    GET  /v1/health                       состояние очередей
+    POST /v1/translate  {"text", "source", "target"}
+    POST /v1/ocr?lang=ru&translate=1      тело — байты изображения (PNG/JPEG/BMP)
+    POST /v1/ocr        {"image": "<base64>", "lang": "en", "translate": true}
+
+    curl -s localhost:8765/v1/translate -d '{"text": "Привет", "source": "ru", "target": "en"}'
+    curl -s --data-binary @shot.png -H "Content-Type: image/png" "localhost:8765/v1/ocr?lang=en"
+
+Очереди: у OCR и перевода свои лимиты одновременных запросов ("local_api_limits",
+по умолчанию ocr=1 — Windows OCR всё равно идёт по одному через общий event loop
+ocr.run_on_ocr_loop вместе с захватами по хоткею, translate=4).
+Ожидающих в очереди не больше LANE_MAX_QUEUE, ждать не дольше LANE_QUEUE_TIMEOUT_SEC,
+иначе 503 + Retry-After. Каждый ответ несёт Server-Timing (queue, load,
+preprocess, ocr, translate, total) и X-Request-Id.
+
+Запросы с чужим Origin (веб-страницы) отклоняются, если origin не указан в
+"local_api_allowed_origins". Если задан "local_api_token", нужен заголовок
+Authorization: Bearer <token>.
+"""
+import base64
+import itertools
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOCAL_API_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LIMITS = {"ocr": 1, "translate": 4}
+LANE_MAX_QUEUE = 32
+LANE_QUEUE_TIMEOUT_SEC = 10.0
+MAX_BODY_BYTES = 20 * 1024 * 1024
+MAX_TEXT_CHARS = 20000
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class _Lane:
+    """Очередь одного вида работы: не больше limit одновременно, не больше max_queue ждущих."""
+
+    def __init__(self, name, limit, max_queue=LANE_MAX_QUEUE, timeout=LANE_QUEUE_TIMEOUT_SEC):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+
+    def acquire(self):
+        """Ждёт свободный слот; возвращает время ожидания в мс."""
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ApiError(503, f"{self.name} queue is full", {"Retry-After": "1"})
+            self.waiting += 1
+        started = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        with self._lock:
+            self.waiting -= 1
+            if not acquired:
+                self.rejected += 1
+                raise ApiError(503, f"{self.name} queue timeout", {"Retry-After": "1"})
+            self.active += 1
+        return (time.perf_counter() - started) * 1000
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+            self.served += 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {"limit": self.limit, "active": self.active, "waiting": self.waiting,
+                    "served": self.served, "rejected": self.rejected}
+
+
+def _ocr_engine_name():
+    import ocr
+    return ocr.get_cached_ocr_config().get("ocr_engine", "Windows").lower()
+
+
+def run_ocr(image_bytes, lang, timings):
+    """Байты изображения -> текст тем же пайплайном, что у хоткея."""
+    from PyQt5 import QtGui
+    import ocr
+    started = time.perf_counter()
+    qimage = QtGui.QImage()
+    if not qimage.loadFromData(image_bytes):
+        raise ApiError(400, "cannot decode image")
+    timings["load"] = (time.perf_counter() - started) * 1000
+    preprocess = {}
+    started = time.perf_counter()
+    qimage = ocr.preprocess_for_ocr(qimage, preprocess)
+    timings["preprocess"] = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    text, engine = ocr.recognize_image(qimage, lang, _ocr_engine_name())
+    timings["ocr"] = (time.perf_counter() - started) * 1000
+    return text.strip(), engine
+
+
+def run_translate(text, source, target, timings):
+    import translater
+    started = time.perf_counter()
+    try:
+        return translater.translate_text(text, source, target)
+    finally:
+        timings["translate"] = (time.perf_counter() - started) * 1000
+
+
+class LocalApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = False  # второй экземпляр не должен «перехватить» порт
+
+    def __init__(self, port=DEFAULT_PORT, limits=None, allowed_origins=(), token=None):
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.lanes = {name: _Lane(name, limit) for name, limit in limits.items()}
+        self.allowed_origins = set(allowed_origins or ())
+        self.token = token or None
+        self.started_at = time.time()
+        self._ids = itertools.count(1)
+        super().__init__((LOCAL_API_HOST, port), _ApiHandler)
+
+    def next_request_id(self):
+        return next(self._ids)
+
+    def stats(self):
+        return {"status": "ok", "uptime_sec": round(time.time() - self.started_at, 1),
+                "lanes": {name: lane.stats() for name, lane in self.lanes.items()}}
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive для клиентов, шлющих серию запросов
+    server_version = "ClicknTranslateAPI/1"
+
+    def log_message(self, fmt, *args):
+        logging.debug("local_api: " + fmt % args)
+
+    # --- маршрутизация ---
+    def do_GET(self):
+        self._dispatch({"/v1/health": self._health})
+
+    def do_POST(self):
+        self._dispatch({"/v1/translate": self._translate, "/v1/ocr": self._ocr})
+
+    def _dispatch(self, routes):
+        started = time.perf_counter()
+        request_id = self.server.next_request_id()
+        timings = {}
+        status, payload, headers = 200, None, {}
+        self._body_read = False
+        try:
+            self._check_access()
+            url = urllib.parse.urlsplit(self.path)
+            handler = routes.get(url.path)
+            if handler is None:
+                raise ApiError(404, "not found")
+            query = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+            payload = handler(query, timings)
+        except ApiError as e:
+            status, payload, headers = e.status, {"error": str(e)}, e.headers
+        except Exception as e:
+            status, payload, headers = _error_for_exception(e)
+        if not self._body_read:
+            self._discard_body()  # иначе непрочитанное тело станет «следующим запросом» keep-alive
+        if self.close_connection:
+            headers = dict(headers, Connection="close")
+        timings["total"] = (time.perf_counter() - started) * 1000
+        self._send_json(status, payload, request_id, timings, headers)
+
+    def _check_access(self):
+        origin = self.headers.get("Origin")
+        if origin and origin not in self.server.allowed_origins:
+            raise ApiError(403, "cross-origin requests are not allowed")
+        if self.server.token:
+            if self.headers.get("Authorization", "") != f"Bearer {self.server.token}":
+                raise ApiError(401, "missing or invalid token")
+
+    def _content_length(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ApiError(400, "invalid Content-Length")
+        return length
+
+    def _read_body(self):
+        try:
+            length = self._content_length()
+        except ApiError:
+            self.close_connection = True  # границу тела не знаем — соединение не переиспользовать
+            raise
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+        self._body_read = True
+        return self.rfile.read(length) if length else b""
+
+    def _discard_body(self):
+        """Ответ без чтения тела (403/401/404/...): дочитываем его или закрываем соединение."""
+        try:
+            length = self._content_length()
+        except ApiError:
+            length = -1
+        if 0 <= length <= MAX_BODY_BYTES:
+            while length > 0:
+                chunk = self.rfile.read(min(length, 65536))
+                if not chunk:
+                    break
+                length -= len(chunk)
+        else:
+            self.close_connection = True
+
+    def _read_json(self):
+        try:
+            data = json.loads(self._read_body() or b"{}")
+        except ValueError:
+            raise ApiError(400, "invalid JSON body")
+        if not isinstance(data, dict):
+            raise ApiError(400, "JSON body must be an object")
+        return data
+
+    def _run_in_lane(self, name, timings, func, *args):
+        lane = self.server.lanes[name]
+        timings["queue"] = timings.get("queue", 0.0) + lane.acquire()
+        try:
+            return func(*args)
+        finally:
+            lane.release()
+
+    # --- эндпоинты ---
+    def _health(self, query, timings):
+        return self.server.stats()
+
+    def _translate(self, query, timings):
+        data = self._read_json()
+        text = data.get("text")
+        source, target = data.get("source"), data.get("target")
+        if not isinstance(text, str) or not text.strip():
+            raise ApiError(400, "'text' is required")
+        if len(text) > MAX_TEXT_CHARS:
+            raise ApiError(413, f"'text' longer than {MAX_TEXT_CHARS} chars")
+        if not source or not target:
+            import batch
+            source, target = batch.guess_direction(text, "universal")
+        translation = self._run_in_lane("translate", timings, run_translate, text, source, target, timings)
+        return {"translation": translation, "source": source, "target": target}
+
+    def _ocr(self, query, timings):
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/json"):
+            options = self._read_json()
+            try:
+                image_bytes = base64.b64decode(options.get("image") or "", validate=True)
+            except ValueError:
+                raise ApiError(400, "'image' must be base64")
+        else:
+            options = query
+            image_bytes = self._read_body()
+        if not image_bytes:
+            raise ApiError(400, "image is required")
+        lang = options.get("lang") or "ru"
+        if lang not in ("ru", "en", "universal"):
+            raise ApiError(400, "'lang' must be ru, en or universal")
+        text, engine = self._run_in_lane("ocr", timings, run_ocr, image_bytes, lang, timings)
+        result = {"text": text, "lang": lang, "engine": engine}
+        if str(options.get("translate", "")).lower() in ("1", "true", "yes") and text:
+            import batch
+            source, target = batch.guess_direction(text, lang)
+            source, target = options.get("source") or source, options.get("target") or target
+            result["translation"] = self._run_in_lane("translate", timings, run_translate,
+                                                      text, source, target, timings)
+            result["source"], result["target"] = source, target
+        return result
+
+    # --- ответ ---
+    def _send_json(self, status, payload, request_id, timings, headers):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Request-Id", str(request_id))
+        self.send_header("Server-Timing", ", ".join(f"{k};dur={v:.1f}" for k, v in timings.items()))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _error_for_exception(e):
+    """Ошибки движков -> HTTP статус (лимиты — 429, остальное — 502/500)."""
+    import quota
+    if isinstance(e, quota.QuotaExceededError):
+        return 429, {"error": str(e)}, {"Retry-After": str(int(quota.DEFAULT_THROTTLE_SEC))}
+    logging.warning(f"local_api request failed: {e}")
+    if isinstance(e, (OSError, RuntimeError)):
+        return 502, {"error": str(e)}, {}
+    return 500, {"error": f"{type(e).__name__}: {e}"}, {}
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_local_api(config):
+    """Запускает сервис в фоновом потоке, если он включён в конфиге. Возвращает сервер или None."""
+    global _server
+    if not config.get("local_api", False):
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        port = int(config.get("local_api_port", DEFAULT_PORT))
+        try:
+            server = LocalApiServer(port, config.get("local_api_limits"),
+                                    config.get("local_api_allowed_origins", ()),
+                                    config.get("local_api_token"))
+        except OSError as e:
+            logging.warning(f"Local API could not listen on {LOCAL_API_HOST}:{port}: {e}")
+            return None
+        threading.Thread(target=server.serve_forever, name="local-api", daemon=True).start()
+        _server = server
+    logging.info(f"🔌 Local API listening on http://{LOCAL_API_HOST}:{port}")
+    return server
+
+
+def stop_local_api():
+    global _server
+    with _server_lock:
+        server, _server = _server, None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -10,25 +10,25 @@ warnings.filterwarnings(
     category=UserWarning,
 )
 warnings.filterwarnings("ignore", category=UserWarning, module=r"pkg_resources")
-import winreg
-import subprocess
 import ctypes
 import threading
 import time
+import logging
 import pyperclip
 from ctypes import wintypes
-import psutil
 import datetime
-import urllib.parse
-import webbrowser
+# Тяжёлые и редко нужные модули (translater/requests/argostranslate, settings_window,
+# winreg, subprocess, webbrowser) импортируются лениво — это сокращает время до появления
+# иконки в трее. См. bench_startup.py
 
 from PyQt5 import QtCore
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QVBoxLayout, QComboBox,
                              QWidget, QPushButton, QSystemTrayIcon, QMenu, QMessageBox, QLineEdit, QTextEdit, QTextBrowser, QDialog, QHBoxLayout, QCheckBox, QSpacerItem, QSizePolicy, QProgressDialog)
 from PyQt5.QtCore import Qt, QTimer, QSize
-from PyQt5.QtGui import QIcon
-from settings_window import SettingsWindow
-import translater  # Импорт модуля перевода
+from PyQt5.QtGui import QColor, QPalette
+
+from ui_resources import (apply_stylesheet, get_icon, get_stylesheet, LIVE_INDICATOR_COLORS,
+                          LIVE_INDICATOR_STYLE, translation_dialog_stylesheet, translation_overlay_stylesheet)
 
 # --- Единственная константа с дефолтной конфигурацией ---
 DEFAULT_CONFIG = {
@@ -40,6 +40,7 @@ DEFAULT_CONFIG = {
     "translate_hotkey": "Ctrl+Alt+T",
     "live_hotkey": "Ctrl+Alt+L",
     "live_translation_interval": 3,
+    "live_stable_frames": 2,
     "notifications": False,
     "history": False,
     "start_minimized": False,
@@ -50,33 +51,22 @@ DEFAULT_CONFIG = {
     "copy_translated_text": False,  # Все галочки отключены по умолчанию
     "keep_visible_on_ocr": False,
     "last_ocr_language": "ru",
-    "no_screen_dimming": False
+    "no_screen_dimming": False,
+    "frozen_screen_capture": False,  # Снимок экрана при открытии оверлея, выделение — из памяти
+    "local_api": False,  # Локальный HTTP API для скриптов (local_api.py)
+    "local_api_port": 8765
 }
 
-# --- Глобальный кэш конфигурации ---
-_config_cache = None
-_config_mtime = 0
-
+# --- Конфигурация: общий in-memory store (config_store.py) ---
 def get_cached_config():
-    """Возвращает закэшированную конфигурацию, перечитывая только при изменении файла."""
-    global _config_cache, _config_mtime
-    config_path = get_data_file("config.json")
-    try:
-        mtime = os.path.getmtime(config_path)
-        if _config_cache is None or mtime > _config_mtime:
-            with open(config_path, "r", encoding="utf-8") as f:
-                _config_cache = json.load(f)
-            _config_mtime = mtime
-    except Exception:
-        if _config_cache is None:
-            _config_cache = DEFAULT_CONFIG.copy()
-    return _config_cache
+    """Текущая конфигурация из памяти (без обращения к диску)."""
+    from config_store import get_config_store
+    return get_config_store().snapshot() or DEFAULT_CONFIG
 
 def invalidate_config_cache():
-    """Сбрасывает кэш конфигурации после записи."""
-    global _config_cache, _config_mtime
-    _config_cache = None
-    _config_mtime = 0
+    """Перечитывает config.json после записи в обход store."""
+    from config_store import get_config_store
+    get_config_store().reload()
 
 # --- Константы для RegisterHotKey ---
 WM_HOTKEY = 0x0312
@@ -88,6 +78,13 @@ MOD_WIN = 0x0008
 # --- Диспетчер для безопасного вызова UI из потоков хоткеев ---
 class _HotkeyDispatcher(QtCore.QObject):
     triggered = QtCore.pyqtSignal(object)
+    # time.perf_counter() последнего нажатия (из потока хоткея) — метрика time-to-visible оверлея
+    pressed_at = None
+
+    def take_pressed_at(self):
+        """Время нажатия хоткея, вызвавшего текущий колбэк; None при запуске из меню/трея."""
+        pressed_at, self.pressed_at = self.pressed_at, None
+        return pressed_at
 
 hotkey_dispatcher = _HotkeyDispatcher()
 
@@ -354,6 +351,7 @@ class HotkeyListenerThread(threading.Thread):
             while ctypes.windll.user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, 0x0001):  # PM_REMOVE
                 if msg.message == WM_HOTKEY and msg.wParam == self.hotkey_id:
                     try:
+                        hotkey_dispatcher.pressed_at = time.perf_counter()
                         print(f"Hotkey pressed: {self.hotkey_str}")
                         hotkey_dispatcher.triggered.emit(self.callback)
                     except Exception as e:
@@ -432,7 +430,7 @@ class WelcomeDialog(QDialog):
         self.parent = parent
         self.lang = parent.current_interface_language if hasattr(parent, 'current_interface_language') else 'ru'
         self.setWindowTitle(self.tr("Новости") if self.lang == 'ru' else "News")
-        self.setWindowIcon(QIcon(resource_path("icons/icon.ico")))
+        self.setWindowIcon(get_icon("icons/icon.ico"))
         self.setFixedSize(500, 370)
         self.setStyleSheet("background-color: #121212; color: #fff; font-size: 16px;")
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
@@ -455,7 +453,7 @@ class WelcomeDialog(QDialog):
         # --- Флаги ---
         flag_layout = QHBoxLayout()
         self.flag_button = QPushButton()
-        self.flag_button.setIcon(QIcon(resource_path("icons/Russian_flag.png")) if self.lang == 'ru' else QIcon(resource_path("icons/American_flag.png")))
+        self.flag_button.setIcon(get_icon("icons/Russian_flag.png") if self.lang == 'ru' else get_icon("icons/American_flag.png"))
         self.flag_button.setIconSize(QSize(32, 32))
         self.flag_button.setStyleSheet("background: transparent; border: none;")
         self.flag_button.clicked.connect(self.toggle_language)
@@ -566,16 +564,14 @@ class DarkThemeApp(QMainWindow):
 
         self.HotkeyListenerThread = HotkeyListenerThread
 
-        self.setWindowIcon(QIcon(resource_path("icons/icon.ico")))
+        self.setWindowIcon(get_icon("icons/icon.ico"))
 
     def load_config(self):
-        config_path = get_data_file("config.json")
-        if os.path.exists(config_path):
-            with open(config_path, "r", encoding="utf-8") as f:
-                self.config = json.load(f)
-        else:
-            self.config = DEFAULT_CONFIG.copy()
-            self.save_config()
+        get_data_file("config.json")  # при первом запуске создаёт файл с DEFAULT_CONFIG
+        self.config = dict(get_cached_config())
+        # Что было в конфиге на момент загрузки: save_config() отправляет в store только
+        # ключи, изменённые здесь, и не затирает значения, сохранённые оверлеем или ocr.py
+        self._config_baseline = dict(self.config)
         # Извлекаем значения с дефолтами из DEFAULT_CONFIG
         self.current_theme = self.config.get("theme", DEFAULT_CONFIG["theme"])
         self.current_interface_language = self.config.get("interface_language", DEFAULT_CONFIG["interface_language"])
@@ -590,13 +586,18 @@ class DarkThemeApp(QMainWindow):
         self.config["translation_mode"] = getattr(self, "translation_mode",
                                                   LANGUAGES[self.current_interface_language][0])
         self.config["start_minimized"] = getattr(self, "start_minimized", False)
-        config_path = get_data_file("config.json")
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(self.config, f, ensure_ascii=False, indent=4)
-        invalidate_config_cache()  # Сбрасываем кэш после записи
+        from config_store import get_config_store
+        store = get_config_store()
+        baseline = getattr(self, "_config_baseline", {})
+        store.update({k: v for k, v in self.config.items() if baseline.get(k, DEFAULT_CONFIG.get(k)) != v
+                      or k not in store.snapshot()})
+        # Запись на диск — в фоне (config_store); self.config догоняет ключи, изменённые другими
+        self.config = dict(store.snapshot())
+        self._config_baseline = dict(self.config)
 
     def set_autostart(self, enable: bool):
         try:
+            import winreg
             reg_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
             reg_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_WRITE)
             
@@ -632,8 +633,8 @@ class DarkThemeApp(QMainWindow):
 
         self.flag_button = QPushButton(self)
         self.flag_button.setIcon(
-            QIcon(resource_path("icons/American_flag.png")) if self.current_interface_language == "en"
-            else QIcon(resource_path("icons/Russian_flag.png"))
+            get_icon("icons/American_flag.png") if self.current_interface_language == "en"
+            else get_icon("icons/Russian_flag.png")
         )
         self.flag_button.setToolTip("Сменить язык" if self.current_interface_language == "ru" else "Change language")
         self.flag_button.setStyleSheet("background-color: transparent; border: none;")
@@ -690,7 +691,7 @@ class DarkThemeApp(QMainWindow):
             exit_text = "Закрыть программу"
             copy_text = "Копировать текст"
             translate_text = "Перевести"
-        self.tray_icon = QSystemTrayIcon(QIcon(resource_path("icons/icon.ico")), self)
+        self.tray_icon = QSystemTrayIcon(get_icon("icons/icon.ico"), self)
         self.tray_icon.setToolTip("Click'n'Translate")
         tray_menu = QMenu()
         open_action = tray_menu.addAction(open_text)
@@ -721,6 +722,10 @@ class DarkThemeApp(QMainWindow):
 
     def _start_external(self, script_or_exe, *args):
         """Launch helper that works both in dev (python script) and frozen (exe)."""
+        import subprocess
+        # Подпроцесс читает config.json сам — отдаём ему незаписанные изменения
+        from config_store import get_config_store
+        get_config_store().flush()
         if getattr(sys, 'frozen', False):
             # В собранной версии просто перезапускаем тот же exe с нужным параметром
             subprocess.Popen([sys.executable, *args])
@@ -740,7 +745,7 @@ class DarkThemeApp(QMainWindow):
             from ocr import run_screen_capture
             self.hide()
             # run overlay in current QApplication (non-blocking)
-            run_screen_capture(mode="ocr")
+            run_screen_capture(mode="ocr", requested_at=hotkey_dispatcher.take_pressed_at())
         except Exception as e:
             print(f"Error launching OCR: {e}")
             # fallback to previous behavior
@@ -754,10 +759,11 @@ class DarkThemeApp(QMainWindow):
         print("launch_copy called")
         try:
             from ocr import run_screen_capture
+            _prepare_capture_mode("copy")
             # Проверяем настройку - сворачивать ли окно
             if not self.config.get("keep_visible_on_ocr", False):
                 self.hide()
-            run_screen_capture(mode="copy")
+            run_screen_capture(mode="copy", requested_at=hotkey_dispatcher.take_pressed_at())
         except Exception as e:
             print(f"Error launching copy: {e}")
             if getattr(sys, 'frozen', False):
@@ -771,10 +777,11 @@ class DarkThemeApp(QMainWindow):
         print("launch_translate called")
         try:
             from ocr import run_screen_capture
+            _prepare_capture_mode("translate")
             # Проверяем настройку - сворачивать ли окно
             if not self.config.get("keep_visible_on_ocr", False):
                 self.hide()
-            run_screen_capture(mode="translate")
+            run_screen_capture(mode="translate", requested_at=hotkey_dispatcher.take_pressed_at())
         except Exception as e:
             print(f"Error launching translate: {e}")
             if getattr(sys, 'frozen', False):
@@ -789,9 +796,10 @@ class DarkThemeApp(QMainWindow):
         print("launch_live_translate called")
         try:
             from ocr import run_screen_capture
+            _prepare_capture_mode("live")
             if not self.config.get("keep_visible_on_ocr", False):
                 self.hide()
-            run_screen_capture(mode="live")
+            run_screen_capture(mode="live", requested_at=hotkey_dispatcher.take_pressed_at())
         except Exception as e:
             print(f"Error launching live translate: {e}")
 
@@ -799,10 +807,9 @@ class DarkThemeApp(QMainWindow):
         self.hotkey_thread = HotkeyListenerThread(self.config.get("ocr_hotkeys", "Ctrl+O"), self.launch_ocr)
         self.hotkey_thread.start()
 
-    def apply_theme(self):
-        theme = THEMES[self.current_theme]
-        # Настроим стиль скроллбара в зависимости от темы
-        # Настроим стиль скроллбара в зависимости от темы (как в FAQ)
+    @staticmethod
+    def _build_main_stylesheet(theme):
+        # Стиль скроллбара в зависимости от темы (как в FAQ)
         scrollbar_bg = theme['button_background']
         scrollbar_handle = '#7A5FA1'  # Фиолетовый
         scrollbar_handle_hover = '#9A7FC1'
@@ -870,15 +877,22 @@ class DarkThemeApp(QMainWindow):
                 background: none;
             }}
         """
-        self.setStyleSheet(style_sheet)
+        return style_sheet
+
+    def apply_theme(self):
+        theme = THEMES[self.current_theme]
+        # Стили темы собираются один раз, повторная установка того же стиля пропускается
+        apply_stylesheet(self, get_stylesheet(("main_window", self.current_theme),
+                                              lambda: self._build_main_stylesheet(theme)))
         if hasattr(self, "title_bar"):
             header_bg = "#c0c0c0" if self.current_theme == "Светлая" else theme['button_background']
-            self.title_bar.setStyleSheet(
-                f"font-size: 18px; font-weight: bold; color: {theme['text_color']}; background-color: {header_bg};"
-            )
+            apply_stylesheet(self.title_bar, get_stylesheet(
+                ("title_bar", self.current_theme),
+                lambda: f"font-size: 18px; font-weight: bold; color: {theme['text_color']}; background-color: {header_bg};"
+            ))
         if hasattr(self, "minimize_button") and hasattr(self, "close_button"):
             if self.current_theme == "Светлая":
-                self.minimize_button.setStyleSheet("""
+                apply_stylesheet(self.minimize_button, """
                     QPushButton {
                         background-color: transparent;
                         color: #000000;
@@ -889,7 +903,7 @@ class DarkThemeApp(QMainWindow):
                         color: #00aa00;
                     }
                 """)
-                self.close_button.setStyleSheet("""
+                apply_stylesheet(self.close_button, """
                     QPushButton {
                         background-color: transparent;
                         color: #000000;
@@ -901,7 +915,7 @@ class DarkThemeApp(QMainWindow):
                     }
                 """)
             else:
-                self.minimize_button.setStyleSheet("""
+                apply_stylesheet(self.minimize_button, """
                     QPushButton {
                         background-color: transparent;
                         color: white;
@@ -912,7 +926,7 @@ class DarkThemeApp(QMainWindow):
                         color: #00ff00;
                     }
                 """)
-                self.close_button.setStyleSheet("""
+                apply_stylesheet(self.close_button, """
                     QPushButton {
                         background-color: transparent;
                         color: white;
@@ -929,30 +943,29 @@ class DarkThemeApp(QMainWindow):
         if hasattr(self, "settings_button"):
             if self.settings_window is None:
                 if self.current_theme == "Темная":
-                    self.settings_button.setIcon(QIcon(resource_path("icons/settings_light.png")))
+                    self.settings_button.setIcon(get_icon("icons/settings_light.png"))
                     self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['settings'])
                 else:
-                    self.settings_button.setIcon(QIcon(resource_path("icons/settings_dark.png")))
+                    self.settings_button.setIcon(get_icon("icons/settings_dark.png"))
                     self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['settings'])
             else:
                 if self.current_theme == "Темная":
-                    self.settings_button.setIcon(QIcon(resource_path("icons/light_home.png")))
+                    self.settings_button.setIcon(get_icon("icons/light_home.png"))
                     self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['back'])
                 else:
-                    self.settings_button.setIcon(QIcon(resource_path("icons/dark_home.png")))
+                    self.settings_button.setIcon(get_icon("icons/dark_home.png"))
                     self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['back'])
 
     def update_theme_icon(self):
-        icon_path = resource_path("icons/sun.png") if self.current_theme == "Темная" else resource_path("icons/moon.png")
-        self.theme_button.setIcon(QIcon(icon_path))
+        self.theme_button.setIcon(get_icon("icons/sun.png" if self.current_theme == "Темная" else "icons/moon.png"))
 
     def update_help_icon(self):
         """Обновить иконку кнопки помощи в зависимости от темы."""
         if hasattr(self, "help_button"):
             if self.current_theme == "Темная":
-                self.help_button.setIcon(QIcon(resource_path("icons/faq_black_theme.png")))
+                self.help_button.setIcon(get_icon("icons/faq_black_theme.png"))
             else:
-                self.help_button.setIcon(QIcon(resource_path("icons/faq_white_theme.png")))
+                self.help_button.setIcon(get_icon("icons/faq_white_theme.png"))
 
     def toggle_theme(self):
         self.current_theme = "Светлая" if self.current_theme == "Темная" else "Темная"
@@ -965,10 +978,10 @@ class DarkThemeApp(QMainWindow):
     def toggle_language(self):
         if self.current_interface_language == "en":
             self.current_interface_language = "ru"
-            self.flag_button.setIcon(QIcon(resource_path("icons/Russian_flag.png")))
+            self.flag_button.setIcon(get_icon("icons/Russian_flag.png"))
         else:
             self.current_interface_language = "en"
-            self.flag_button.setIcon(QIcon(resource_path("icons/American_flag.png")))
+            self.flag_button.setIcon(get_icon("icons/American_flag.png"))
         self.save_config()
         if self.settings_window is not None:
             self.settings_window.update_language()
@@ -1205,9 +1218,9 @@ class DarkThemeApp(QMainWindow):
 
     def set_settings_button_to_home(self):
         if self.current_theme == "Темная":
-            self.settings_button.setIcon(QIcon(resource_path("icons/dark_home.png")))
+            self.settings_button.setIcon(get_icon("icons/dark_home.png"))
         else:
-            self.settings_button.setIcon(QIcon(resource_path("icons/light_home.png")))
+            self.settings_button.setIcon(get_icon("icons/light_home.png"))
         self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['back'])
         try:
             self.settings_button.clicked.disconnect()
@@ -1217,9 +1230,9 @@ class DarkThemeApp(QMainWindow):
 
     def set_settings_button_to_settings(self):
         if self.current_theme == "Темная":
-            self.settings_button.setIcon(QIcon(resource_path("icons/settings_light.png")))
+            self.settings_button.setIcon(get_icon("icons/settings_light.png"))
         else:
-            self.settings_button.setIcon(QIcon(resource_path("icons/settings_dark.png")))
+            self.settings_button.setIcon(get_icon("icons/settings_dark.png"))
         self.settings_button.setToolTip(INTERFACE_TEXT[self.current_interface_language]['settings'])
         try:
             self.settings_button.clicked.disconnect()
@@ -1399,6 +1412,8 @@ class DarkThemeApp(QMainWindow):
             cb()
         except Exception:
             pass
+        finally:
+            hotkey_dispatcher.pressed_at = None  # колбэк не забрал время — не отдаём его следующему запуску
 
     def _on_hotkey_registration_failed(self, hotkey_str):
         """Показать уведомление, когда хоткей занят другим приложением."""
@@ -1427,7 +1442,7 @@ class DarkThemeApp(QMainWindow):
         dialog.setTextFormat(Qt.RichText)
         dialog.setText(msg)
         dialog.setIcon(QMessageBox.Warning)
-        dialog.setWindowIcon(QIcon(resource_path("icons/icon.ico")))
+        dialog.setWindowIcon(get_icon("icons/icon.ico"))
 
         if theme == "Темная":
             dialog.setStyleSheet("""
@@ -1484,7 +1499,17 @@ class DarkThemeApp(QMainWindow):
                 self.live_manager.stop()
         except Exception as e:
             print(f"Error stopping live manager: {e}")
+        if "local_api" in sys.modules:
+            try:
+                sys.modules["local_api"].stop_local_api()
+            except Exception as e:
+                print(f"Error stopping local API: {e}")
         self.save_config()
+        try:
+            from config_store import get_config_store
+            get_config_store().flush()  # последние изменения — на диск до выхода
+        except Exception as e:
+            print(f"Error saving config: {e}")
         self.tray_icon.hide()  # Убираем иконку из трея
         event.accept()
 
@@ -1535,6 +1560,8 @@ class DarkThemeApp(QMainWindow):
                     QApplication.processEvents()
 
                 # Оборачиваем вызов перевода, передавая колбэк установки моделей
+                import translater
+
                 def _translate_with_progress():
                     return translater.translate_text(text, source_code, target_code, status_callback=_status)
 
@@ -1574,30 +1601,15 @@ class DarkThemeApp(QMainWindow):
 class TranslationOverlay(QWidget):
     """Окно-оверлей для показа перевода поверх выделенной области."""
 
+    # Сообщает пулу (TranslationOverlayPool), что окно закрыто и его можно переиспользовать
+    closed = QtCore.pyqtSignal(object)
+
     def __init__(self, translated_text, x, y, width, height, opacity=85, theme='Темная', font_size=14, line_height=1.5):
         super().__init__()
         self.setWindowFlags(
             Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Tool
         )
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setGeometry(x, y, width, height)
-
-        # Сохраняем для перерендеринга при изменении шрифта
-        self.translated_text = translated_text
-        self.current_font_size = font_size
-        self.current_line_height = line_height
-
-        # Цвета по теме
-        if theme == "Темная":
-            bg_r, bg_g, bg_b = 30, 30, 46
-            self.text_color = "#E0E0E0"
-            scroll_bg, scroll_handle = "#2E2E3E", "#555"
-        else:
-            bg_r, bg_g, bg_b = 255, 255, 255
-            self.text_color = "#1a1a1a"
-            scroll_bg, scroll_handle = "#f0f0f0", "#ccc"
-
-        alpha = int(opacity * 2.55)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -1605,33 +1617,60 @@ class TranslationOverlay(QWidget):
         self.text_browser = QTextBrowser()
         self.text_browser.setReadOnly(True)
         self.text_browser.setOpenExternalLinks(False)
-        self.text_browser.setStyleSheet(f"""
-            QTextBrowser {{
-                background-color: rgba({bg_r}, {bg_g}, {bg_b}, {alpha});
-                border: none;
-                padding: 8px;
-            }}
-            QScrollBar:vertical {{
-                background: {scroll_bg}; width: 8px; border-radius: 4px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {scroll_handle}; border-radius: 4px; min-height: 20px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
-        """)
+        self.text_browser.setUndoRedoEnabled(False)  # смена стиля на месте не копит историю правок
+        layout.addWidget(self.text_browser)
 
+        self._style_key = None
+        self._rendered_content = None  # (текст, цвет) в документе text_browser
+        self._rendered_font_size = None
+        self._rendered_line_height = None
+        self.set_content(translated_text, x, y, width, height, opacity, theme, font_size, line_height)
+
+    def set_content(self, translated_text, x, y, width, height, opacity=85, theme='Темная', font_size=14, line_height=1.5):
+        """Новый перевод в том же окне (переиспользование из пула)."""
+        self.setGeometry(x, y, width, height)
+        self._apply_style(opacity, theme)
+
+        # Сохраняем для перерендеринга при изменении шрифта
+        self.translated_text = translated_text
+        self.current_font_size = font_size
+        self.current_line_height = line_height
         self._update_html()
-        layout.addWidget(self.text_browser)
+        self.text_browser.verticalScrollBar().setValue(0)
+
+    def _apply_style(self, opacity, theme):
+        """Стиль зависит только от темы и прозрачности — при повторном показе обычно не меняется."""
+        if self._style_key == (opacity, theme):
+            return
+        self._style_key = (opacity, theme)
+        # Цвет текста по теме
+        self.text_color = "#E0E0E0" if theme == "Темная" else "#1a1a1a"
+        apply_stylesheet(self.text_browser, translation_overlay_stylesheet(theme, opacity))
 
     def _update_html(self):
-        """Обновить HTML с текущим размером шрифта."""
-        html_content = format_translation_html(
-            self.translated_text,
-            self.text_color,
-            self.current_font_size,
-            self.current_line_height
-        )
-        self.text_browser.setHtml(html_content)
+        """Показать текущий перевод: HTML разбирается только при смене текста или цвета,
+        размер шрифта и интервал меняются в уже готовом документе."""
+        content_key = (self.translated_text, self.text_color)
+        if self.current_font_size != self._rendered_font_size:
+            set_translation_font_size(self.text_browser, self.current_font_size)
+            self._rendered_font_size = self.current_font_size
+        if content_key != self._rendered_content:
+            self.text_browser.setHtml(format_translation_html(
+                self.translated_text,
+                self.text_color,
+                font_size=None,
+                line_height=self.current_line_height
+            ))
+            self._rendered_content = content_key
+            self._rendered_line_height = self.current_line_height
+        elif self.current_line_height != self._rendered_line_height:
+            set_translation_line_height(self.text_browser.document(), self.current_line_height)
+            self._rendered_line_height = self.current_line_height
+
+    def clear_content(self):
+        """Освобождает документ с переводом (окно ждёт переиспользования в пуле)."""
+        self.text_browser.clear()
+        self._rendered_content = None
 
     def wheelEvent(self, event):
         """Ctrl + колесо = изменить размер шрифта."""
@@ -1654,6 +1693,75 @@ class TranslationOverlay(QWidget):
     def mousePressEvent(self, event):
         self.close()
 
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        self.closed.emit(self)
+
+
+class TranslationOverlayPool:
+    """Оверлеи перевода: ограниченное число окон, закрытые переиспользуются для новых результатов.
+
+    Раньше каждый оверлей складывался в parent._overlay_windows (parent — оверлей
+    выделения из пула, живущий всю сессию) и не удалялся после закрытия.
+    """
+
+    # Сколько оверлеев перевода может быть открыто одновременно (самый старый уступает место)
+    MAX_VISIBLE = 4
+    # Сколько закрытых окон держать наготове
+    MAX_IDLE = 2
+
+    def __init__(self):
+        self.visible = []  # в порядке показа
+        self.idle = []
+        self.stats = {"created": 0, "reused": 0, "evicted": 0, "destroyed": 0}
+
+    def show(self, translated_text, x, y, width, height, **style):
+        while len(self.visible) >= self.MAX_VISIBLE:
+            self.stats["evicted"] += 1
+            self.visible[0].close()  # closeEvent -> _on_closed переносит окно в idle
+        if self.idle:
+            overlay = self.idle.pop()
+            overlay.set_content(translated_text, x, y, width, height, **style)
+            self.stats["reused"] += 1
+        else:
+            overlay = TranslationOverlay(translated_text, x, y, width, height, **style)
+            overlay.closed.connect(self._on_closed)
+            self.stats["created"] += 1
+        self.visible.append(overlay)
+        overlay.show()
+        return overlay
+
+    def _on_closed(self, overlay):
+        if overlay not in self.visible:
+            return
+        self.visible.remove(overlay)
+        if len(self.idle) < self.MAX_IDLE:
+            overlay.clear_content()  # документ с прошлым переводом не держим
+            self.idle.append(overlay)
+        else:
+            self.stats["destroyed"] += 1
+            overlay.deleteLater()
+
+    def release_idle(self):
+        """Удаляет закрытые окна (очистка кэшей); открытые не трогает. Возвращает их число."""
+        count = len(self.idle)
+        for overlay in self.idle:
+            overlay.deleteLater()
+        self.stats["destroyed"] += count
+        self.idle = []
+        return count
+
+
+_translation_overlay_pool = None
+
+
+def get_translation_overlay_pool():
+    """Общий пул оверлеев перевода (только из GUI потока)."""
+    global _translation_overlay_pool
+    if _translation_overlay_pool is None:
+        _translation_overlay_pool = TranslationOverlayPool()
+    return _translation_overlay_pool
+
 
 # --- Live Translation (непрерывное чтение) ---
 class LiveTranslationOverlay(TranslationOverlay):
@@ -1665,16 +1773,13 @@ class LiveTranslationOverlay(TranslationOverlay):
 
         # Индикатор Live режима
         self.live_indicator = QLabel("● LIVE", self)
-        self.live_indicator.setStyleSheet("""
-            QLabel {
-                color: #ff4444;
-                background-color: rgba(0, 0, 0, 150);
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 10px;
-                font-weight: bold;
-            }
-        """)
+        apply_stylesheet(self.live_indicator, LIVE_INDICATOR_STYLE)
+        self._pulse_palettes = []
+        for color in LIVE_INDICATOR_COLORS:
+            palette = self.live_indicator.palette()
+            palette.setColor(QPalette.WindowText, QColor(color))
+            self._pulse_palettes.append(palette)
+        self.live_indicator.setPalette(self._pulse_palettes[True])
         self.live_indicator.adjustSize()
         self.live_indicator.move(5, 5)
         self.live_indicator.show()
@@ -1686,19 +1791,9 @@ class LiveTranslationOverlay(TranslationOverlay):
         self.pulse_state = True
 
     def _pulse(self):
-        """Пульсация индикатора Live."""
+        """Пульсация индикатора Live: готовая палитра, без setStyleSheet каждые 500 мс."""
         self.pulse_state = not self.pulse_state
-        color = "#ff4444" if self.pulse_state else "#aa2222"
-        self.live_indicator.setStyleSheet(f"""
-            QLabel {{
-                color: {color};
-                background-color: rgba(0, 0, 0, 150);
-                padding: 2px 6px;
-                border-radius: 3px;
-                font-size: 10px;
-                font-weight: bold;
-            }}
-        """)
+        self.live_indicator.setPalette(self._pulse_palettes[self.pulse_state])
 
     def update_translation(self, translated_text, font_size, line_height):
         """Обновить перевод в оверлее."""
@@ -1721,10 +1816,66 @@ class LiveTranslationOverlay(TranslationOverlay):
         self.close()
 
 
+def normalize_live_text(text):
+    """Нормализует OCR-текст Live режима: схлопывает пробелы, убирает пустые строки.
+
+    Мелкий OCR-шум (двойные пробелы, пробел перед знаком препинания, пустые строки)
+    не должен считаться изменением текста.
+    """
+    lines = []
+    for line in text.replace('\r\n', '\n').split('\n'):
+        line = ' '.join(line.split())
+        for punct in ('.', ',', ':', ';', '!', '?'):
+            line = line.replace(' ' + punct, punct)
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+class LiveTextStabilizer:
+    """Фиксирует текст только после N одинаковых кадров подряд (антидребезг OCR)."""
+
+    def __init__(self, required_frames=2):
+        self.required_frames = max(1, int(required_frames))
+        self.candidate = None
+        self.candidate_count = 0
+        self.committed = None
+
+    def reset(self, committed_text=None):
+        self.candidate = None
+        self.candidate_count = 0
+        self.committed = committed_text
+
+    def feed(self, text):
+        """Принимает нормализованный текст кадра.
+
+        Возвращает текст, если он стабилен N кадров и отличается от
+        зафиксированного, иначе None.
+        """
+        if text == self.committed:
+            # Вернулись к зафиксированному тексту — сбрасываем кандидата
+            self.candidate = None
+            self.candidate_count = 0
+            return None
+        if text == self.candidate:
+            self.candidate_count += 1
+        else:
+            self.candidate = text
+            self.candidate_count = 1
+        if self.candidate_count >= self.required_frames:
+            self.committed = text
+            self.candidate = None
+            self.candidate_count = 0
+            return text
+        return None
+
+
 class LiveTranslationManager:
     """Менеджер режима непрерывного чтения."""
 
     MAX_CACHE_SIZE = 100
+    MAX_LINE_CACHE_SIZE = 500
+    CONFIRM_DELAY_MS = 400
 
     def __init__(self, parent):
         self.parent = parent
@@ -1736,6 +1887,12 @@ class LiveTranslationManager:
         self.last_ocr_hash = None
         self.last_ocr_text = None
         self.translation_cache = {}  # hash -> (translated_text, ocr_text)
+        self.line_cache = {}  # (source, target, строка) -> перевод строки
+        self.stabilizer = LiveTextStabilizer()
+        # Счётчики для оценки числа запросов к переводчику
+        self.stats = {"frames": 0, "commits": 0, "translate_calls": 0, "lines_reused": 0, "lines_translated": 0}
+        self.started_at = None
+        self._confirm_scheduled = False
 
         self.theme = "Темная"
         self.lang = "ru"
@@ -1752,10 +1909,22 @@ class LiveTranslationManager:
         self.lang = config.get("interface_language", "ru")
         self.opacity = config.get("overlay_opacity", 85)
 
-        # Начальный хеш и кеш
-        self.last_ocr_text = initial_ocr_text
-        self.last_ocr_hash = hashlib.md5(initial_ocr_text.encode()).hexdigest()
-        self.translation_cache[self.last_ocr_hash] = (initial_translation, initial_ocr_text)
+        # Начальный хеш и кеш (по нормализованному тексту)
+        normalized = normalize_live_text(initial_ocr_text)
+        self.last_ocr_text = normalized
+        self.last_ocr_hash = hashlib.md5(normalized.encode()).hexdigest()
+        self.translation_cache[self.last_ocr_hash] = (initial_translation, normalized)
+        self.stabilizer = LiveTextStabilizer(config.get("live_stable_frames", 2))
+        self.stabilizer.reset(normalized)
+        self.started_at = time.monotonic()
+
+        # Если перевод сохранил разбиение на строки — заполняем построчный кеш
+        source_lines = normalized.split('\n')
+        translated_lines = initial_translation.replace('\r\n', '\n').split('\n')
+        if len(source_lines) == len(translated_lines):
+            direction = self._get_direction()
+            for src_line, tr_line in zip(source_lines, translated_lines):
+                self._remember_line(direction, src_line, tr_line)
 
         # Вычисляем метрики шрифта
         metrics = estimate_font_metrics(initial_ocr_text, initial_translation, height, width)
@@ -1779,10 +1948,68 @@ class LiveTranslationManager:
     def stop(self):
         """Останавливает режим."""
         self.timer.stop()
+        if self.started_at is not None:
+            minutes = max((time.monotonic() - self.started_at) / 60.0, 1 / 60.0)
+            logging.info(
+                f"Live stats: {self.stats['translate_calls']} translate calls "
+                f"({self.stats['translate_calls'] / minutes:.1f}/min), "
+                f"{self.stats['lines_reused']} lines reused, {self.stats['commits']} commits, "
+                f"{self.stats['frames']} frames"
+            )
+            self.started_at = None
         if self.overlay and self.overlay.isVisible():
             self.overlay.close()
         self.overlay = None
 
+    def _get_direction(self):
+        """Направление перевода по текущему языку OCR."""
+        from ocr import get_cached_ocr_config
+        ocr_lang = get_cached_ocr_config().get("last_ocr_language", "ru")
+        return ("ru", "en") if ocr_lang == "ru" else ("en", "ru")
+
+    def _remember_line(self, direction, source_line, translated_line):
+        key = (direction[0], direction[1], source_line)
+        self.line_cache[key] = translated_line
+        if len(self.line_cache) > self.MAX_LINE_CACHE_SIZE:
+            oldest_key = next(iter(self.line_cache))
+            del self.line_cache[oldest_key]
+
+    def _translate_changed_lines(self, text):
+        """Переводит только изменившиеся строки, остальные берёт из построчного кеша."""
+        from translater import translate_text
+
+        source_code, target_code = self._get_direction()
+        lines = text.split('\n')
+        missing = []
+        for line in lines:
+            if (source_code, target_code, line) not in self.line_cache and line not in missing:
+                missing.append(line)
+
+        self.stats["lines_reused"] += len(lines) - len(missing)
+        if missing:
+            # Одним запросом: строки через перевод строки
+            self.stats["translate_calls"] += 1
+            translated = translate_text('\n'.join(missing), source_code, target_code)
+            if not translated:
+                return ""
+            translated_lines = translated.replace('\r\n', '\n').split('\n')
+            if len(translated_lines) != len(missing):
+                # Переводчик склеил/разбил строки — построчное соответствие потеряно
+                if len(missing) == len(lines):
+                    return translated
+                self.stats["translate_calls"] += 1
+                return translate_text(text, source_code, target_code)
+            self.stats["lines_translated"] += len(missing)
+            for src_line, tr_line in zip(missing, translated_lines):
+                self._remember_line((source_code, target_code), src_line, tr_line)
+
+        return '\n'.join(self.line_cache[(source_code, target_code, line)] for line in lines)
+
+    def _confirm_tick(self):
+        """Внеочередной кадр для подтверждения изменившегося текста."""
+        self._confirm_scheduled = False
+        self._tick()
+
     def _tick(self):
         """Вызывается каждые N секунд."""
         import hashlib
@@ -1814,43 +2041,40 @@ class LiveTranslationManager:
             qimage = screenshot.toImage()
 
             # 2. OCR
-            ocr_text = self._run_quick_ocr(qimage)
+            ocr_text = normalize_live_text(self._run_quick_ocr(qimage))
             if not ocr_text:
                 return
+            self.stats["frames"] += 1
 
             # 3. Игнорируем промежуточные состояния (анимация перелистывания)
-            if self.last_ocr_text and len(ocr_text.strip()) < len(self.last_ocr_text.strip()) * 0.3:
+            if self.last_ocr_text and len(ocr_text) < len(self.last_ocr_text) * 0.3:
                 return
 
-            # 4. Хеш текста
+            # 4. Антидребезг: текст должен совпасть в N кадрах подряд.
+            # Подтверждающий кадр снимаем вне очереди, чтобы не ждать полный интервал.
+            if self.stabilizer.feed(ocr_text) is None:
+                if self.stabilizer.candidate is not None and not self._confirm_scheduled:
+                    self._confirm_scheduled = True
+                    QTimer.singleShot(self.CONFIRM_DELAY_MS, self._confirm_tick)
+                return
+
+            # 5. Хеш текста
             text_hash = hashlib.md5(ocr_text.encode()).hexdigest()
 
-            # 5. Если текст не изменился — пропускаем
+            # 6. Если текст не изменился — пропускаем
             if text_hash == self.last_ocr_hash:
                 return
 
             self.last_ocr_hash = text_hash
             self.last_ocr_text = ocr_text
+            self.stats["commits"] += 1
 
-            # 6. Проверяем кеш переводов
+            # 7. Проверяем кеш переводов
             if text_hash in self.translation_cache:
                 translated, _ = self.translation_cache[text_hash]
             else:
-                # 7. Переводим
-                from translater import translate_text
-                config = get_cached_config()
-
-                # Определяем направление перевода по текущему языку OCR
-                from ocr import get_cached_ocr_config
-                ocr_config = get_cached_ocr_config()
-                ocr_lang = ocr_config.get("last_ocr_language", "ru")
-
-                if ocr_lang == "ru":
-                    source_code, target_code = "ru", "en"
-                else:
-                    source_code, target_code = "en", "ru"
-
-                translated = translate_text(ocr_text, source_code, target_code)
+                # 8. Переводим только изменившиеся строки
+                translated = self._translate_changed_lines(ocr_text)
                 if not translated:
                     return
 
@@ -1863,7 +2087,7 @@ class LiveTranslationManager:
                     oldest_key = next(iter(self.translation_cache))
                     del self.translation_cache[oldest_key]
 
-            # 8. Обновляем оверлей
+            # 9. Обновляем оверлей
             metrics = estimate_font_metrics(ocr_text, translated, h, w)
             self.overlay.update_translation(translated, metrics['font_size'], metrics['line_height'])
 
@@ -1873,8 +2097,7 @@ class LiveTranslationManager:
     def _run_quick_ocr(self, qimage):
         """Быстрый OCR без тяжёлой предобработки для Live режима."""
         try:
-            from ocr import qimage_to_softwarebitmap, _get_windows_ocr_engine, run_ocr_with_engine, _get_ocr_event_loop, get_cached_ocr_config
-            import asyncio
+            from ocr import qimage_to_softwarebitmap, _get_windows_ocr_engine, run_ocr_with_engine, run_on_ocr_loop, get_cached_ocr_config
 
             config = get_cached_ocr_config()
             ocr_lang = config.get("last_ocr_language", "ru")
@@ -1890,10 +2113,8 @@ class LiveTranslationManager:
             if not engine:
                 return ""
 
-            # Запускаем OCR
-            loop = _get_ocr_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(run_ocr_with_engine(bitmap, engine))
+            # Запускаем OCR (общий цикл — не одновременно с захватом по хоткею)
+            result = run_on_ocr_loop(run_ocr_with_engine(bitmap, engine))
 
             if not result:
                 return ""
@@ -1920,35 +2141,80 @@ class LiveTranslationManager:
             return ""
 
 
+# Поля вокруг текста в TranslationOverlay: padding QTextBrowser из стиля (8px с каждой стороны)
+OVERLAY_TEXT_PADDING = 8
+OVERLAY_FONT_MIN = 9
+OVERLAY_FONT_MAX = 40
+OVERLAY_LINE_HEIGHT = 1.35
+# Подобранные размеры: (текст, ширина, высота, межстрочный, min, max) -> font_size
+_FIT_CACHE = {}
+_FIT_CACHE_SIZE = 256
+_fit_document = None
+
+
+def _get_fit_document():
+    global _fit_document
+    if _fit_document is None:
+        from PyQt5.QtGui import QTextDocument
+        _fit_document = QTextDocument()
+        _fit_document.setUndoRedoEnabled(False)
+    return _fit_document
+
+
+def fit_font_size(text, width, height, line_height=1.5, min_size=OVERLAY_FONT_MIN, max_size=OVERLAY_FONT_MAX):
+    """Наибольший шрифт (px), при котором перевод помещается в оверлей width x height без прокрутки.
+
+    Бинарный поиск по реальной раскладке QTextDocument; результат кэшируется, поэтому
+    повтор того же текста в Live режиме ничего не стоит. Если не помещается и
+    min_size — возвращается min_size (останется прокрутка).
+    """
+    key = (text, width, height, line_height, min_size, max_size)
+    cached = _FIT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    text_width = max(1, width - 2 * OVERLAY_TEXT_PADDING)
+    max_height = max(1, height - 2 * OVERLAY_TEXT_PADDING)
+    # Раскладка тем же HTML, что показывает оверлей
+    document = _get_fit_document()
+    document.setTextWidth(text_width)
+    low, high = min_size, max(min_size, max_size)
+    best = min_size
+    while low <= high:
+        size = (low + high) // 2
+        document.setHtml(format_translation_html(text, font_size=size, line_height=line_height))
+        if document.size().height() <= max_height:
+            best, low = size, size + 1
+        else:
+            high = size - 1
+    _FIT_CACHE[key] = best
+    if len(_FIT_CACHE) > _FIT_CACHE_SIZE:
+        del _FIT_CACHE[next(iter(_FIT_CACHE))]
+    return best
+
+
 def estimate_font_metrics(ocr_text, translated_text, area_height, area_width):
-    """Оценивает размер шрифта с учётом длины перевода."""
+    """Размер шрифта, при котором перевод помещается в выделенную область.
+
+    Верхняя граница шрифта — по строкам оригинала (перевод не крупнее исходного
+    текста), сам размер — подбор по реальной раскладке (fit_font_size).
+    """
     lines = [line for line in ocr_text.split('\n') if line.strip()]
     line_count = len(lines)
 
-    if line_count == 0:
+    if line_count == 0 or not translated_text.strip():
         return {'font_size': 14, 'line_height': 1.5}
 
-    # Высота строки в оригинале
+    # Высота строки в оригинале; шрифт оригинала — около 72% от неё
     line_height_px = area_height / line_count
+    max_size = max(OVERLAY_FONT_MIN, min(int(line_height_px * 0.72), OVERLAY_FONT_MAX))
 
-    # Базовый размер шрифта — 60% от высоты строки (было 72%, слишком много)
-    font_size_px = int(line_height_px * 0.60)
-
-    # Компенсация длины перевода: если перевод длиннее оригинала,
-    # нужно уменьшить шрифт чтобы текст поместился
-    original_len = len(ocr_text.replace('\n', ' ').strip())
-    translated_len = len(translated_text.replace('\n', ' ').strip())
+    line_height_ratio = OVERLAY_LINE_HEIGHT
 
-    if original_len > 0 and translated_len > original_len:
-        # Коэффициент удлинения, но не меньше 0.7 (не уменьшаем шрифт более чем на 30%)
-        length_ratio = max(0.7, original_len / translated_len)
-        font_size_px = int(font_size_px * length_ratio)
-
-    # Ограничения
-    font_size_px = max(9, min(font_size_px, 40))
-
-    line_height_ratio = round(line_height_px / max(font_size_px, 1), 2)
-    line_height_ratio = max(1.2, min(line_height_ratio, 2.0))
+    if QApplication.instance() is None:
+        font_size_px = max(OVERLAY_FONT_MIN, int(line_height_px * 0.60))  # без Qt раскладку не посчитать
+    else:
+        font_size_px = fit_font_size(translated_text, int(area_width), int(area_height),
+                                     line_height_ratio, OVERLAY_FONT_MIN, max_size)
 
     return {
         'font_size': font_size_px,
@@ -1956,52 +2222,72 @@ def estimate_font_metrics(ocr_text, translated_text, area_height, area_width):
     }
 
 
-def format_translation_html(text, text_color="#E0E0E0", font_size=15, line_height=1.6):
-    """Форматирует текст перевода в HTML с абзацами (OCR-эвристика).
+# Разбиение на абзацы: текст -> экранированные абзацы (Live режим и зум повторяют тот же текст)
+_PARAGRAPH_CACHE = {}
+_PARAGRAPH_CACHE_SIZE = 256
+
+
+def segment_paragraphs(text):
+    """Абзацы перевода, уже экранированные для HTML (OCR-эвристика).
 
     Если строка короче 75% от медианной длины — это конец абзаца.
     """
+    cached = _PARAGRAPH_CACHE.get(text)
+    if cached is not None:
+        return cached
+
     import html as html_module
     normalized_text = text.replace('\r\n', '\n').strip()
     lines = normalized_text.split('\n')
 
     non_empty_lens = [len(line.strip()) for line in lines if line.strip()]
-    if not non_empty_lens:
-        return ''
-
-    sorted_lens = sorted(non_empty_lens)
-    median_len = sorted_lens[len(sorted_lens) // 2]
-    threshold = median_len * 0.75
-
     paragraphs = []
-    current_para = []
-
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            if current_para:
+    if non_empty_lens:
+        sorted_lens = sorted(non_empty_lens)
+        median_len = sorted_lens[len(sorted_lens) // 2]
+        threshold = median_len * 0.75
+
+        current_para = []
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                if current_para:
+                    paragraphs.append(' '.join(current_para))
+                    current_para = []
+                continue
+
+            current_para.append(stripped)
+            if len(stripped) < threshold:
                 paragraphs.append(' '.join(current_para))
                 current_para = []
-            continue
 
-        current_para.append(stripped)
-        if len(stripped) < threshold:
+        if current_para:
             paragraphs.append(' '.join(current_para))
-            current_para = []
 
-    if current_para:
-        paragraphs.append(' '.join(current_para))
+    result = tuple(html_module.escape(p) for p in paragraphs if p)
+    _PARAGRAPH_CACHE[text] = result
+    if len(_PARAGRAPH_CACHE) > _PARAGRAPH_CACHE_SIZE:
+        del _PARAGRAPH_CACHE[next(iter(_PARAGRAPH_CACHE))]
+    return result
+
+
+def format_translation_html(text, text_color="#E0E0E0", font_size=15, line_height=1.6):
+    """Форматирует текст перевода в HTML с абзацами (см. segment_paragraphs).
+
+    font_size=None — без размера в HTML: его задаёт шрифт виджета (set_translation_font_size),
+    и зум не требует повторного разбора HTML.
+    """
+    paragraphs = segment_paragraphs(text)
+    if not paragraphs:
+        return ''
 
-    html_parts = []
-    for p in paragraphs:
-        if p:
-            escaped = html_module.escape(p)
-            html_parts.append(f'<p style="margin: 6px 0; line-height: {line_height};">{escaped}</p>')
+    html_parts = [f'<p style="margin: 6px 0; line-height: {line_height};">{p}</p>' for p in paragraphs]
+    font_size_css = f"font-size: {font_size}px;" if font_size is not None else ""
 
     return f'''
     <div style="
         font-family: 'Segoe UI', Arial, sans-serif;
-        font-size: {font_size}px;
+        {font_size_css}
         color: {text_color};
         padding: 8px 10px;
     ">
@@ -2010,6 +2296,24 @@ def format_translation_html(text, text_color="#E0E0E0", font_size=15, line_heigh
     '''
 
 
+def set_translation_font_size(text_edit, font_size):
+    """Размер шрифта перевода через шрифт виджета: одна перераскладка вместо setHtml."""
+    from PyQt5.QtGui import QFont
+    font = QFont(text_edit.font())
+    font.setPixelSize(int(font_size))
+    text_edit.setFont(font)
+
+
+def set_translation_line_height(document, line_height):
+    """Межстрочный интервал во всех абзацах готового документа."""
+    from PyQt5.QtGui import QTextBlockFormat, QTextCursor
+    cursor = QTextCursor(document)
+    cursor.select(QTextCursor.Document)
+    block_format = QTextBlockFormat()
+    block_format.setLineHeight(line_height * 100, QTextBlockFormat.ProportionalHeight)
+    cursor.mergeBlockFormat(block_format)
+
+
 # --- Универсальный диалог перевода ---
 def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru', theme='Темная', coords=None, original_text=None):
     config = get_cached_config()
@@ -2033,7 +2337,8 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
         else:
             font_size, line_height = 15, 1.5
 
-        overlay = TranslationOverlay(
+        # Ссылки на окна держит пул, закрытые окна переиспользуются
+        get_translation_overlay_pool().show(
             translated_text,
             coords['x'], coords['y'], coords['width'], coords['height'],
             opacity=overlay_opacity,
@@ -2041,11 +2346,6 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
             font_size=font_size,
             line_height=line_height
         )
-        overlay.show()
-        # Храним ссылку чтобы окно не уничтожилось
-        if not hasattr(parent, '_overlay_windows'):
-            parent._overlay_windows = []
-        parent._overlay_windows.append(overlay)
         return
 
     # --- Режим popup (дефолтные значения) ---
@@ -2055,21 +2355,13 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
     dialog = QDialog(parent)
     dialog.setWindowTitle(" ")
     dialog.setWindowFlags(dialog.windowFlags() | Qt.WindowTitleHint | Qt.WindowCloseButtonHint)
-    dialog.setWindowIcon(QIcon(resource_path("icons/icon.png")))
+    dialog.setWindowIcon(get_icon("icons/icon.png"))
 
     screen = QApplication.primaryScreen().geometry()
     max_height = int(screen.height() * 0.75)
 
-    if theme == "Темная":
-        bg_color = "#121212"
-        btn_bg, btn_border, btn_hover = "#1e1e1e", "#550000", "#333333"
-        scroll_bg, scroll_handle, scroll_hover = "#1e1e1e", "#555555", "#777777"
-    else:
-        bg_color = "#ffffff"
-        btn_bg, btn_border, btn_hover = "#f0f0f0", "#cccccc", "#e0e0e0"
-        scroll_bg, scroll_handle, scroll_hover = "#f0f0f0", "#cccccc", "#aaaaaa"
-
-    dialog.setStyleSheet(f"QDialog {{ background-color: {bg_color}; }}")
+    # Один общий стиль на весь диалог (фон, текст, прокрутка, кнопки), собран один раз на тему
+    dialog.setStyleSheet(translation_dialog_stylesheet(theme))
 
     layout = QVBoxLayout(dialog)
     layout.setContentsMargins(15, 15, 15, 15)
@@ -2078,34 +2370,10 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
     text_browser = QTextBrowser()
     text_browser.setReadOnly(True)
     text_browser.setOpenExternalLinks(False)
-    text_browser.setStyleSheet(f"""
-        QTextBrowser {{
-            background-color: {bg_color};
-            border: none;
-            padding: 4px;
-        }}
-        QScrollBar:vertical {{
-            background: {scroll_bg}; width: 8px; border-radius: 4px;
-        }}
-        QScrollBar::handle:vertical {{
-            background: {scroll_handle}; border-radius: 4px; min-height: 20px;
-        }}
-        QScrollBar::handle:vertical:hover {{ background: {scroll_hover}; }}
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
-        QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{ background: none; }}
-    """)
     text_browser.setHtml(html_content)
     layout.addWidget(text_browser)
 
     # Кнопки
-    button_style = f"""
-        QPushButton {{
-            background-color: {btn_bg}; color: {text_color};
-            border: 1px solid {btn_border}; padding: 8px 16px; min-width: 80px;
-        }}
-        QPushButton:hover {{ background-color: {btn_hover}; }}
-    """
-
     copy_text = "Copy" if lang == "en" else "Копировать"
     close_text = "Close" if lang == "en" else "Закрыть"
     google_text = "Google" if lang == "en" else "Гугл"
@@ -2116,15 +2384,12 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
     copy_button = None
     if not auto_copy:
         copy_button = QPushButton(copy_text)
-        copy_button.setStyleSheet(button_style)
         button_layout.addWidget(copy_button)
 
     google_button = QPushButton(google_text)
-    google_button.setStyleSheet(button_style)
     button_layout.addWidget(google_button)
 
     close_button = QPushButton(close_text)
-    close_button.setStyleSheet(button_style)
     button_layout.addWidget(close_button)
 
     layout.addLayout(button_layout)
@@ -2161,11 +2426,45 @@ def show_translation_dialog(parent, translated_text, auto_copy=True, lang='ru',
     while True:
         dialog.exec_()
         if action["google"]:
+            import urllib.parse
+            import webbrowser
             url = "https://www.google.com/search?q=" + urllib.parse.quote(translated_text)
             webbrowser.open(url)
             break
         else:
             break
+    # parent — оверлей выделения из пула, он переживает захват; диалог ему в детях не нужен
+    dialog.deleteLater()
+
+# Модули, которые догружаются в фоне после показа окна (первый перевод не ждёт импорта)
+_PRELOAD_MODULES = ("requests", "translater", "settings_window")
+
+
+def _preload_heavy_modules():
+    """Импортирует тяжёлые модули (задача фонового прогрева, см. warmup.py)."""
+    import importlib
+    for name in _PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logging.warning(f"Preload of {name} failed: {e}")
+    # Argos (ctranslate2/sentencepiece/stanza) грузим только если он выбран
+    if get_cached_config().get("translator_engine", "Google").lower() == "argos":
+        import translater
+        translater._load_argos()
+
+
+def _prepare_capture_mode(mode):
+    """Учитывает использование режима и дожидается только нужного ему прогрева."""
+    try:
+        from warmup import get_scheduler, record_mode_usage
+        record_mode_usage(mode)
+        scheduler = get_scheduler()
+        if scheduler is not None:
+            scheduler.ensure_for_mode(mode)
+    except Exception as e:
+        logging.warning(f"Warm-up check for {mode} failed: {e}")
+
 
 if __name__ == "__main__":
     # --- Обработка вызова как OCR подпроцесса -----------------
@@ -2215,15 +2514,9 @@ if __name__ == "__main__":
         bring_existing_to_front()
         sys.exit(0)
     
-    # Читаем конфиг
-    start_minimized = False
-    try:
-        config_path = get_data_file("config.json")
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            start_minimized = config.get("start_minimized", False)
-    except Exception:
-        pass
+    # Читаем конфиг (при первом запуске создаётся файл с DEFAULT_CONFIG)
+    get_data_file("config.json")
+    start_minimized = get_cached_config().get("start_minimized", False)
     app = QApplication([])
     app.setQuitOnLastWindowClosed(False)
     # Повышаем приоритет процесса для уменьшения задержек
@@ -2232,25 +2525,14 @@ if __name__ == "__main__":
         ctypes.windll.kernel32.SetPriorityClass(ctypes.windll.kernel32.GetCurrentProcess(), HIGH_PRIORITY_CLASS)
     except Exception:
         pass
-    # Прогрев OCR, чтобы первый запуск оверлея был быстрее
-    try:
-        from ocr import warm_up, prepare_overlay
-        import logging
-        # Логируем настройки при старте
-        config = get_cached_config()
-        logging.info("=" * 50)
-        logging.info("🚀 ClicknTranslate Started")
-        logging.info(f"🔍 OCR Engine: {config.get('ocr_engine', 'Windows').upper()}")
-        logging.info(f"🌐 Translator: {config.get('translator_engine', 'Google').upper()}")
-        logging.info(f"🗣️  OCR Language: {config.get('last_ocr_language', 'ru').upper()}")
-        logging.info("=" * 50)
-        warm_up()
-        # Подготовим заранее все режимы оверлея
-        prepare_overlay("ocr")
-        prepare_overlay("copy")
-        prepare_overlay("translate")
-    except Exception:
-        pass
+    # Логируем настройки при старте
+    config = get_cached_config()
+    logging.info("=" * 50)
+    logging.info("🚀 ClicknTranslate Started")
+    logging.info(f"🔍 OCR Engine: {config.get('ocr_engine', 'Windows').upper()}")
+    logging.info(f"🌐 Translator: {config.get('translator_engine', 'Google').upper()}")
+    logging.info(f"🗣️  OCR Language: {config.get('last_ocr_language', 'ru').upper()}")
+    logging.info("=" * 50)
     window = DarkThemeApp()
     # Всегда используем window.start_minimized, который инициализирован из config.json
     # Проверку на повторный запуск is_already_running() убрали
@@ -2258,4 +2540,24 @@ if __name__ == "__main__":
         window.minimize_to_tray()
     else:
         window.show()
+
+    # Прогрев OCR движков, переводчика и оверлеев — после старта event loop,
+    # чтобы не задерживать первую отрисовку
+    def _start_warmup():
+        try:
+            from warmup import start_warmup
+            start_warmup(get_cached_config(), preload_modules=_preload_heavy_modules)
+        except Exception as e:
+            logging.warning(f"Warm-up scheduler failed to start: {e}")
+
+    QTimer.singleShot(0, _start_warmup)
+
+    def _start_local_api():
+        try:
+            from local_api import start_local_api
+            start_local_api(get_cached_config())
+        except Exception as e:
+            logging.warning(f"Local API failed to start: {e}")
+
+    QTimer.singleShot(0, _start_local_api)
     app.exec_()
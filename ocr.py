@@ -1,8 +1,12 @@
 import sys
 import asyncio
+import concurrent.futures
+import itertools
 import os
 import json
 import logging
+import threading
+import time
 from datetime import datetime
 import shutil
 
@@ -10,6 +14,8 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import QApplication, QWidget, QMessageBox
 import pyperclip
 
+from ui_resources import OVERLAY_LANG_COMBO_STYLE, apply_stylesheet, get_icon, message_box_stylesheet
+
 # Настройка логирования в файл для диагностики
 def get_log_path():
     if hasattr(sys, '_MEIPASS'):
@@ -101,24 +107,11 @@ def get_data_file(filename):
         os.makedirs(data_dir)
     return os.path.join(data_dir, filename)
 
-# --- Кэширование конфигурации ---
-_ocr_config_cache = None
-_ocr_config_mtime = 0
-
+# --- Конфигурация: общий in-memory store (config_store.py) ---
 def get_cached_ocr_config():
-    """Возвращает закэшированную конфигурацию OCR."""
-    global _ocr_config_cache, _ocr_config_mtime
-    config_path = get_data_file("config.json")
-    try:
-        mtime = os.path.getmtime(config_path)
-        if _ocr_config_cache is None or mtime > _ocr_config_mtime:
-            with open(config_path, "r", encoding="utf-8") as f:
-                _ocr_config_cache = json.load(f)
-            _ocr_config_mtime = mtime
-    except Exception:
-        if _ocr_config_cache is None:
-            _ocr_config_cache = {}
-    return _ocr_config_cache
+    """Текущая конфигурация из памяти (без обращения к диску)."""
+    from config_store import get_config_store
+    return get_config_store().snapshot()
 
 def load_ocr_config():
     return get_cached_ocr_config().get("ocr_language", "ru")
@@ -414,8 +407,261 @@ def qimage_to_softwarebitmap(qimage):
         debug_log(traceback.format_exc())
         return None
 
+# --- Предобработка и распознавание (общие для захвата, batch-режима и bench_ocr.py) ---
+
+# Целевая высота текста для OCR, px
+OCR_TARGET_TEXT_HEIGHT = 45.0
+# Меньшие изображения дополняются полями (критично для маленьких областей)
+OCR_MIN_IMAGE_SIZE = 64
+
+def estimate_scale_factor(min_dimension):
+    """Агрессивный масштаб по размеру области: предполагаемая высота текста -> 45 px."""
+    if min_dimension < 25:
+        estimated_text_height = 8  # Очень маленький текст
+    elif min_dimension < 50:
+        estimated_text_height = 12
+    elif min_dimension < 100:
+        estimated_text_height = 18
+    elif min_dimension < 150:
+        estimated_text_height = 25
+    else:
+        estimated_text_height = 30
+    scale_factor = OCR_TARGET_TEXT_HEIGHT / estimated_text_height
+    # Ограничиваем масштаб: от 1x до 10x
+    return max(min(scale_factor, 10.0), 1.0), estimated_text_height
+
+def qimage_to_pil(qimage):
+    from PIL import Image
+    qimg_rgba = qimage.convertToFormat(QtGui.QImage.Format_RGBA8888)
+    ptr = qimg_rgba.constBits()
+    ptr.setsize(qimg_rgba.byteCount())
+    # copy(): буфер QImage живёт только вместе с qimg_rgba
+    return Image.frombuffer("RGBA", (qimg_rgba.width(), qimg_rgba.height()), ptr, "raw", "RGBA", 0, 1).copy()
+
+def preprocess_for_ocr(qimage, timings=None):
+    """Пайплайн предобработки захвата: поля, масштаб, контраст/резкость, бинаризация.
+
+    timings — необязательный dict, куда пишется время каждого этапа в мс
+    (pad, scale, enhance, binarize, to_qimage).
+    """
+    from PIL import ImageEnhance, ImageOps
+
+    def mark(stage, started):
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+
+    # ===== PADIMAGE ИЗ TEXT-GRAB (критично для маленьких областей!) =====
+    # Padding заполняется цветом фона (первый пиксель) для естественного вида
+    started = time.perf_counter()
+    original_width = qimage.width()
+    original_height = qimage.height()
+    if original_width < OCR_MIN_IMAGE_SIZE or original_height < OCR_MIN_IMAGE_SIZE:
+        new_width = max(original_width + 16, OCR_MIN_IMAGE_SIZE + 16)
+        new_height = max(original_height + 16, OCR_MIN_IMAGE_SIZE + 16)
+        padded_qimage = QtGui.QImage(new_width, new_height, QtGui.QImage.Format_RGBA8888)
+        bg_color = QtGui.QColor(qimage.pixel(0, 0))
+        padded_qimage.fill(bg_color)
+        # Рисуем исходное изображение в центре со смещением 8px
+        painter = QtGui.QPainter(padded_qimage)
+        painter.drawImage(8, 8, qimage)
+        painter.end()
+        qimage = padded_qimage
+        logging.info(f"PadImage: {original_width}x{original_height} → {qimage.width()}x{qimage.height()} (bg color: {bg_color.name()})")
+    mark("pad", started)
+
+    # ===== АГРЕССИВНОЕ МАСШТАБИРОВАНИЕ =====
+    started = time.perf_counter()
+    original_width = qimage.width()
+    original_height = qimage.height()
+    min_dimension = min(original_width, original_height)
+    scale_factor, estimated_text_height = estimate_scale_factor(min_dimension)
+    logging.info(f"Aggressive scaling: estimated text height {estimated_text_height}px, scale {scale_factor:.1f}x")
+    if scale_factor > 1.0:
+        qimage = qimage.scaled(int(original_width * scale_factor), int(original_height * scale_factor),
+                               QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        logging.info(f"Scaled: {original_width}x{original_height} → {qimage.width()}x{qimage.height()}")
+    mark("scale", started)
+
+    # ===== АГРЕССИВНАЯ ПРЕДОБРАБОТКА =====
+    started = time.perf_counter()
+    pil_image = qimage_to_pil(qimage).convert('L')
+    # Контраст и резкость для маленького текста
+    pil_image = ImageEnhance.Contrast(pil_image).enhance(2.5)
+    pil_image = ImageEnhance.Sharpness(pil_image).enhance(2.0)
+    # Белые поля помогают OCR определить границы
+    pil_image = ImageOps.expand(pil_image, border=20, fill='white')
+    mark("enhance", started)
+
+    # Бинаризация только для маленького текста
+    started = time.perf_counter()
+    if min_dimension < 100:
+        threshold = 128
+        pil_image = pil_image.point(lambda x: 0 if x < threshold else 255, '1').convert('L')
+    mark("binarize", started)
+
+    started = time.perf_counter()
+    img_bytes = pil_image.tobytes()
+    # copy(): QImage не владеет img_bytes
+    qimage = QtGui.QImage(img_bytes, pil_image.width, pil_image.height,
+                          pil_image.width, QtGui.QImage.Format_Grayscale8).copy()
+    mark("to_qimage", started)
+    return qimage
+
+def _ensure_tesseract_model(lang_code, dest_dir):
+    """Скачивает {lang}.traineddata, если его нет в tessdata."""
+    fname = f"{lang_code}.traineddata"
+    target_path = os.path.join(dest_dir, fname)
+    if os.path.exists(target_path):
+        return
+    try:
+        import requests
+        url = f"https://github.com/tesseract-ocr/tessdata/raw/main/{fname}"
+        logging.info(f"Downloading {fname} …")
+        r = requests.get(url, timeout=30, stream=True)
+        r.raise_for_status()
+        with open(target_path + '.tmp', 'wb') as f:
+            shutil.copyfileobj(r.raw, f)
+        os.replace(target_path + '.tmp', target_path)
+        logging.info(f"{fname} downloaded into {dest_dir}")
+    except Exception as dl_err:
+        logging.warning(f"Could not download language model {lang_code}: {dl_err}")
+
+def configure_tesseract(download_models=True):
+    """Находит tesseract, настраивает pytesseract и TESSDATA_PREFIX. None — не найден."""
+    import pytesseract
+    tess_cmd = ScreenCaptureOverlay.get_tesseract_cmd()
+    if not tess_cmd:
+        return None
+    pytesseract.pytesseract.tesseract_cmd = tess_cmd
+    logging.info(f"Using Tesseract at: {tess_cmd}")
+
+    # Устанавливаем TESSDATA_PREFIX для корректного поиска моделей
+    tess_dir = os.path.dirname(tess_cmd)
+    candidate_dirs = [
+        os.path.join(tess_dir, "tessdata"),  # стандартное расположение в portable-сборке
+        os.path.join(os.path.dirname(tess_dir), "tessdata"),  # если exe лежит в bin/
+    ]
+    for td in candidate_dirs:
+        if os.path.isdir(td):
+            os.environ["TESSDATA_PREFIX"] = td
+            break
+    else:
+        # на всякий случай убираем переменную, чтобы Tesseract искал в своих стандартных местах
+        os.environ.pop("TESSDATA_PREFIX", None)
+
+    tessdata_dir = os.environ.get("TESSDATA_PREFIX")
+    if download_models and tessdata_dir and os.path.isdir(tessdata_dir):
+        for lc in ("eng", "rus"):
+            _ensure_tesseract_model(lc, tessdata_dir)
+    return tess_cmd
+
+def recognize_tesseract_text(qimage, language_code):
+    """Tesseract по уже подготовленному изображению (configure_tesseract() вызван заранее)."""
+    import pytesseract
+    tess_lang = "eng" if language_code == "en" else "rus"
+    logging.info(f"🔄 Running Tesseract OCR for language '{tess_lang}'...")
+    # Оптимизация скорости: --oem 3 (LSTM only), --psm 6 (single block)
+    return pytesseract.image_to_string(qimage_to_pil(qimage), lang=tess_lang, config='--oem 3 --psm 6')
+
+def recognize_windows_text(bitmap, language_code, use_universal=False):
+    """Windows OCR по SoftwareBitmap; возвращает текст ('' при ошибке)."""
+    recognized_text = ""
+    try:
+        # Выбираем engine в зависимости от режима
+        if use_universal:
+            debug_log("Using universal OCR engine (from user profile languages)")
+            engine = _get_universal_ocr_engine()
+        else:
+            lang_tag = {"en": "en-US", "ru": "ru-RU"}.get(language_code, language_code)
+            debug_log(f"lang_tag = {lang_tag}")
+            engine = _get_windows_ocr_engine(lang_tag)
+
+        debug_log(f"engine = {engine}")
+        if engine is None:
+            debug_log("ERROR: engine is None, returning empty result")
+            return ""
+
+        debug_log("Calling run_ocr_with_engine...")
+        recognized = run_on_ocr_loop(run_ocr_with_engine(bitmap, engine))
+        debug_log(f"recognized = {recognized}")
+
+        if recognized:
+            try:
+                # Проверяем lines через try/except (hasattr вызывает ошибку импорта collections)
+                lines = recognized.lines
+                if lines:
+                    # Собираем текст из слов с правильными пробелами
+                    lines_text = []
+                    for line in lines:
+                        try:
+                            words = list(line.words)
+                            if words:
+                                line_text = " ".join(word.text for word in words)
+                            else:
+                                line_text = line.text
+                        except:
+                            line_text = line.text
+                        lines_text.append(line_text)
+                    recognized_text = "\n".join(lines_text)
+                    debug_log(f"recognized_text = '{recognized_text[:100]}...' (length={len(recognized_text)})")
+                    logging.info(f"✅ Windows OCR recognized {len(recognized_text)} chars successfully")
+                else:
+                    debug_log("recognized.lines is empty")
+                    logging.warning("⚠️ Windows OCR returned empty result")
+            except AttributeError:
+                debug_log("ERROR: recognized has no 'lines' attribute")
+            except Exception as e:
+                debug_log(f"ERROR accessing recognized.lines: {e}")
+        else:
+            debug_log("No recognized text (recognized is None)")
+            logging.warning("⚠️ Windows OCR returned None")
+    except Exception as e:
+        debug_log(f"EXCEPTION in recognize_windows_text(): {e}")
+        import traceback
+        debug_log(traceback.format_exc())
+        recognized_text = ""
+    return recognized_text
+
+# Tesseract: configure_tesseract() (поиск exe и tessdata) — один раз на процесс
+_tesseract_ready = None
+_tesseract_lock = threading.Lock()
+
+def ensure_tesseract():
+    """configure_tesseract() один раз на процесс; True, если Tesseract доступен."""
+    global _tesseract_ready
+    if _tesseract_ready is None:
+        with _tesseract_lock:
+            if _tesseract_ready is None:
+                try:
+                    _tesseract_ready = configure_tesseract() is not None
+                except ImportError:
+                    _tesseract_ready = False
+    return _tesseract_ready
+
+def recognize_image(qimage, language_code, engine="windows", token=None):
+    """OCR подготовленного изображения без GUI: Windows OCR с фоллбеком на Tesseract
+    (или только Tesseract). Возвращает (текст, движок). Используется batch.py, local_api.py
+    и задачами OCRJobManager (token — CancelToken, проверяется между движками)."""
+    if engine == "windows" and _WINRT_AVAILABLE:
+        bitmap = qimage_to_softwarebitmap(qimage)
+        if token is not None:
+            token.check()
+        text = recognize_windows_text(bitmap, language_code, use_universal=(language_code == "universal"))
+        if text or not ensure_tesseract():
+            return text, "windows"
+        logging.info("Windows OCR returned empty result, attempting Tesseract fallback...")
+    if token is not None:
+        token.check()
+    if not ensure_tesseract():
+        raise RuntimeError("No OCR engine available (Windows OCR / Tesseract)")
+    return recognize_tesseract_text(qimage, language_code), "tesseract"
+
 # Глобальный event loop для OCR (переиспользование)
 _ocr_event_loop = None
+# Цикл один на процесс, а OCR зовут задачи OCRJobManager, HTTP-потоки local_api и
+# Live режим: второй run_until_complete на работающем цикле падает с
+# "This event loop is already running"
+_ocr_loop_lock = threading.Lock()
 
 def _get_ocr_event_loop():
     global _ocr_event_loop
@@ -423,98 +669,174 @@ def _get_ocr_event_loop():
         _ocr_event_loop = asyncio.new_event_loop()
     return _ocr_event_loop
 
-class OCRWorker(QtCore.QThread):
-    result_ready = QtCore.pyqtSignal(str)
-    def __init__(self, bitmap, language_code, parent=None, use_universal=False):
-        super().__init__(parent)
-        self.bitmap = bitmap
-        self.language_code = language_code
-        self.use_universal = use_universal
-
-    def run(self):
-        debug_log(f"OCRWorker.run() started")
-        debug_log(f"self.bitmap = {self.bitmap}")
-        debug_log(f"self.language_code = {self.language_code}")
-        debug_log(f"self.use_universal = {self.use_universal}")
+def run_on_ocr_loop(coro):
+    """Выполняет корутину Windows OCR в общем event loop (по одной за раз из любого потока)."""
+    with _ocr_loop_lock:
+        loop = _get_ocr_event_loop()
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+
+def grab_screens():
+    """Снимок всех экранов: [(геометрия экрана в глобальных координатах, QPixmap, масштаб)].
+
+    QScreen.grabWindow работает только в GUI потоке, поэтому снимок делается
+    при открытии оверлея, до его показа; дальше выделение вырезается из памяти.
+    """
+    shots = []
+    for screen in QApplication.screens():
+        geometry = screen.geometry()
+        pixmap = screen.grabWindow(0)
+        if pixmap.isNull() or geometry.width() <= 0:
+            continue
+        shots.append((geometry, pixmap, pixmap.width() / geometry.width()))
+    return shots
+
+def crop_screens(shots, rect):
+    """Вырезает rect (глобальные координаты) из снимка grab_screens() в QImage.
+
+    Область на нескольких мониторах склеивается в масштабе самого плотного из них.
+    """
+    parts = [(geometry.intersected(rect), geometry, pixmap, scale)
+             for geometry, pixmap, scale in shots if geometry.intersects(rect)]
+    if not parts:
+        return QtGui.QImage()
+
+    def source_rect(part, geometry, scale):
+        return QtCore.QRect(round((part.x() - geometry.x()) * scale), round((part.y() - geometry.y()) * scale),
+                            round(part.width() * scale), round(part.height() * scale))
+
+    if len(parts) == 1 and parts[0][0] == rect:
+        part, geometry, pixmap, scale = parts[0]
+        return pixmap.copy(source_rect(part, geometry, scale)).toImage()
+    scale = max(p[3] for p in parts)
+    image = QtGui.QImage(round(rect.width() * scale), round(rect.height() * scale), QtGui.QImage.Format_RGB32)
+    image.fill(QtCore.Qt.black)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+    for part, geometry, pixmap, part_scale in parts:
+        target = QtCore.QRectF((part.x() - rect.x()) * scale, (part.y() - rect.y()) * scale,
+                               part.width() * scale, part.height() * scale)
+        painter.drawPixmap(target, pixmap, QtCore.QRectF(source_rect(part, geometry, part_scale)))
+    painter.end()
+    return image
+
+class OCRJobCancelled(Exception):
+    """Задача OCR отменена: новый захват в том же режиме или оверлей закрыт."""
+
+
+class CancelToken:
+    """Флаг отмены задачи; конвейер вызывает check() между этапами."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise OCRJobCancelled()
+
+
+# Один поток: Windows OCR всё равно идёт по одному через общий event loop (run_on_ocr_loop)
+OCR_JOB_WORKERS = 1
+
+
+class OCRJobManager(QtCore.QObject):
+    """Задачи OCR в фиксированном пуле потоков вместо нового QThread на каждый захват.
+
+    У задачи есть id и токен отмены. Для каждого владельца (режим оверлея)
+    доставляется только результат последней задачи: новая задача отменяет
+    предыдущую, закрытие оверлея — текущую. Результаты отменённых задач
+    отбрасываются и учитываются в stats.
+    """
+    _finished = QtCore.pyqtSignal(int, object, object)  # job_id, результат, ошибка
+
+    def __init__(self, workers=OCR_JOB_WORKERS):
+        super().__init__()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-job")
+        self._ids = itertools.count(1)
+        # Только из GUI потока: submit/cancel и доставка результата (_finished — queued в GUI поток)
+        self._jobs = {}  # job_id -> (owner, token, callback)
+        self._latest = {}  # owner -> job_id последней задачи
+        self.stats = {"submitted": 0, "delivered": 0, "failed": 0, "cancelled": 0, "dropped": 0}
+        self._finished.connect(self._deliver)
+
+    def submit(self, owner, func, callback):
+        """func(token) выполняется в пуле; callback(result, error) — в GUI потоке,
+        если задача так и осталась последней у owner. Возвращает job_id."""
+        self.cancel(owner)
+        job_id = next(self._ids)
+        token = CancelToken()
+        self._jobs[job_id] = (owner, token, callback)
+        self._latest[owner] = job_id
+        self.stats["submitted"] += 1
+        self._executor.submit(self._run, job_id, token, func)
+        return job_id
+
+    def cancel(self, owner):
+        """Отменяет текущую задачу owner (если есть); её результат не будет доставлен."""
+        job_id = self._latest.pop(owner, None)
+        if job_id is not None and job_id in self._jobs:
+            self._jobs[job_id][1].cancel()
+
+    def _run(self, job_id, token, func):
+        result, error = None, None
         try:
-            # Выбираем engine в зависимости от режима
-            if self.use_universal:
-                debug_log("Using universal OCR engine (from user profile languages)")
-                engine = _get_universal_ocr_engine()
-            else:
-                # Определяем language tag
-                lang_tag = {"en": "en-US", "ru": "ru-RU"}.get(self.language_code, self.language_code)
-                debug_log(f"lang_tag = {lang_tag}")
-                engine = _get_windows_ocr_engine(lang_tag)
-            
-            debug_log(f"engine = {engine}")
-            
-            if engine is None:
-                debug_log("ERROR: engine is None, emitting empty result")
-                self.result_ready.emit("")
-                return
+            token.check()  # отменена, пока ждала в очереди
+            result = func(token)
+        except Exception as e:  # в т.ч. OCRJobCancelled — _deliver различает по типу
+            error = e
+        self._finished.emit(job_id, result, error)
+
+    def _deliver(self, job_id, result, error):
+        owner, token, callback = self._jobs.pop(job_id)
+        if token.cancelled or self._latest.get(owner) != job_id:
+            # Остановлена между этапами — cancelled; успела досчитать после отмены — dropped
+            reason = "cancelled" if isinstance(error, OCRJobCancelled) else "dropped"
+            self.stats[reason] += 1
+            logging.info(f"OCR job {job_id} ({owner}) {reason}, result not delivered")
+            return
+        del self._latest[owner]
+        self.stats["failed" if error is not None else "delivered"] += 1
+        callback(result, error)
 
-            # Переиспользуем event loop
-            loop = _get_ocr_event_loop()
-            asyncio.set_event_loop(loop)
 
-            debug_log("Calling run_ocr_with_engine...")
-            recognized = loop.run_until_complete(run_ocr_with_engine(self.bitmap, engine))
-            debug_log(f"recognized = {recognized}")
+_ocr_job_manager = None
 
-            recognized_text = ""
-            if recognized:
-                try:
-                    # Проверяем lines через try/except (hasattr вызывает ошибку импорта collections)
-                    lines = recognized.lines
-                    if lines:
-                        # Собираем текст из слов с правильными пробелами
-                        lines_text = []
-                        for line in lines:
-                            try:
-                                # Используем words для правильных пробелов между словами
-                                words = list(line.words)
-                                if words:
-                                    line_text = " ".join(word.text for word in words)
-                                else:
-                                    line_text = line.text
-                            except:
-                                line_text = line.text
-                            lines_text.append(line_text)
-                        recognized_text = "\n".join(lines_text)
-                        debug_log(f"recognized_text = '{recognized_text[:100]}...' (length={len(recognized_text)})")
-                        logging.info(f"✅ Windows OCR recognized {len(recognized_text)} chars successfully")
-                    else:
-                        debug_log("recognized.lines is empty")
-                        logging.warning("⚠️ Windows OCR returned empty result")
-                except AttributeError:
-                    debug_log("ERROR: recognized has no 'lines' attribute")
-                except Exception as e:
-                    debug_log(f"ERROR accessing recognized.lines: {e}")
-            else:
-                debug_log("No recognized text (recognized is None)")
-                logging.warning("⚠️ Windows OCR returned None")
 
-        except Exception as e:
-            debug_log(f"EXCEPTION in OCRWorker.run(): {e}")
-            import traceback
-            debug_log(traceback.format_exc())
-            recognized_text = ""
-        
-        debug_log(f"Emitting result: '{recognized_text[:50]}...' (len={len(recognized_text)})")
-        self.result_ready.emit(recognized_text)
+def get_ocr_job_manager():
+    """Общий менеджер задач OCR (создавать и вызывать из GUI потока)."""
+    global _ocr_job_manager
+    if _ocr_job_manager is None:
+        _ocr_job_manager = OCRJobManager()
+    return _ocr_job_manager
+
 
 class ScreenCaptureOverlay(QWidget):
+    # Перерисовывать только старую+новую рамку выделения (False — весь экран, для сравнения в bench_overlay.py)
+    PARTIAL_REPAINT = True
+    # Запас вокруг рамки: свечение шириной 5px рисуется со смещением 2px наружу
+    SELECTION_REPAINT_MARGIN = 6
+
     def __init__(self, mode="ocr", defer_show=False):
         super().__init__()
         # Устанавливаем иконку приложения
-        self.setWindowIcon(QtGui.QIcon(resource_path("icons/icon.ico")))
+        self.setWindowIcon(get_icon("icons/icon.ico"))
         
         self.mode = mode
         self.start_point = None
         self.end_point = None
         self.last_rect = None
         self.selection_coords = None  # Координаты для оверлейного режима
+        self._painted_selection = None  # рамка, нарисованная в прошлом кадре (для частичной перерисовки)
+        self._paint_cache = None  # (no_dimming, кисти и перья) — не создаём на каждый кадр
+        self._frozen_shots = None  # снимок экранов в режиме frozen_screen_capture (локальные координаты)
+        self._show_requested_at = None  # perf_counter() нажатия хоткея — для метрики time-to-visible
         # Загрузка последнего выбранного языка из конфигурации
         config = get_cached_ocr_config()
         self.current_language = config.get("last_ocr_language", "ru")
@@ -536,92 +858,20 @@ class ScreenCaptureOverlay(QWidget):
         # В режиме copy добавляем опцию "Универсальный" первой (эмодзи планеты)
         if self.mode == "copy":
             self.lang_combo.addItem("🌐  AUTO", "universal")
-            self.lang_combo.addItem(QtGui.QIcon(resource_path("icons/Russian_flag.png")), "RU", "ru")
-            self.lang_combo.addItem(QtGui.QIcon(resource_path("icons/American_flag.png")), "EN", "en")
+            self.lang_combo.addItem(get_icon("icons/Russian_flag.png"), "RU", "ru")
+            self.lang_combo.addItem(get_icon("icons/American_flag.png"), "EN", "en")
         else:
             # В режиме translate/live показываем направление перевода
             prefix = "🔴 " if self.mode == "live" else ""
-            self.lang_combo.addItem(QtGui.QIcon(resource_path("icons/Russian_flag.png")), f"{prefix}RU → EN", "ru")
-            self.lang_combo.addItem(QtGui.QIcon(resource_path("icons/American_flag.png")), f"{prefix}EN → RU", "en")
+            self.lang_combo.addItem(get_icon("icons/Russian_flag.png"), f"{prefix}RU → EN", "ru")
+            self.lang_combo.addItem(get_icon("icons/American_flag.png"), f"{prefix}EN → RU", "en")
 
         # Устанавливаем индекс на основе self.current_language (сохраненного)
-        if self.mode == "copy":
-            # В режиме copy есть AUTO, RU, EN (индексы 0, 1, 2)
-            if self.current_language == "universal":
-                default_index = 0  # AUTO
-            elif self.current_language == "ru":
-                default_index = 1  # RU
-            elif self.current_language == "en":
-                default_index = 2  # EN
-            else:
-                default_index = 0  # По умолчанию AUTO
-        else:
-            # В режиме translate/live только RU, EN (индексы 0, 1)
-            default_index = 0 if self.current_language == "ru" else 1
-        self.lang_combo.setCurrentIndex(default_index)
+        self.lang_combo.setCurrentIndex(self._language_index(self.current_language))
         
         # Photoshop-style дизайн: темный, профессиональный, с эффектами
         self.lang_combo.setIconSize(QtCore.QSize(40, 40))
-        self.lang_combo.setStyleSheet("""
-            QComboBox {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(60, 60, 60, 240),
-                    stop:0.5 rgba(45, 45, 45, 245),
-                    stop:1 rgba(35, 35, 35, 250));
-                color: #e8e8e8;
-                border: 1px solid rgba(80, 80, 80, 200);
-                border-top: 1px solid rgba(100, 100, 100, 150);
-                border-radius: 8px;
-                padding: 10px 16px;
-                font-size: 16px;
-                font-weight: 600;
-                font-family: 'Segoe UI', Arial, sans-serif;
-                min-width: 110px;
-            }
-            QComboBox:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(75, 75, 75, 245),
-                    stop:0.5 rgba(55, 55, 55, 250),
-                    stop:1 rgba(45, 45, 45, 255));
-                border: 1px solid rgba(100, 100, 100, 220);
-                border-top: 1px solid rgba(130, 130, 130, 180);
-            }
-            QComboBox:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 rgba(40, 40, 40, 250),
-                    stop:1 rgba(55, 55, 55, 255));
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 24px;
-                subcontrol-origin: padding;
-                subcontrol-position: right center;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                width: 0;
-            }
-            QComboBox QAbstractItemView {
-                background-color: rgba(40, 40, 40, 252);
-                color: #e8e8e8;
-                border: 1px solid rgba(80, 80, 80, 200);
-                border-radius: 6px;
-                padding: 6px;
-                selection-background-color: rgba(80, 130, 200, 180);
-                outline: none;
-            }
-            QComboBox QAbstractItemView::item {
-                padding: 10px 14px;
-                border-radius: 4px;
-                margin: 2px;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                background-color: rgba(70, 70, 70, 200);
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background-color: rgba(80, 130, 200, 180);
-            }
-        """)
+        apply_stylesheet(self.lang_combo, OVERLAY_LANG_COMBO_STYLE)
         # Размер зависит от режима (translate/live имеет более длинный текст)
         combo_width = 180 if self.mode in ("translate", "live") else 160
         self.lang_combo.setFixedSize(combo_width, 56)
@@ -632,15 +882,58 @@ class ScreenCaptureOverlay(QWidget):
         # Сохраняем язык при изменении
         self.lang_combo.currentIndexChanged.connect(self.on_language_changed)
 
-    def show_overlay(self):
+    def _language_index(self, language):
+        if self.mode == "copy":
+            # В режиме copy есть AUTO, RU, EN (индексы 0, 1, 2); по умолчанию AUTO
+            return {"universal": 0, "ru": 1, "en": 2}.get(language, 0)
+        # В режиме translate/live только RU, EN (индексы 0, 1)
+        return 0 if language == "ru" else 1
+
+    def _sync_language(self):
+        """Язык мог смениться в другом режиме или в настройках — комбобокс трогаем только тогда."""
+        language = get_cached_ocr_config().get("last_ocr_language", "ru")
+        if language == self.current_language:
+            return
+        self.current_language = language
+        self.lang_combo.blockSignals(True)  # это не выбор пользователя — в конфиг не пишем
+        self.lang_combo.setCurrentIndex(self._language_index(language))
+        self.lang_combo.blockSignals(False)
+
+    def reset_for_reuse(self):
+        """Сбрасывает состояние прошлого захвата: окно остаётся в пуле, а не пересоздаётся."""
+        self.start_point = None
+        self.end_point = None
+        self.last_rect = None
+        self.selection_coords = None
+        self._painted_selection = None
+        self._frozen_shots = None  # снимок экранов — десятки МБ, не держим после закрытия
+        self._show_requested_at = None
+        if _ocr_job_manager is not None:
+            _ocr_job_manager.cancel(self.mode)  # закрыт до результата — результат не нужен
+
+    def show_overlay(self, requested_at=None):
         try:
             logging.info("Showing overlay...")
+            self._show_requested_at = requested_at if requested_at is not None else time.perf_counter()
             self.setWindowOpacity(1.0)
+            if hasattr(self, "lang_combo"):
+                self._sync_language()
             
             # Calculate the total geometry of all screens
             total_rect = QtCore.QRect()
             for screen in QApplication.screens():
                 total_rect = total_rect.united(screen.geometry())
+
+            # Режим «замороженного экрана»: один снимок всех мониторов до показа окна
+            self._frozen_shots = None
+            from config_store import get_config_store
+            if get_config_store().get_bool("frozen_screen_capture"):
+                started = time.perf_counter()
+                offset = total_rect.topLeft()
+                self._frozen_shots = [(geometry.translated(-offset), pixmap, scale)
+                                      for geometry, pixmap, scale in grab_screens()]
+                logging.info(f"Frozen screen snapshot: {len(self._frozen_shots)} screen(s) "
+                             f"in {(time.perf_counter() - started) * 1000:.1f} ms")
             
             # Set geometry to cover the entire virtual desktop
             self.setGeometry(total_rect)
@@ -703,68 +996,128 @@ class ScreenCaptureOverlay(QWidget):
             logging.info(f"Moved combo to {x}, {y} (Screen: {screen_geo})")
 
     def closeEvent(self, event):
-        try:
-            prepare_overlay(self.mode)
-        except Exception:
-            pass
+        # close() только скрывает окно (без WA_DeleteOnClose) — следующий хоткей покажет его же
+        self.reset_for_reuse()
         super().closeEvent(event)
 
+    def _get_paint_cache(self):
+        """Кисти и перья оверлея; пересоздаются только при смене настройки затемнения."""
+        # Проверка настройки "не затемнять экран" (из памяти, без stat() на каждый кадр)
+        from config_store import get_config_store
+        no_dimming = get_config_store().get_bool("no_screen_dimming")
+        if self._paint_cache is None or self._paint_cache["no_dimming"] != no_dimming:
+            self._paint_cache = {
+                "no_dimming": no_dimming,
+                # Без затемнения — почти невидимый фон: без него окно полностью прозрачно
+                # и клики проваливаются сквозь него
+                "dim": QtGui.QColor(0, 0, 0, 5 if no_dimming else 150),
+                # В режиме без затемнения область выделения подсвечивается светлым фоном
+                "selection_fill": QtGui.QColor(255, 255, 255, 30),
+                # Photoshop-style рамка: свечение, основная голубая рамка, внутренняя светлая
+                "glow_pen": QtGui.QPen(QtGui.QColor(80, 160, 255, 60), 5, QtCore.Qt.SolidLine),
+                "main_pen": QtGui.QPen(QtGui.QColor(80, 160, 255, 255), 1, QtCore.Qt.SolidLine),
+                "inner_pen": QtGui.QPen(QtGui.QColor(200, 230, 255, 100), 1, QtCore.Qt.SolidLine),
+            }
+        return self._paint_cache
+
+    def _selection_rect(self):
+        if self.start_point and self.end_point:
+            return QtCore.QRect(self.start_point, self.end_point).normalized()
+        return None
+
+    def _update_selection(self):
+        """Перерисовывает объединение старой и новой рамки (с запасом на свечение), а не весь экран."""
+        rect = self._selection_rect()
+        if not self.PARTIAL_REPAINT:
+            self.update()
+            return
+        margin = self.SELECTION_REPAINT_MARGIN
+        old = self._painted_selection
+        region = QtGui.QRegion()
+        for r in (old, rect):
+            if r is not None:
+                region = region.united(r.adjusted(-margin, -margin, margin, margin))
+        if old is not None and rect is not None:
+            # Середина, общая для старой и новой рамки, не меняется — её не трогаем
+            region = region.subtracted(QtGui.QRegion(
+                old.adjusted(margin, margin, -margin, -margin).intersected(
+                    rect.adjusted(margin, margin, -margin, -margin))))
+        if not region.isEmpty():
+            self.update(region)
+
+    def _draw_frozen(self, painter, area):
+        """Рисует часть снимка экранов, попадающую в area (локальные координаты)."""
+        if area.isEmpty():
+            return
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        for geometry, pixmap, scale in self._frozen_shots:
+            part = geometry.intersected(area)
+            if part.isEmpty():
+                continue
+            source = QtCore.QRectF((part.x() - geometry.x()) * scale, (part.y() - geometry.y()) * scale,
+                                   part.width() * scale, part.height() * scale)
+            painter.drawPixmap(QtCore.QRectF(part), pixmap, source)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+
     def paintEvent(self, event):
+        cache = self._get_paint_cache()
+        no_dimming = cache["no_dimming"]
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        
-        # Проверка настройки "не затемнять экран"
-        config = get_cached_ocr_config()
-        no_dimming = config.get("no_screen_dimming", False)
-        
-        # Если не требуется затемнение, рисуем минимальный невидимый фон для перехвата мыши
-        if not no_dimming:
-            painter.fillRect(self.rect(), QtGui.QColor(0, 0, 0, 150))
+
+        # Затемнение — только в перерисовываемых прямоугольниках. Source: готовый цвет
+        # записывается без смешивания с прозрачным фоном окна
+        dirty_rects = event.region().rects()
+        frozen = self._frozen_shots
+        if frozen:
+            # Фон — снимок экрана, затемнение поверх него (смешивание только в грязных областях)
+            for dirty in dirty_rects:
+                self._draw_frozen(painter, dirty)
+                if not no_dimming:
+                    painter.fillRect(dirty, cache["dim"])
         else:
-            # Минимальное затемнение (практически невидимое) для перехвата событий мыши
-            # Без этого окно полностью прозрачно и клики проваливаются сквозь него
-            painter.fillRect(self.rect(), QtGui.QColor(0, 0, 0, 5))
-        
-        if self.start_point and self.end_point:
-            rect = QtCore.QRect(self.start_point, self.end_point).normalized()
-            
-            # Очищаем внутреннюю область (если было затемнение)
-            if not no_dimming:
-                painter.setCompositionMode(QtGui.QPainter.CompositionMode_Clear)
-                painter.fillRect(rect, QtGui.QColor(0, 0, 0, 0))
-                painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+            for dirty in dirty_rects:
+                painter.fillRect(dirty, cache["dim"])
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+
+        rect = self._selection_rect()
+        self._painted_selection = rect
+        if rect is not None:
+            if frozen:
+                # Внутри выделения — снимок без затемнения
+                for dirty in dirty_rects:
+                    self._draw_frozen(painter, rect.intersected(dirty))
+                    if no_dimming:
+                        painter.fillRect(rect.intersected(dirty), cache["selection_fill"])
             else:
-                # В режиме без затемнения добавляем легкий полупрозрачный белый фон
-                # чтобы область выделения была видна
-                painter.fillRect(rect, QtGui.QColor(255, 255, 255, 30))
-            
-            # Photoshop-style рамка: голубая с эффектом свечения
-            # Внешнее свечение (glow effect)
-            glow_pen = QtGui.QPen(QtGui.QColor(80, 160, 255, 60), 5)
-            glow_pen.setStyle(QtCore.Qt.SolidLine)
-            painter.setPen(glow_pen)
+                # Очищаем внутреннюю область (если было затемнение)
+                if not no_dimming:
+                    painter.setCompositionMode(QtGui.QPainter.CompositionMode_Clear)
+                for dirty in dirty_rects:
+                    painter.fillRect(rect.intersected(dirty),
+                                     QtCore.Qt.transparent if not no_dimming else cache["selection_fill"])
+                painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+
+            painter.setPen(cache["glow_pen"])
             painter.drawRect(rect.adjusted(-2, -2, 2, 2))
-            
-            # Основная рамка (яркая голубая, как в Photoshop)
-            main_pen = QtGui.QPen(QtGui.QColor(80, 160, 255, 255), 1)
-            main_pen.setStyle(QtCore.Qt.SolidLine)
-            painter.setPen(main_pen)
+            painter.setPen(cache["main_pen"])
             painter.drawRect(rect)
-            
-            # Внутренняя светлая рамка для контраста
-            inner_pen = QtGui.QPen(QtGui.QColor(200, 230, 255, 100), 1)
-            inner_pen.setStyle(QtCore.Qt.SolidLine)
-            painter.setPen(inner_pen)
+            painter.setPen(cache["inner_pen"])
             painter.drawRect(rect.adjusted(1, 1, -1, -1))
-            
+
         painter.end()
+        if self._show_requested_at is not None:
+            # Первый кадр после показа: оверлей виден
+            _record_time_to_visible(self.mode, (time.perf_counter() - self._show_requested_at) * 1000)
+            self._show_requested_at = None
 
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
             self.start_point = event.pos()
             self.end_point = self.start_point
             logging.info(f"Начало выделения: {self.start_point}")
-            self.update()
+            self._update_selection()
         elif event.button() == QtCore.Qt.RightButton:
             # Правая кнопка мыши — полный выход из программы
             logging.info("Правая кнопка мыши — выход из программы")
@@ -781,7 +1134,7 @@ class ScreenCaptureOverlay(QWidget):
     def mouseMoveEvent(self, event):
         if self.start_point:
             self.end_point = event.pos()
-            self.update()
+            self._update_selection()
 
     def mouseReleaseEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton and self.start_point and self.end_point:
@@ -795,16 +1148,10 @@ class ScreenCaptureOverlay(QWidget):
         language_code = self.lang_combo.currentData()
         if language_code:
             self.current_language = language_code
-            config_path = get_data_file("config.json")
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                config["last_ocr_language"] = language_code
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, ensure_ascii=False, indent=4)
+            # Только память; на диск store запишет сам, в фоне и одной записью на серию переключений
+            from config_store import get_config_store
+            if get_config_store().update({"last_ocr_language": language_code}):
                 logging.info(f"Saved OCR language: {language_code}")
-            except Exception as e:
-                logging.warning(f"Failed to save OCR language: {e}")
 
     def keyPressEvent(self, event):
         if event.key() == QtCore.Qt.Key_Escape:
@@ -881,15 +1228,22 @@ class ScreenCaptureOverlay(QWidget):
         
         # Захватываем ТОЧНО выделенную область без padding
         # (padding может захватить соседний текст и испортить распознавание)
-        screenshot = self.screen.grabWindow(0, global_rect.x(), global_rect.y(), 
-                                           global_rect.width(), global_rect.height())
-        
-        # Check if screenshot is valid
-        if screenshot.isNull():
-            logging.error("Failed to grab screenshot (result is null)")
-            return
+        if self._frozen_shots:
+            # Снимок уже в памяти: вырезаем без повторного захвата экрана
+            qimage = crop_screens(self._frozen_shots, rect)
+            if qimage.isNull():
+                logging.error("Selection is outside the frozen screen snapshot")
+                return
+        else:
+            screenshot = self.screen.grabWindow(0, global_rect.x(), global_rect.y(),
+                                               global_rect.width(), global_rect.height())
+
+            # Check if screenshot is valid
+            if screenshot.isNull():
+                logging.error("Failed to grab screenshot (result is null)")
+                return
 
-        qimage = screenshot.toImage()
+            qimage = screenshot.toImage()
         
         # ОТЛАДКА: Сохраняем исходное изображение
         try:
@@ -899,279 +1253,54 @@ class ScreenCaptureOverlay(QWidget):
         except Exception as e:
             logging.warning(f"Failed to save debug original: {e}")
         
-       
-        # ===== PADIMAGE ИЗ TEXT-GRAB (критично для маленьких областей!) =====
-        # Если изображение меньше 64x64, добавляем padding
-        # Padding заполняется цветом фона (первый пиксель) для естественного вида
-        original_width = qimage.width()
-        original_height = qimage.height()
-        min_w, min_h = 64, 64
-        
-        if original_width < min_w or original_height < min_h:
-            # Вычисляем новый размер (минимум 64+16, или исходный+16)
-            new_width = max(original_width + 16, min_w + 16)
-            new_height = max(original_height + 16, min_h + 16)
-            
-            # Создаем новое изображение
-            padded_qimage = QtGui.QImage(new_width, new_height, QtGui.QImage.Format_RGBA8888)
-            
-            # Получаем цвет первого пикселя для заливки
-            bg_color = QtGui.QColor(qimage.pixel(0, 0))
-            padded_qimage.fill(bg_color)
-            
-            # Рисуем исходное изображение в центре со смещением 8px
-            painter = QtGui.QPainter(padded_qimage)
-            painter.drawImage(8, 8, qimage)
-            painter.end()
-            
-            qimage = padded_qimage
-            logging.info(f"PadImage: {original_width}x{original_height} → {qimage.width()}x{qimage.height()} (bg color: {bg_color.name()})")
-        
-        # ===== АГРЕССИВНОЕ МАСШТАБИРОВАНИЕ (упрощенный подход без winrt) =====
-        # Вместо двухпроходного OCR используем очень агрессивное масштабирование
-        # основанное на размере области
-        
-        original_width = qimage.width()
-        original_height = qimage.height()
-        min_dimension = min(original_width, original_height)
-        
-        # Целевая высота текста для идеального OCR - 40-50px
-        # Вычисляем агрессивный масштаб на основе размера
-        TARGET_HEIGHT = 45.0
-        
-        # Предполагаем среднюю высоту текста на основе размера выделения
-        if min_dimension < 25:
-            estimated_text_height = 8  # Очень маелнький текст
-        elif min_dimension < 50:
-            estimated_text_height = 12
-        elif min_dimension < 100:
-            estimated_text_height = 18
-        elif min_dimension < 150:
-            estimated_text_height = 25
-        else:
-            estimated_text_height = 30
-        
-        # Вычисляем масштаб для достижения целевой высоты
-        scale_factor = TARGET_HEIGHT / estimated_text_height
-        
-        # Ограничиваем максимальный масштаб
-        scale_factor = min(scale_factor, 10.0)  # Макс 10x
-        scale_factor = max(scale_factor, 1.0)   # Мин 1x
-        
-        logging.info(f"Aggressive scaling: estimated text height {estimated_text_height}px, scale {scale_factor:.1f}x")
-        
-        # Применяем масштабирование
-        if scale_factor > 1.0:
-            new_width = int(original_width * scale_factor)
-            new_height = int(original_height * scale_factor)
-            qimage = qimage.scaled(new_width, new_height, 
-                                  QtCore.Qt.KeepAspectRatio, 
-                                  QtCore.Qt.SmoothTransformation)
-            logging.info(f"Scaled: {original_width}x{original_height} → {qimage.width()}x{qimage.height()}")
-        
-        # ===== АГРЕССИВНАЯ ПРЕДОБРАБОТКА =====
-        from PIL import Image, ImageEnhance, ImageOps, ImageFilter
-        
-        qimg_rgba = qimage.convertToFormat(QtGui.QImage.Format_RGBA8888)
-        ptr = qimg_rgba.constBits()
-        ptr.setsize(qimg_rgba.byteCount())
-        pil_image = Image.frombuffer("RGBA", (qimg_rgba.width(), qimg_rgba.height()), 
-                                     ptr, "raw", "RGBA", 0, 1)
-        
-        # Конвертация в grayscale
-        pil_image = pil_image.convert('L')
-        
-        # АГРЕССИВНОЕ увеличение контраста для маленького текста
-        enhancer = ImageEnhance.Contrast(pil_image)
-        pil_image = enhancer.enhance(2.5)
-        
-        # АГРЕССИВНОЕ увеличение резкости
-        enhancer = ImageEnhance.Sharpness(pil_image)
-        pil_image = enhancer.enhance(2.0)
-        
-        # Добавляем белые поля (помогает OCR определить границы)
-        border_size = 20
-        pil_image = ImageOps.expand(pil_image, border=border_size, fill='white')
-        
-        # Адаптивная бинаризация для идеальной четкости
-        if min_dimension < 100:
-            # Для маленького текста применяем бинаризацию
-            threshold = 128
-            pil_image = pil_image.point(lambda x: 0 if x < threshold else 255, '1')
-            pil_image = pil_image.convert('L')
-        
-        # Конвертируем обратно в QImage
-        img_bytes = pil_image.tobytes()
-        qimage = QtGui.QImage(img_bytes, pil_image.width, pil_image.height, 
-                             pil_image.width, QtGui.QImage.Format_Grayscale8)
-        
-        # ОТЛАДКА: Сохраняем финальное изображение для проверки
-        try:
-            debug_path = os.path.join(get_app_dir(), "debug_ocr_final.png")
-            qimage.save(debug_path)
-            logging.info(f"DEBUG: Saved final image to {debug_path}")
-        except Exception as e:
-            logging.warning(f"Failed to save debug image: {e}")
-        
-        logging.info(f"Final preprocessed size: {qimage.width()}x{qimage.height()}")
-        
         language_code = self.lang_combo.currentData() or "ru"
         self.current_language = language_code
         
-        # Сохраняем выбранный язык в конфигурации
-        config = get_cached_ocr_config()
-        if config.get("last_ocr_language") != language_code:
-            config_path = get_data_file("config.json")
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    full_config = json.load(f)
-                full_config["last_ocr_language"] = language_code
-                with open(config_path, 'w', encoding='utf-8') as f:
-                    json.dump(full_config, f, ensure_ascii=False, indent=4)
-            except Exception:
-                pass
+        # Сохраняем выбранный язык в конфигурации (без записи на диск в GUI потоке)
+        from config_store import get_config_store
+        get_config_store().set("last_ocr_language", language_code)
 
         # Determine which OCR engine to use
         ocr_engine_type = self.get_ocr_engine().lower()
         logging.info(f"🔍 Using OCR engine: {ocr_engine_type.upper()}")
-
-        if ocr_engine_type == "tesseract":
-            # Determine path to tesseract
-            # Lazy import pytesseract and requests
-            import pytesseract
-            import requests
-            # For tesseract we need PIL image
-            from PIL import Image
-            qimg_rgba = qimage.convertToFormat(QtGui.QImage.Format_RGBA8888)
-            ptr = qimg_rgba.constBits(); ptr.setsize(qimg_rgba.byteCount())
-            pil_image = Image.frombuffer("RGBA", (qimg_rgba.width(), qimg_rgba.height()), ptr, "raw", "RGBA", 0, 1)
-            
-            tess_cmd = self.get_tesseract_cmd()
-            
-            if tess_cmd:
-                pytesseract.pytesseract.tesseract_cmd = tess_cmd
-                logging.info(f"Using Tesseract at: {tess_cmd}")
-
-                # Устанавливаем TESSDATA_PREFIX для корректного поиска моделей
-                tess_dir = os.path.dirname(tess_cmd)
-                candidate_dirs = [
-                    os.path.join(tess_dir, "tessdata"),  # стандартное расположение в portable-сборке
-                    os.path.join(os.path.dirname(tess_dir), "tessdata"),  # если exe лежит в bin/
-                ]
-                for td in candidate_dirs:
-                    if os.path.isdir(td):
-                        os.environ["TESSDATA_PREFIX"] = td
-                        break
-                else:
-                    # на всякий случай убираем переменную, чтобы Tesseract искал в своих стандартных местах
-                    os.environ.pop("TESSDATA_PREFIX", None)
-
-                # --- Проверяем наличие языковой модели и при необходимости скачиваем ---
-                def ensure_lang_model(lang_code, dest_dir):
-                    fname = f"{lang_code}.traineddata"
-                    target_path = os.path.join(dest_dir, fname)
-                    if os.path.exists(target_path):
-                        return
-                    try:
-                        url = f"https://github.com/tesseract-ocr/tessdata/raw/main/{fname}"
-                        logging.info(f"Downloading {fname} …")
-                        r = requests.get(url, timeout=30, stream=True)
-                        r.raise_for_status()
-                        with open(target_path + '.tmp', 'wb') as f:
-                            shutil.copyfileobj(r.raw, f)
-                        os.replace(target_path + '.tmp', target_path)
-                        logging.info(f"{fname} downloaded into {dest_dir}")
-                    except Exception as dl_err:
-                        logging.warning(f"Could not download language model {lang_code}: {dl_err}")
-
-                tessdata_dir = os.environ.get("TESSDATA_PREFIX")
-                if tessdata_dir and os.path.isdir(tessdata_dir):
-                    required = ["eng", "rus"]
-                    for lc in required:
-                        ensure_lang_model(lc, tessdata_dir)
+        if ocr_engine_type != "tesseract":
+            if language_code == "universal":
+                logging.info("🔄 Running Windows OCR in UNIVERSAL mode (auto-detect language)")
             else:
-                logging.error("Tesseract executable not found.")
-                return "Текст не распознан"
-            # Map language codes for Tesseract
-            tess_lang = "eng" if language_code == "en" else "rus"
-            try:
-                logging.info(f"🔄 Running Tesseract OCR for language '{tess_lang}'...")
-                # Оптимизация скорости: --oem 3 (LSTM only), --psm 6 (single block)
-                tess_config = '--oem 3 --psm 6'
-                recognized_text = pytesseract.image_to_string(pil_image, lang=tess_lang, config=tess_config)
-                if recognized_text.strip():
-                    logging.info(f"✅ Tesseract recognized {len(recognized_text)} chars successfully")
-                else:
-                    logging.warning("⚠️ Tesseract returned empty result")
-            except Exception as e:
-                logging.error(f"❌ Tesseract error: {e}")
-                recognized_text = ""
-            # Обработать результат напрямую
-            self.handle_ocr_result(recognized_text)
-            return  # Не использовать Windows OCR ниже
-
-        # По умолчанию используем Windows OCR (без PIL)
-        # Используем универсальный OCR если выбрано "universal" (AUTO)
-        use_universal = (language_code == "universal")
-        if use_universal:
-            logging.info("🔄 Running Windows OCR in UNIVERSAL mode (auto-detect language)")
-        else:
-            logging.info(f"🔄 Running Windows OCR for language: {language_code.upper()}")
-        
-        bitmap = qimage_to_softwarebitmap(qimage)
-        
-        # Create worker with Tesseract fallback capability
-        self.ocr_worker = OCRWorker(bitmap, language_code, use_universal=use_universal)
-        
-        # Pass the QImage for Tesseract fallback if needed
-        self.ocr_worker.qimage = qimage
-        
-        self.ocr_worker.result_ready.connect(self.handle_ocr_result)
-        self.ocr_worker.start()
+                logging.info(f"🔄 Running Windows OCR for language: {language_code.upper()}")
 
-    def handle_ocr_result(self, text):
-        if not text and hasattr(self, 'ocr_worker') and hasattr(self.ocr_worker, 'qimage'):
-            # If Windows OCR failed, try Tesseract as fallback
-            logging.info("Windows OCR returned empty result, attempting Tesseract fallback...")
+        def ocr_job(token):
+            # Предобработка и OCR — в пуле OCRJobManager; между этапами проверяется отмена
+            image = preprocess_for_ocr(qimage)
+
+            # ОТЛАДКА: Сохраняем финальное изображение для проверки
             try:
-                import pytesseract
-                from PIL import Image
-                
-                qimage = self.ocr_worker.qimage
-                qimg_rgba = qimage.convertToFormat(QtGui.QImage.Format_RGBA8888)
-                ptr = qimg_rgba.constBits()
-                ptr.setsize(qimg_rgba.byteCount())
-                pil_image = Image.frombuffer("RGBA", (qimg_rgba.width(), qimg_rgba.height()), ptr, "raw", "RGBA", 0, 1)
-                
-                # Determine Tesseract language
-                lang_code = self.lang_combo.currentData() or "ru"
-                tess_lang = "eng" if lang_code == "en" else "rus"
-                
-                # Configure Tesseract path
-                tess_cmd = self.get_tesseract_cmd()
-                if tess_cmd:
-                    pytesseract.pytesseract.tesseract_cmd = tess_cmd
-                    
-                    # Setup TESSDATA_PREFIX
-                    tess_dir = os.path.dirname(tess_cmd)
-                    candidate_dirs = [
-                        os.path.join(tess_dir, "tessdata"),
-                        os.path.join(os.path.dirname(tess_dir), "tessdata"),
-                    ]
-                    for td in candidate_dirs:
-                        if os.path.isdir(td):
-                            os.environ["TESSDATA_PREFIX"] = td
-                            break
-                    
-                    # Simplified fallback attempt with speed optimizations
-                    tess_config = '--oem 3 --psm 6'
-                    text = pytesseract.image_to_string(pil_image, lang=tess_lang, config=tess_config)
-                    logging.info(f"Tesseract fallback result length: {len(text)}")
-                else:
-                    logging.warning("Tesseract not found for fallback.")
+                debug_path = os.path.join(get_app_dir(), "debug_ocr_final.png")
+                image.save(debug_path)
+                logging.info(f"DEBUG: Saved final image to {debug_path}")
             except Exception as e:
-                logging.error(f"Tesseract fallback failed: {e}")
+                logging.warning(f"Failed to save debug image: {e}")
+
+            logging.info(f"Final preprocessed size: {image.width()}x{image.height()}")
+            token.check()
+            # Windows OCR с фоллбеком на Tesseract (или только Tesseract)
+            text, engine = recognize_image(image, language_code, ocr_engine_type, token)
+            if text.strip():
+                logging.info(f"✅ {engine.capitalize()} recognized {len(text)} chars successfully")
+            else:
+                logging.warning(f"⚠️ {engine.capitalize()} returned empty result")
+            return text
 
+        # Новый захват в этом режиме отменяет незавершённый предыдущий
+        get_ocr_job_manager().submit(self.mode, ocr_job, self._on_ocr_job_done)
+
+    def _on_ocr_job_done(self, text, error):
+        if error is not None:
+            logging.error(f"❌ OCR error: {error}")
+            text = ""
+        self.handle_ocr_result(text)
+
+    def handle_ocr_result(self, text):
         if text:
             if self.mode == "translate":
                 from translater import translate_text
@@ -1288,7 +1417,7 @@ class ScreenCaptureOverlay(QWidget):
             lang = config.get("interface_language", "en")
             
             msg = QMessageBox(self)
-            msg.setWindowIcon(QtGui.QIcon(resource_path("icons/icon.ico")))
+            msg.setWindowIcon(get_icon("icons/icon.ico"))
             msg.setIcon(QMessageBox.NoIcon)
             
             if lang == "ru":
@@ -1311,96 +1440,74 @@ class ScreenCaptureOverlay(QWidget):
                 )
             
             msg.setStandardButtons(QMessageBox.Ok)
-            
-            if theme == "Темная":
-                msg.setStyleSheet("""
-                    QMessageBox { 
-                        background-color: #1a1a2e; 
-                    }
-                    QMessageBox QLabel { 
-                        color: #ffffff; 
-                        font-size: 14px; 
-                    }
-                    QPushButton { 
-                        background-color: #7A5FA1; 
-                        color: #ffffff; 
-                        border: none; 
-                        border-radius: 6px;
-                        padding: 8px 24px; 
-                        min-width: 80px;
-                        font-size: 14px;
-                    }
-                    QPushButton:hover { 
-                        background-color: #8B70B2; 
-                    }
-                """)
-            else:
-                msg.setStyleSheet("""
-                    QMessageBox { 
-                        background-color: #ffffff; 
-                    }
-                    QMessageBox QLabel { 
-                        color: #333333; 
-                        font-size: 14px; 
-                    }
-                    QPushButton { 
-                        background-color: #7A5FA1; 
-                        color: #ffffff; 
-                        border: none; 
-                        border-radius: 6px;
-                        padding: 8px 24px; 
-                        min-width: 80px;
-                        font-size: 14px;
-                    }
-                    QPushButton:hover { 
-                        background-color: #8B70B2; 
-                    }
-                """)
+            msg.setStyleSheet(message_box_stylesheet(theme))
             
             msg.exec_()
             self.close()
 
 def prepare_overlay(mode="ocr"):
     try:
-        if mode not in _OVERLAY_POOL or _OVERLAY_POOL[mode] is None:
+        if _OVERLAY_POOL.get(mode) is None:
             _OVERLAY_POOL[mode] = ScreenCaptureOverlay(mode, defer_show=True)
+            _OVERLAY_METRICS["created"] += 1
     except Exception:
         _OVERLAY_POOL[mode] = None
 
 _ACTIVE_OVERLAYS = {}
 
-def get_or_show_overlay(mode="ocr"):
+# Время от хоткея до первого кадра оверлея, мс (последние OVERLAY_METRIC_SAMPLES показов)
+OVERLAY_METRIC_SAMPLES = 50
+_OVERLAY_METRICS = {"created": 0, "reused": 0, "time_to_visible_ms": {}}
+
+def _record_time_to_visible(mode, elapsed_ms):
+    samples = _OVERLAY_METRICS["time_to_visible_ms"].setdefault(mode, [])
+    samples.append(elapsed_ms)
+    del samples[:-OVERLAY_METRIC_SAMPLES]
+    logging.info(f"Overlay '{mode}' visible in {elapsed_ms:.1f} ms after hotkey")
+
+def get_overlay_metrics():
+    """Сводка пула оверлеев: сколько окон создано/переиспользовано, time-to-visible по режимам."""
+    result = {"created": _OVERLAY_METRICS["created"], "reused": _OVERLAY_METRICS["reused"], "time_to_visible_ms": {}}
+    for mode, samples in _OVERLAY_METRICS["time_to_visible_ms"].items():
+        ordered = sorted(samples)
+        result["time_to_visible_ms"][mode] = {"last": samples[-1], "p50": ordered[len(ordered) // 2],
+                                              "max": ordered[-1], "count": len(ordered)}
+    return result
+
+def get_or_show_overlay(mode="ocr", requested_at=None):
+    """requested_at — time.perf_counter() нажатия хоткея (для метрики time-to-visible)."""
     # Если оверлей уже активен для этого режима - закрываем его (toggle behavior)
-    if _ACTIVE_OVERLAYS.get(mode):
+    existing = _ACTIVE_OVERLAYS.get(mode)
+    if existing is not None:
         try:
-            existing = _ACTIVE_OVERLAYS[mode]
-            if existing and existing.isVisible():
+            if existing.isVisible():
                 existing.close()
                 _ACTIVE_OVERLAYS[mode] = None
                 return  # Закрыли, больше ничего не делаем
         except Exception:
             pass
-    
-    # Создаем или показываем оверлей
+
+    # Окно режима живёт в пуле постоянно: после закрытия оно только скрыто и сброшено
     ov = _OVERLAY_POOL.get(mode)
     if ov is None:
-        ov = ScreenCaptureOverlay(mode, defer_show=False)
+        prepare_overlay(mode)
+        ov = _OVERLAY_POOL.get(mode) or ScreenCaptureOverlay(mode, defer_show=True)
     else:
-        ov.show_overlay()
-    
+        _OVERLAY_METRICS["reused"] += 1
+    ov.show_overlay(requested_at)
+
     # Keep reference to prevent garbage collection
     _ACTIVE_OVERLAYS[mode] = ov
-    _OVERLAY_POOL[mode] = None
 
-def run_screen_capture(mode="ocr"):
+def run_screen_capture(mode="ocr", requested_at=None):
     app = QApplication.instance()
     if app is None:
         app = QApplication([])
         logging.info("Запуск OCR приложения...")
-        get_or_show_overlay(mode)
+        get_or_show_overlay(mode, requested_at)
         app.exec_()
     else:
-        get_or_show_overlay(mode)
+        get_or_show_overlay(mode, requested_at)
 
 def warm_up():
     # Pre-initialize OCR engines for common languages to reduce first-use latency
@@ -1412,6 +1519,10 @@ def warm_up():
 
 if __name__ == "__main__":
     import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        # Пакетный режим без GUI: python ocr.py batch <каталог|маска> --output results.jsonl
+        import batch
+        sys.exit(batch.main(sys.argv[2:]))
     if len(sys.argv) > 1 and sys.argv[1] == "translate":
         run_screen_capture("translate")
     else:
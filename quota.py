@@ -0,0 +1,291 @@
+"""Лимиты бесплатных онлайн-движков: token bucket + дневной бюджет символов.
+
+MyMemory без регистрации даёт ~5000 символов в день, публичные инстансы
+Lingva/LibreTranslate быстро отвечают 429. Раньше translate_text узнавал об
+этом только по ошибке и тратил время на фоллбеки. Теперь:
+
+* на каждый движок — token bucket запросов/сек (короткое ожидание токена
+  допустимо, длинное — повод выбрать другой движок);
+* дневной счётчик символов, сохраняется в data/quota_usage.json и
+  сбрасывается при смене даты;
+* 429 / сообщение об исчерпанной квоте блокирует движок на Retry-After
+  (или до конца дня для дневной квоты); у Lingva/LibreTranslate блокируется
+  только ответивший инстанс (host=...), остальные продолжают работать;
+* translate_text заранее обходит движки, которым не хватает бюджета.
+
+Лимиты переопределяются в config.json:
+    "engine_limits": {"mymemory": {"daily_chars": 50000, "rate": 2, "burst": 5}}
+
+Текущее состояние: get_quota_manager().status() (или translater.get_quota_status()).
+"""
+import datetime
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Лимиты по умолчанию: rate — запросов/сек, burst — ёмкость корзины,
+# daily_chars — символов в сутки (None — без дневного лимита)
+DEFAULT_ENGINE_LIMITS = {
+    "google": {"rate": 5.0, "burst": 10, "daily_chars": None},
+    "mymemory": {"rate": 2.0, "burst": 5, "daily_chars": 5000},
+    "lingva": {"rate": 1.0, "burst": 3, "daily_chars": None},
+    "libretranslate": {"rate": 0.3, "burst": 2, "daily_chars": None},
+}
+# Сколько максимум ждать токен, прежде чем считать движок занятым
+MAX_TOKEN_WAIT_SEC = 1.0
+# Блокировка после 429 без Retry-After
+DEFAULT_THROTTLE_SEC = 30.0
+# Задержка записи счётчиков на диск (серии переводов пишутся одним разом)
+SAVE_DELAY_SEC = 2.0
+
+
+class QuotaExceededError(Exception):
+    """Движок исчерпал лимит; запрос не отправлялся."""
+
+
+def _get_data_file(filename):
+    if hasattr(sys, '_MEIPASS'):
+        app_dir = sys._MEIPASS
+    else:
+        app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+    data_dir = os.path.join(app_dir, "data")
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    return os.path.join(data_dir, filename)
+
+
+class TokenBucket:
+    """Корзина токенов с резервированием: токены могут уйти в минус,
+    тогда reserve() возвращает, сколько нужно подождать."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now=None):
+        """Через сколько секунд будет доступен следующий токен."""
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1 or self.rate <= 0:
+            return 0.0 if self.tokens >= 1 else float("inf")
+        return (1 - self.tokens) / self.rate
+
+    def reserve(self, now=None):
+        wait = self.wait_time(now)
+        self.tokens -= 1
+        return wait
+
+
+class QuotaManager:
+    """Состояние лимитов по всем онлайн-движкам (потокобезопасно)."""
+
+    def __init__(self, limits=None, path=None):
+        self.path = path or _get_data_file("quota_usage.json")
+        self._lock = threading.Lock()
+        self._save_timer = None
+        self.limits = {}
+        self._buckets = {}
+        self._blocked_until = {}  # engine или base url инстанса -> time.time()
+        self._day = datetime.date.today().isoformat()
+        self._chars = {}
+        self._requests = {}
+        self._load()
+        self.configure(limits)
+
+    # --- конфигурация и хранение ---
+    def configure(self, overrides=None):
+        """Применяет лимиты по умолчанию + переопределения из config.json."""
+        with self._lock:
+            for engine, defaults in DEFAULT_ENGINE_LIMITS.items():
+                limits = dict(defaults)
+                limits.update((overrides or {}).get(engine, {}))
+                if self.limits.get(engine) != limits:
+                    self.limits[engine] = limits
+                    self._buckets[engine] = TokenBucket(limits["rate"], limits["burst"])
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("date") != self._day:
+            return  # вчерашние счётчики не нужны
+        self._chars = {k: int(v) for k, v in data.get("chars", {}).items()}
+        self._requests = {k: int(v) for k, v in data.get("requests", {}).items()}
+        now = time.time()
+        self._blocked_until = {k: float(v) for k, v in data.get("blocked_until", {}).items() if float(v) > now}
+
+    def _schedule_save(self):
+        # Вызывается под self._lock
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY_SEC, self._save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save(self):
+        with self._lock:
+            self._save_timer = None
+            snapshot = {
+                "date": self._day,
+                "chars": dict(self._chars),
+                "requests": dict(self._requests),
+                "blocked_until": dict(self._blocked_until),
+            }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"Failed to save quota usage: {e}")
+
+    def flush(self):
+        """Записывает счётчики сразу (при выходе), не дожидаясь таймера."""
+        with self._lock:
+            timer = self._save_timer
+        if timer is not None:
+            timer.cancel()
+            self._save()
+
+    def _roll_day(self):
+        # Вызывается под self._lock
+        today = datetime.date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            self._chars.clear()
+            self._requests.clear()
+            self._blocked_until.clear()
+
+    # --- проверка и учёт ---
+    def _check(self, engine, chars, now):
+        """Причина, по которой движок сейчас не подходит, или None. Под self._lock."""
+        self._roll_day()
+        limits = self.limits.get(engine)
+        if limits is None:
+            return None
+        blocked = self._blocked_until.get(engine, 0) - time.time()
+        if blocked > 0:
+            return f"{engine} throttled for {blocked:.0f} s"
+        daily = limits.get("daily_chars")
+        if daily is not None and self._chars.get(engine, 0) + chars > daily:
+            return f"{engine} daily budget exhausted ({self._chars.get(engine, 0)}/{daily} chars)"
+        if self._buckets[engine].wait_time(now) > MAX_TOKEN_WAIT_SEC:
+            return f"{engine} rate limit"
+        return None
+
+    def is_available(self, engine, chars=0):
+        with self._lock:
+            return self._check(engine, chars, time.monotonic()) is None
+
+    def reserve(self, engine, chars):
+        """Резервирует запрос и символы. Возвращает, сколько подождать перед отправкой.
+
+        QuotaExceededError — если движок заблокирован, бюджета не хватает или
+        токена ждать дольше MAX_TOKEN_WAIT_SEC.
+        """
+        with self._lock:
+            now = time.monotonic()
+            reason = self._check(engine, chars, now)
+            if reason is not None:
+                raise QuotaExceededError(reason)
+            if engine not in self.limits:
+                return 0.0
+            wait = self._buckets[engine].reserve(now)
+            self._chars[engine] = self._chars.get(engine, 0) + chars
+            self._requests[engine] = self._requests.get(engine, 0) + 1
+            self._schedule_save()
+            return wait
+
+    def refund(self, engine, chars):
+        """Возвращает символы, если движок не вернул перевод."""
+        with self._lock:
+            if engine in self._chars:
+                self._chars[engine] = max(0, self._chars[engine] - chars)
+                self._schedule_save()
+
+    def record_throttled(self, engine, retry_after=None, host=None):
+        """Сервер ответил 429: не обращаемся к движку (или только к его инстансу host)
+        Retry-After секунд."""
+        try:
+            delay = float(retry_after) if retry_after is not None else DEFAULT_THROTTLE_SEC
+        except (TypeError, ValueError):
+            delay = DEFAULT_THROTTLE_SEC
+        with self._lock:
+            self._blocked_until[host or engine] = time.time() + delay
+            self._schedule_save()
+        logging.warning(f"⏳ {host or engine} throttled, pausing for {delay:.0f} s")
+
+    def blocked_for(self, key):
+        """Сколько секунд ещё заблокирован движок или инстанс (0 — доступен)."""
+        with self._lock:
+            self._roll_day()
+            return max(0.0, self._blocked_until.get(key, 0) - time.time())
+
+    def record_exhausted(self, engine):
+        """Сервер сообщил об исчерпании дневной квоты: блок до конца суток."""
+        tomorrow = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=1), datetime.time())
+        self.record_throttled(engine, tomorrow.timestamp() - time.time())
+
+    def rank(self, engines, chars):
+        """Доступные движки в порядке предпочтения: первый — как задан, остальные
+        по запасу дневного бюджета (движки без лимита — первыми)."""
+        with self._lock:
+            now = time.monotonic()
+            available = [e for e in engines if self._check(e, chars, now) is None]
+            headroom = {}
+            for engine in available:
+                daily = self.limits.get(engine, {}).get("daily_chars")
+                headroom[engine] = 1.0 if daily is None else 1.0 - self._chars.get(engine, 0) / daily
+        if available and available[0] == engines[0]:
+            return available[:1] + sorted(available[1:], key=headroom.get, reverse=True)
+        return sorted(available, key=headroom.get, reverse=True)
+
+    def status(self):
+        """Остаток лимитов: {engine: {...}} для отображения и отладки."""
+        with self._lock:
+            self._roll_day()
+            now = time.monotonic()
+            result = {}
+            for engine, limits in self.limits.items():
+                daily = limits.get("daily_chars")
+                used = self._chars.get(engine, 0)
+                bucket = self._buckets[engine]
+                bucket._refill(now)
+                result[engine] = {
+                    "date": self._day,
+                    "requests_today": self._requests.get(engine, 0),
+                    "chars_today": used,
+                    "daily_chars": daily,
+                    "daily_chars_left": None if daily is None else max(0, daily - used),
+                    "tokens": round(max(bucket.tokens, 0.0), 2),
+                    "rate_per_sec": limits["rate"],
+                    "throttled_for_sec": round(max(0.0, self._blocked_until.get(engine, 0) - time.time()), 1),
+                    "available": self._check(engine, 0, now) is None,
+                }
+            return result
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_quota_manager(limits=None):
+    """Общий менеджер квот; limits — переопределения из config.json."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = QuotaManager(limits)
+                return _manager
+    if limits is not None:
+        _manager.configure(limits)
+    return _manager
@@ -13,14 +13,6 @@ from PyQt5.QtCore import Qt, QMetaObject, pyqtSlot
 from PyQt5.QtGui import QKeySequence, QIcon
 from PyQt5 import QtCore
 
-# Импортируем функцию инвалидации кэша (ленивый импорт для избежания циклического импорта)
-def _invalidate_main_config_cache():
-    try:
-        from main import invalidate_config_cache
-        invalidate_config_cache()
-    except ImportError:
-        pass
-
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
@@ -118,7 +110,6 @@ class SettingsWindow(QWidget):
     def switch_startup(self, state):
         self.parent.config["autostart"] = self.autostart_checkbox.isChecked()
         self.parent.save_config()
-        _invalidate_main_config_cache()  # Сбрасываем кэш после сохранения
         self.parent.set_autostart(self.autostart_checkbox.isChecked())
         self.parent.autostart = self.autostart_checkbox.isChecked()
 
@@ -129,7 +120,6 @@ class SettingsWindow(QWidget):
         if key == "autostart":
             self.parent.autostart = value
         self.parent.save_config()
-        _invalidate_main_config_cache()  # Сбрасываем кэш после сохранения
 
     def on_history_checkbox_toggled(self, state):
         self.auto_save_setting("history", state)
@@ -724,6 +714,8 @@ class SettingsWindow(QWidget):
         try:
             with open(history_file, "w", encoding="utf-8") as f:
                 json.dump([], f, ensure_ascii=False, indent=4)
+            import translater
+            translater.forget_learned_translations()
             self.load_history_embedded()
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", "Не удалось очистить историю переводов.")
@@ -957,6 +949,13 @@ class SettingsWindow(QWidget):
         else:
             value = "argos"
         self.auto_save_setting("translator_engine", value)
+        if value != "argos":
+            # Заранее открываем соединение с новым движком
+            try:
+                import translater
+                threading.Thread(target=translater.warm_up_http, args=(value,), daemon=True).start()
+            except Exception:
+                pass
 
     def _on_display_mode_changed(self, idx):
         mode = self.display_mode_combo.itemData(idx)
@@ -1367,41 +1366,31 @@ The program will continue using Windows OCR for now.""" if self.parent.current_i
             from ocr import _OCR_ENGINE_CACHE, _OVERLAY_POOL
             total_cleared += len(_OCR_ENGINE_CACHE) * 50000  # ~50KB на движок
             _OCR_ENGINE_CACHE.clear()
-            for k in _OVERLAY_POOL:
-                if _OVERLAY_POOL[k] is not None:
-                    total_cleared += 10000
+            for k, overlay in list(_OVERLAY_POOL.items()):
+                if overlay is None or overlay.isVisible():
+                    continue  # открытый сейчас оверлей не трогаем
+                total_cleared += 10000
                 _OVERLAY_POOL[k] = None
+                overlay.deleteLater()
         except Exception:
             pass
-        
-        # 3. Очистка кэша OCR конфигурации
+
+        # Закрытые оверлеи перевода, ждущие переиспользования
         try:
-            import ocr
-            if ocr._ocr_config_cache is not None:
-                total_cleared += 2048
-            ocr._ocr_config_cache = None
-            ocr._ocr_config_mtime = 0
+            from main import get_translation_overlay_pool
+            total_cleared += get_translation_overlay_pool().release_idle() * 10000
         except Exception:
             pass
         
-        # 4. Очистка кэша переводчика
+        # 3-4. Очистка кэша переводчика (конфиг OCR и переводчика — общий store, перечитан в п.1)
         try:
             import translater
-            if translater._translator_config_cache is not None:
-                total_cleared += 2048
-            translater._translator_config_cache = None
-            translater._translator_config_mtime = 0
-            translater._argos_languages_cache = None
-            cache_size = len(translater._argos_translations_cache)
+            cache_size = len(translater._argos_translations_cache) + len(translater._offline_engines)
             total_cleared += cache_size * 5000  # ~5KB на перевод
-            translater._argos_translations_cache.clear()
-            # Очистка HTTP сессии
+            translater._invalidate_argos_cache(unload_models=True)
+            # Очистка HTTP сессии (соединение с движком сразу устанавливается заново в фоне)
             if translater._http_session is not None:
-                try:
-                    translater._http_session.close()
-                except Exception:
-                    pass
-                translater._http_session = None
+                translater.reset_http_session(reconnect=True)
                 total_cleared += 10000
         except Exception:
             pass
@@ -1522,21 +1511,12 @@ The program will continue using Windows OCR for now.""" if self.parent.current_i
             "last_ocr_language": "ru",
             "no_screen_dimming": False
         }
-        # Save to disk
-        config_path = get_data_file("config.json")
-        try:
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(default_config, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            w = QMessageBox(self)
-            w.setWindowTitle(title)
-            w.setText(str(e))
-            w.setIcon(QMessageBox.Warning)
-            w.setWindowIcon(QIcon(resource_path("icons/icon.ico")))
-            w.exec_()
-            return
+        # Заменяем конфиг целиком (на диск store запишет атомарно, в фоне)
+        from config_store import get_config_store
+        get_config_store().replace(default_config)
         # Update parent state
-        self.parent.config = default_config
+        self.parent.config = dict(default_config)
+        self.parent._config_baseline = dict(default_config)
         self.parent.current_theme = default_config["theme"]
         self.parent.current_interface_language = default_config["interface_language"]
         self.parent.autostart = default_config["autostart"]
@@ -1546,7 +1526,6 @@ The program will continue using Windows OCR for now.""" if self.parent.current_i
         self.parent.set_autostart(False)
         # Сохраняем конфиг
         self.parent.save_config()
-        _invalidate_main_config_cache()  # Сбрасываем кэш после сохранения
 
         # Перестроить интерфейс под новую тему и сброшенные настройки до показа диалогов
         self.init_ui()
@@ -1576,6 +1555,8 @@ The program will continue using Windows OCR for now.""" if self.parent.current_i
                         json.dump([], f)
                 except Exception:
                     pass
+            import translater
+            translater.forget_learned_translations()
 
         done_text = "Настройки сброшены" if lang == 'ru' else "Settings were reset"
         info = QMessageBox(self)
@@ -1,15 +1,34 @@
-import requests
-import json
 import os
 import sys
+import asyncio
+import concurrent.futures
+import importlib.util
+import re
+import threading
+import time
+import urllib.parse
 
 # Optional Argos Translate (offline). If missing, we will use Google online.
-HAS_ARGOS = True
-try:
-    import argostranslate.package as arg_pkg
-    import argostranslate.translate as arg_tr
-except Exception:
-    HAS_ARGOS = False
+# Наличие пакета проверяем без импорта: argostranslate тянет ctranslate2,
+# sentencepiece и stanza, поэтому сам импорт откладываем до первого перевода.
+HAS_ARGOS = importlib.util.find_spec("argostranslate") is not None
+arg_pkg = None
+arg_tr = None
+
+def _load_argos():
+    """Лениво импортирует Argos Translate. Возвращает True, если он доступен."""
+    global HAS_ARGOS, arg_pkg, arg_tr
+    if arg_tr is not None:
+        return True
+    if not HAS_ARGOS:
+        return False
+    try:
+        import argostranslate.package as _arg_pkg
+        import argostranslate.translate as _arg_tr
+        arg_pkg, arg_tr = _arg_pkg, _arg_tr
+    except Exception:
+        HAS_ARGOS = False
+    return HAS_ARGOS
 
 def get_app_dir():
     if hasattr(sys, '_MEIPASS'):
@@ -22,24 +41,11 @@ def get_data_file(filename):
         os.makedirs(data_dir)
     return os.path.join(data_dir, filename)
 
-# --- Кэширование конфигурации ---
-_translator_config_cache = None
-_translator_config_mtime = 0
-
+# --- Конфигурация: общий in-memory store (config_store.py) ---
 def get_cached_translator_config():
-    """Возвращает закэшированную конфигурацию переводчика."""
-    global _translator_config_cache, _translator_config_mtime
-    config_path = get_data_file("config.json")
-    try:
-        mtime = os.path.getmtime(config_path)
-        if _translator_config_cache is None or mtime > _translator_config_mtime:
-            with open(config_path, "r", encoding="utf-8") as f:
-                _translator_config_cache = json.load(f)
-            _translator_config_mtime = mtime
-    except Exception:
-        if _translator_config_cache is None:
-            _translator_config_cache = {}
-    return _translator_config_cache
+    """Текущая конфигурация из памяти (без обращения к диску)."""
+    from config_store import get_config_store
+    return get_config_store().snapshot()
 
 # --- Кэширование языков и объектов перевода Argos ---
 _argos_languages_cache = None
@@ -48,15 +54,23 @@ _argos_translations_cache = {}
 def _get_argos_languages():
     """Возвращает закэшированные языки Argos."""
     global _argos_languages_cache
-    if _argos_languages_cache is None and HAS_ARGOS:
+    if _argos_languages_cache is None and _load_argos():
         _argos_languages_cache = {lang.code: lang for lang in arg_tr.get_installed_languages()}
     return _argos_languages_cache or {}
 
-def _invalidate_argos_cache():
-    """Сбрасывает кэш языков Argos после установки новых моделей."""
-    global _argos_languages_cache, _argos_translations_cache
+def _invalidate_argos_cache(unload_models=False):
+    """Сбрасывает кэш языков Argos после установки новых моделей.
+
+    Уже загруженные модели офлайн-движка остаются в памяти (установка новых
+    пакетов их не меняет); выгружаются они только при unload_models=True.
+    """
+    global _argos_languages_cache, _argos_translations_cache, _models_ready
     _argos_languages_cache = None
     _argos_translations_cache = {}
+    _models_ready = False
+    if unload_models:
+        get_offline_model_manager().unload_all()
+        _offline_engines.clear()
 
 def _get_translation_object(source_code, target_code):
     """Возвращает закэшированный объект перевода."""
@@ -71,6 +85,300 @@ def _get_translation_object(source_code, target_code):
             _argos_translations_cache[key] = None
     return _argos_translations_cache[key]
 
+# --- Офлайн движок: пакетный перевод напрямую через ctranslate2 ---
+# Argos переводит каждый абзац отдельным вызовом с настройками по умолчанию.
+# Движок ниже грузит ту же модель из установленного пакета Argos один раз,
+# переводит все сегменты одним translate_batch и даёт настроить потоки,
+# beam и квантование (int8 на CPU).
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+')
+_offline_engines = {}
+_offline_engines_lock = threading.Lock()
+
+def get_offline_engine_settings():
+    """Настройки ctranslate2 из config.json (с дефолтами)."""
+    config = get_cached_translator_config()
+    return {
+        "inter_threads": int(config.get("argos_inter_threads", 1)),
+        "intra_threads": int(config.get("argos_intra_threads", 0)),  # 0 — по числу ядер
+        "beam_size": int(config.get("argos_beam_size", 2)),
+        "compute_type": config.get("argos_compute_type", "int8"),
+        "max_batch_size": int(config.get("argos_max_batch_size", 32)),
+    }
+
+class OfflineTranslationEngine:
+    """Пакетный офлайн-перевод для одной пары языков на модели Argos."""
+
+    def __init__(self, source_code, target_code, inter_threads=1, intra_threads=0,
+                 beam_size=2, compute_type="int8", max_batch_size=32, device="cpu"):
+        self.source_code = source_code
+        self.target_code = target_code
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+        self.beam_size = beam_size
+        self.compute_type = compute_type
+        self.max_batch_size = max(1, max_batch_size)
+        self.device = device
+        self.target_prefix = ""
+        self._translator = None
+        self._sp = None
+        self._lock = threading.Lock()
+        self._in_use = 0  # сколько translate_segments сейчас работают с моделью (под _lock)
+        # Учёт для OfflineModelManager
+        self.load_sec = None
+        self.rss_delta_bytes = None
+        self.loaded_at = None
+        self.last_used = None
+        self.uses = 0
+
+    @property
+    def loaded(self):
+        return self._translator is not None
+
+    def _find_package(self):
+        for pkg in arg_pkg.get_installed_packages():
+            if pkg.from_code == self.source_code and pkg.to_code == self.target_code:
+                return pkg
+        return None
+
+    def load(self):
+        """Загружает модель (один раз, потокобезопасно)."""
+        if self._translator is not None:
+            return
+        with self._lock:
+            if self._translator is not None:
+                return
+            if not _load_argos():
+                raise RuntimeError("Argos Translate is not available")
+            import ctranslate2
+            import sentencepiece
+            started = time.perf_counter()
+            rss_before = _process_rss()
+            pkg = self._find_package()
+            if pkg is None:
+                raise RuntimeError(f"No Argos package for {self.source_code}->{self.target_code}")
+            package_path = str(pkg.package_path)
+            self._sp = sentencepiece.SentencePieceProcessor(model_file=os.path.join(package_path, "sentencepiece.model"))
+            self.target_prefix = getattr(pkg, "target_prefix", "") or ""
+            self._translator = ctranslate2.Translator(
+                os.path.join(package_path, "model"),
+                device=self.device,
+                compute_type=self.compute_type,
+                inter_threads=self.inter_threads,
+                intra_threads=self.intra_threads,
+            )
+            rss_after = _process_rss()
+            self.load_sec = time.perf_counter() - started
+            self.rss_delta_bytes = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            self.loaded_at = self.last_used = time.monotonic()
+            get_offline_model_manager().on_model_loaded(self)
+
+    def unload(self):
+        """Выгружает модель; False, если она сейчас переводит (выгрузим при следующей проверке)."""
+        with self._lock:
+            if self._in_use:
+                return False
+            self._translator = None
+            self._sp = None
+            self.loaded_at = None
+            return True
+
+    def _acquire(self):
+        """Загружает модель и отмечает её занятой; возвращает (translator, sp)."""
+        while True:
+            self.load()
+            with self._lock:
+                if self._translator is not None:  # между load() и блокировкой могли выгрузить
+                    self._in_use += 1
+                    return self._translator, self._sp
+
+    def _release(self):
+        with self._lock:
+            self._in_use -= 1
+            self.last_used = time.monotonic()
+
+    def translate_segments(self, segments):
+        """Переводит список сегментов (предложений) пакетами по max_batch_size."""
+        if not segments:
+            return []
+        translator, sp = self._acquire()
+        try:
+            results = []
+            for start in range(0, len(segments), self.max_batch_size):
+                batch = segments[start:start + self.max_batch_size]
+                tokens = sp.encode(batch, out_type=str)
+                kwargs = {}
+                if self.target_prefix:
+                    kwargs["target_prefix"] = [[self.target_prefix]] * len(batch)
+                output = translator.translate_batch(
+                    tokens,
+                    beam_size=self.beam_size,
+                    max_batch_size=self.max_batch_size,
+                    **kwargs
+                )
+                for item in output:
+                    hypothesis = item.hypotheses[0]
+                    if self.target_prefix and hypothesis and hypothesis[0] == self.target_prefix:
+                        hypothesis = hypothesis[1:]
+                    results.append(sp.decode(hypothesis))
+            return results
+        finally:
+            self._release()
+
+    def translate_many(self, texts):
+        """Переводит несколько текстов одним пакетом, сохраняя разбиение на строки."""
+        unique = {}
+        layouts = []
+        for text in texts:
+            lines = []
+            for line in text.replace('\r\n', '\n').split('\n'):
+                parts = [p for p in _SENTENCE_SPLIT_RE.split(line.strip()) if p]
+                lines.append([unique.setdefault(p, len(unique)) for p in parts])
+            layouts.append(lines)
+        translated = self.translate_segments(list(unique))
+        self._touch()
+        return ['\n'.join(' '.join(translated[i] for i in line) for line in lines) for lines in layouts]
+
+    def translate(self, text):
+        return self.translate_many([text])[0]
+
+    def _touch(self):
+        self.last_used = time.monotonic()
+        self.uses += 1
+
+def get_offline_engine(source_code, target_code):
+    """Возвращает закэшированный офлайн-движок или None, если ctranslate2 недоступен."""
+    key = (source_code, target_code)
+    engine = _offline_engines.get(key)
+    if engine is not None:
+        return engine
+    if not _load_argos():
+        return None
+    if importlib.util.find_spec("ctranslate2") is None or importlib.util.find_spec("sentencepiece") is None:
+        return None
+    with _offline_engines_lock:
+        engine = _offline_engines.get(key)
+        if engine is None:
+            engine = OfflineTranslationEngine(source_code, target_code, **get_offline_engine_settings())
+            _offline_engines[key] = engine
+    return engine
+
+def _process_rss():
+    """RSS текущего процесса в байтах (None, если psutil недоступен)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+# Пары, которые держим в памяти
+OFFLINE_MODEL_PAIRS = (("ru", "en"), ("en", "ru"))
+
+class OfflineModelManager:
+    """Держит модели офлайн-перевода в памяти и выгружает их после простоя.
+
+    Модели грузятся последовательно (под одной блокировкой), поэтому прирост
+    RSS при загрузке можно честно приписать конкретной модели.
+    """
+
+    def __init__(self):
+        self._load_lock = threading.Lock()
+        self._idle_thread = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def idle_unload_sec():
+        """Через сколько секунд простоя выгружать модели (0 — никогда)."""
+        minutes = get_cached_translator_config().get("argos_idle_unload_min", 30)
+        try:
+            return max(0.0, float(minutes) * 60)
+        except (TypeError, ValueError):
+            return 30 * 60.0
+
+    def preload(self, pairs=OFFLINE_MODEL_PAIRS, background=True):
+        """Загружает модели заранее; background=True — в отдельном потоке."""
+        if background:
+            threading.Thread(target=self.preload, args=(pairs, False), name="argos-preload", daemon=True).start()
+            return
+        for source_code, target_code in pairs:
+            engine = get_offline_engine(source_code, target_code)
+            if engine is None or engine.loaded:
+                continue
+            with self._load_lock:
+                try:
+                    engine.load()
+                except Exception as e:
+                    print(f"Preload of {source_code}->{target_code} failed: {e}")
+
+    def on_model_loaded(self, engine):
+        rss = f"{engine.rss_delta_bytes / (1024 * 1024):.0f} MB" if engine.rss_delta_bytes is not None else "n/a"
+        print(f"Offline model {engine.source_code}->{engine.target_code} loaded in {engine.load_sec:.2f}s (RSS +{rss})")
+        self._start_idle_watch()
+
+    def unload_all(self):
+        for engine in list(_offline_engines.values()):
+            engine.unload()
+
+    def unload_idle(self, now=None):
+        """Выгружает модели, не использовавшиеся дольше idle_unload_sec()."""
+        idle_sec = self.idle_unload_sec()
+        if not idle_sec:
+            return []
+        now = time.monotonic() if now is None else now
+        unloaded = []
+        for engine in list(_offline_engines.values()):
+            if engine.loaded and engine.last_used is not None and now - engine.last_used > idle_sec:
+                if not engine.unload():
+                    continue  # идёт перевод — модель не простаивает
+                unloaded.append((engine.source_code, engine.target_code))
+        if unloaded:
+            import gc
+            gc.collect()
+            print(f"Unloaded idle offline models: {unloaded}")
+        return unloaded
+
+    def _start_idle_watch(self):
+        if self._idle_thread is not None and self._idle_thread.is_alive():
+            return
+        self._idle_thread = threading.Thread(target=self._idle_loop, name="argos-idle", daemon=True)
+        self._idle_thread.start()
+
+    def _idle_loop(self):
+        while not self._stop.wait(60):
+            self.unload_idle()
+            if not any(e.loaded for e in _offline_engines.values()):
+                return
+
+    def stats(self):
+        """Время загрузки, память и использование по каждой модели."""
+        now = time.monotonic()
+        models = {}
+        for (source_code, target_code), engine in list(_offline_engines.items()):
+            models[f"{source_code}->{target_code}"] = {
+                "loaded": engine.loaded,
+                "load_sec": round(engine.load_sec, 3) if engine.load_sec is not None else None,
+                "rss_delta_bytes": engine.rss_delta_bytes,
+                "uses": engine.uses,
+                "idle_sec": round(now - engine.last_used, 1) if engine.last_used is not None else None,
+                "compute_type": engine.compute_type,
+            }
+        return {
+            "process_rss_bytes": _process_rss(),
+            "idle_unload_sec": self.idle_unload_sec(),
+            "models": models,
+        }
+
+_offline_model_manager = None
+
+def get_offline_model_manager():
+    global _offline_model_manager
+    if _offline_model_manager is None:
+        _offline_model_manager = OfflineModelManager()
+    return _offline_model_manager
+
+def get_offline_model_stats():
+    """API для UI/диагностики: время загрузки и RSS моделей офлайн-перевода."""
+    return get_offline_model_manager().stats()
+
 # --- helper to auto-install ru<->en models on first run ---
 
 def models_installed_ru_en():
@@ -83,11 +391,15 @@ def models_installed_ru_en():
     except Exception:
         return False
 
+_models_ready = False
+
 def ensure_models(status_callback=None):
-    if not HAS_ARGOS:
+    global _models_ready
+    if _models_ready or not HAS_ARGOS:
         return
     langs = _get_argos_languages()
     if {'ru', 'en'}.issubset(langs.keys()):
+        _models_ready = True
         return  # обе модели уже есть
     try:
         install_models(status_callback=status_callback)
@@ -101,7 +413,7 @@ def ensure_models(status_callback=None):
         print(f"Не удалось автоматически установить модели Argos Translate: {e}")
 
 def install_models(status_callback=None):
-    if not HAS_ARGOS:
+    if not _load_argos():
         return
     if status_callback:
         try:
@@ -184,7 +496,7 @@ def install_models(status_callback=None):
     _invalidate_argos_cache()
 
 def test_translation():
-    if not HAS_ARGOS:
+    if not _load_argos():
         print("Argos недоступен в этой сборке.")
         return
     installed_languages = arg_tr.get_installed_languages()
@@ -214,7 +526,62 @@ def test_translation():
     else:
         print("Нет модели для EN->RU")
 
+# Направления, для которых есть офлайн-словарь (dictionary.py)
+DICTIONARY_DIRECTIONS = {("ru", "en"), ("en", "ru")}
+
+def _get_dictionary():
+    """Офлайн-словарь, привязанный к текущему движку: после смены translator_engine
+    выученные из прежнего движка записи удаляются (set_engine дёшев, если движок тот же)."""
+    import dictionary
+    shared = dictionary.get_dictionary()
+    shared.set_engine(get_cached_translator_config().get("translator_engine", "Argos").lower())
+    return shared
+
+def forget_learned_translations():
+    """Очистка истории: память переводов и выученные записи словаря."""
+    import translation_memory
+    translation_memory.reset_translation_memory()
+    import dictionary
+    dictionary.get_dictionary().forget_learned()
+
+def _dictionary_lookup(text, source_code, target_code):
+    """Быстрый путь для одного слова / короткой фразы. None — промах или выключено."""
+    if (source_code, target_code) not in DICTIONARY_DIRECTIONS:
+        return None
+    if not get_cached_translator_config().get("dictionary_fast_path", True):
+        return None
+    import dictionary
+    if not dictionary.is_short_text(text):
+        return None
+    try:
+        return _get_dictionary().lookup(text, source_code, target_code)
+    except Exception as e:
+        print(f"Dictionary lookup failed: {e}")
+        return None
+
 def translate_text(text, source_code, target_code, status_callback=None):
+    """Перевод текста: офлайн-словарь (короткие фразы), память переводов, затем движки."""
+    cached = _dictionary_lookup(text, source_code, target_code)
+    if cached is not None:
+        print("🌐 Using translator: DICTIONARY")
+        return cached
+    config = get_cached_translator_config()
+    use_memory = config.get("translation_memory", True)
+    if use_memory:
+        import translation_memory
+        cached = translation_memory.lookup(text, source_code, target_code,
+                                           threshold=config.get("translation_memory_threshold"))
+        if cached is not None:
+            print("🌐 Using translator: MEMORY")
+            return cached
+    result = _translate_with_engines(text, source_code, target_code, status_callback)
+    if use_memory:
+        translation_memory.remember(text, result, source_code, target_code)
+    if (source_code, target_code) in DICTIONARY_DIRECTIONS and config.get("dictionary_fast_path", True):
+        _get_dictionary().learn(text, result, source_code, target_code)
+    return result
+
+def _translate_with_engines(text, source_code, target_code, status_callback=None):
     """Перевод текста с выбранным движком и автоматическим фоллбеком."""
     engine = get_cached_translator_config().get("translator_engine", "Argos").lower()
     print(f"🌐 Using translator: {engine.upper()}")  # Логирование переводчика
@@ -234,29 +601,37 @@ def translate_text(text, source_code, target_code, status_callback=None):
         raise ValueError(f"Unknown engine: {name}")
 
     if engine in online_engines:
-        try:
-            return _call_online(engine, text, source_code, target_code)
-        except Exception as e:
-            # Фоллбек на другие онлайн-переводчики
-            for name in online_engines:
-                if name != engine:
-                    try:
-                        return _call_online(name, text, source_code, target_code)
-                    except Exception:
-                        continue
-            # Последний шанс — Argos офлайн
-            if HAS_ARGOS:
-                pass  # продолжаем ниже
-            else:
-                raise e
+        # Движки без запаса по лимитам пропускаем заранее, не дожидаясь ошибки
+        candidates = _get_quota_manager().rank([engine] + [n for n in online_engines if n != engine], len(text))
+        if candidates[:1] != [engine]:
+            print(f"⏭ {engine.upper()} is over its quota, trying: {', '.join(candidates) or 'offline'}")
+        first_error = None
+        for name in candidates:
+            try:
+                return _call_online(name, text, source_code, target_code)
+            except Exception as e:
+                # Фоллбек на другие онлайн-переводчики
+                first_error = first_error or e
+        # Последний шанс — Argos офлайн
+        if not _load_argos():
+            import quota
+            raise first_error or quota.QuotaExceededError("All online translators are over their limits")
 
     # Offline (Argos), если доступен
-    if not HAS_ARGOS:
+    if not _load_argos():
         # Нет Argos — используем Google как дефолт
         return google_translate(text, source_code, target_code)
 
     ensure_models(status_callback=status_callback)
 
+    # Пакетный движок на ctranslate2 (модель загружается один раз и переиспользуется)
+    offline_engine = get_offline_engine(source_code, target_code)
+    if offline_engine is not None:
+        try:
+            return offline_engine.translate(text)
+        except Exception as e:
+            print(f"Offline engine failed, falling back to Argos: {e}")
+
     # Используем кэшированный объект перевода
     translation_obj = _get_translation_object(source_code, target_code)
     if translation_obj is None:
@@ -264,81 +639,363 @@ def translate_text(text, source_code, target_code, status_callback=None):
 
     return translation_obj.translate(text)
 
+# --- HTTP: пул соединений, прогрев и keep-alive ---
+
+# Размер пула на хост (параллельные запросы к одному хосту)
+HTTP_POOL_MAXSIZE = 4
+# Через сколько секунд простоя освежать соединение (серверы закрывают idle keep-alive,
+# Google — примерно через 4 минуты, публичные инстансы — раньше)
+KEEPALIVE_REFRESH_SEC = 45
+# После скольких секунд без переводов перестаём поддерживать соединения
+KEEPALIVE_MAX_IDLE_SEC = 30 * 60
+
 # Кэшированная сессия для HTTP запросов
 _http_session = None
+_http_lock = threading.Lock()
+_http_host_stats = {}  # base url -> {"requests", "errors", "last_used", "first_ms", "total_ms"}
+_keepalive_thread = None
+_keepalive_stop = threading.Event()
+_last_translation_time = 0.0
 
 def _get_http_session():
-    """Возвращает переиспользуемую HTTP сессию."""
+    """Возвращает переиспользуемую HTTP сессию с пулом соединений на каждый хост."""
     global _http_session
     if _http_session is None:
-        _http_session = requests.Session()
-        # Оптимизация: keep-alive и пул соединений
-        _http_session.headers.update({'Connection': 'keep-alive'})
+        with _http_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Оптимизация: keep-alive и пул соединений
+                session.headers.update({'Connection': 'keep-alive'})
+                adapter = HTTPAdapter(
+                    pool_connections=len(_ENGINE_HOSTS) + 8,  # все хосты движков и инстансы-фоллбеки
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _http_session = session
     return _http_session
 
-def google_translate(text, source_code, target_code):
-    """Google Translate через публичный endpoint."""
-    url = 'https://translate.googleapis.com/translate_a/single'
+def _base_url(url):
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _http_request(method, url, engine=None, **kwargs):
+    """Выполняет запрос через общую сессию и учитывает его в метриках хоста.
+
+    engine — имя движка для учёта 429 в менеджере квот.
+    """
+    global _last_translation_time
+    session = _get_http_session()
+    host = _base_url(url)
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except Exception:
+        with _http_lock:
+            _http_host_stats.setdefault(host, _new_host_stats())["errors"] += 1
+        raise
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    now = time.monotonic()
+    with _http_lock:
+        stats = _http_host_stats.setdefault(host, _new_host_stats())
+        stats["requests"] += 1
+        stats["last_used"] = now
+        stats["total_ms"] += elapsed_ms
+        if stats["first_ms"] is None:
+            stats["first_ms"] = elapsed_ms
+    if method != 'HEAD':
+        _last_translation_time = now
+    if engine is not None and response.status_code == 429:
+        # У движков с несколькими публичными инстансами блокируем только ответивший
+        _get_quota_manager().record_throttled(engine, response.headers.get('Retry-After'),
+                                              host=host if engine in _ENGINE_INSTANCES else None)
+    return response
+
+def _get_quota_manager():
+    """Менеджер лимитов онлайн-движков (quota.py) с переопределениями из config.json."""
+    import quota
+    return quota.get_quota_manager(get_cached_translator_config().get("engine_limits"))
+
+def get_quota_status():
+    """API для UI/диагностики: остаток лимитов и дневного бюджета по движкам."""
+    return _get_quota_manager().status()
+
+def _new_host_stats():
+    return {"requests": 0, "errors": 0, "last_used": 0.0, "first_ms": None, "total_ms": 0.0}
+
+def get_connection_stats():
+    """Метрики переиспользования соединений по хостам.
+
+    connections — сколько TCP/TLS соединений открыл urllib3, reused — сколько
+    запросов обслужено уже открытым соединением.
+    """
+    pools = {}
+    session = _http_session
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            pool_manager = getattr(adapter, 'poolmanager', None)
+            if pool_manager is None:
+                continue
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}"
+                if pool.port and pool.port not in (80, 443):
+                    host += f":{pool.port}"
+                pools[host] = pool
+    now = time.monotonic()
+    result = {}
+    with _http_lock:
+        for host, stats in _http_host_stats.items():
+            pool = pools.get(host)
+            connections = getattr(pool, 'num_connections', 0) if pool else 0
+            pool_requests = getattr(pool, 'num_requests', stats["requests"]) if pool else stats["requests"]
+            result[host] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "connections": connections,
+                "reused": max(pool_requests - connections, 0),
+                "first_ms": round(stats["first_ms"], 1) if stats["first_ms"] is not None else None,
+                "avg_ms": round(stats["total_ms"] / stats["requests"], 1) if stats["requests"] else None,
+                "idle_sec": round(now - stats["last_used"], 1) if stats["last_used"] else None,
+            }
+    return result
+
+def reset_http_session(reconnect=True):
+    """Закрывает сессию (очистка кэша) и, если нужно, сразу пересоздаёт соединение."""
+    global _http_session
+    with _http_lock:
+        session, _http_session = _http_session, None
+        _http_host_stats.clear()
+    if session is not None:
+        try:
+            session.close()
+        except Exception:
+            pass
+    if reconnect:
+        threading.Thread(target=warm_up_http, daemon=True).start()
+
+# Хосты онлайн-движков (для прогрева DNS/TCP/TLS)
+_ENGINE_HOSTS = {
+    'google': 'https://translate.googleapis.com',
+    'mymemory': 'https://api.mymemory.translated.net',
+    'lingva': 'https://lingva.ml',
+    'libretranslate': 'https://libretranslate.com',
+}
+
+def _ping_host(host):
+    try:
+        # Ответ не важен: нужен только установленный keep-alive сокет в пуле сессии
+        _http_request('HEAD', host, timeout=5, allow_redirects=False)
+        return True
+    except Exception as e:
+        print(f"HTTP warm-up for {host} failed: {e}")
+        return False
+
+def warm_up_http(engine=None):
+    """Создаёт HTTP сессию и заранее устанавливает соединение с хостом движка.
+
+    Заодно запускает поток, который освежает простаивающее соединение до того,
+    как сервер закроет его по таймауту.
+    """
+    global _last_translation_time
+    engine = (engine or get_cached_translator_config().get("translator_engine", "Google")).lower()
+    _get_http_session()
+    host = _ENGINE_HOSTS.get(engine)
+    if not host:
+        return
+    if not _last_translation_time:
+        _last_translation_time = time.monotonic()
+    _ping_host(host)
+    _start_keepalive()
+
+def _start_keepalive():
+    global _keepalive_thread
+    with _http_lock:
+        if _keepalive_thread is not None and _keepalive_thread.is_alive():
+            return
+        _keepalive_stop.clear()
+        _keepalive_thread = threading.Thread(target=_keepalive_loop, name="http-keepalive", daemon=True)
+        _keepalive_thread.start()
+
+def stop_keepalive():
+    _keepalive_stop.set()
+
+def _keepalive_loop():
+    while not _keepalive_stop.wait(KEEPALIVE_REFRESH_SEC / 3):
+        now = time.monotonic()
+        if now - _last_translation_time > KEEPALIVE_MAX_IDLE_SEC:
+            continue  # пользователь давно не переводил — не держим соединения
+        engine = get_cached_translator_config().get("translator_engine", "Google").lower()
+        host = _ENGINE_HOSTS.get(engine)
+        if not host or _http_session is None:
+            continue
+        with _http_lock:
+            last_used = _http_host_stats.get(host, {}).get("last_used", 0.0)
+        if now - last_used >= KEEPALIVE_REFRESH_SEC:
+            _ping_host(host)
+
+def warm_up_argos():
+    """Загружает модели Argos ru<->en заранее (без скачивания, если их нет)."""
+    if not models_installed_ru_en():
+        return
+    get_offline_model_manager().preload(background=False)
+    for source_code, target_code in OFFLINE_MODEL_PAIRS:
+        offline_engine = get_offline_engine(source_code, target_code)
+        if offline_engine is not None and offline_engine.loaded:
+            continue
+        translation_obj = _get_translation_object(source_code, target_code)
+        if translation_obj is not None:
+            # Модель ctranslate2 загружается лениво при первом переводе
+            translation_obj.translate("ok")
+
+# Google: весь текст в query-параметре GET упирался в лимит длины URL, поэтому
+# текст отправляется POST-запросами, а длинный — кусками по границам предложений
+# параллельно (не больше размера пула соединений) и склеивается по порядку.
+GOOGLE_TRANSLATE_URL = 'https://translate.googleapis.com/translate_a/single'
+GOOGLE_CHUNK_CHARS = 1800
+_CHUNK_BOUNDARY_RE = re.compile(r'(\n+|(?<=[.!?…])[ \t]+)')
+_google_chunk_executor = None
+
+def split_text_chunks(text, max_chars=GOOGLE_CHUNK_CHARS):
+    """Делит текст на куски не длиннее max_chars по границам строк и предложений.
+
+    Возвращает [(chunk, separator)]: separator — пробелы/переводы строк после
+    куска, так что ''.join(c + s for c, s in chunks) == text.
+    """
+    parts = _CHUNK_BOUNDARY_RE.split(text)
+    units = []  # (фрагмент, разделитель после него)
+    for i in range(0, len(parts), 2):
+        unit, sep = parts[i], parts[i + 1] if i + 1 < len(parts) else ''
+        # Предложение длиннее лимита режем по последнему пробелу (или жёстко)
+        while len(unit) > max_chars:
+            cut = unit.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                units.append((unit[:max_chars], ''))
+                unit = unit[max_chars:]
+            else:
+                units.append((unit[:cut], ' '))
+                unit = unit[cut + 1:]
+        units.append((unit, sep))
+
+    chunks = []
+    current, current_sep = '', ''
+    for unit, sep in units:
+        if (current or current_sep) and len(current) + len(current_sep) + len(unit) > max_chars:
+            chunks.append((current, current_sep))
+            current, current_sep = unit, sep
+        else:
+            current += current_sep + unit
+            current_sep = sep
+    if current or current_sep or not chunks:
+        chunks.append((current, current_sep))
+    return chunks
+
+def _google_post(text, source_code, target_code):
+    if not text.strip():
+        return text
     params = {
         'client': 'gtx',
         'sl': source_code,
         'tl': target_code,
         'dt': 't',
-        'q': text,
     }
-    session = _get_http_session()
-    r = session.get(url, params=params, timeout=10)
+    r = _http_request('POST', GOOGLE_TRANSLATE_URL, engine='google', params=params, data={'q': text}, timeout=10)
     r.raise_for_status()
     data = r.json()
     return ''.join(seg[0] for seg in data[0] if seg and seg[0])
 
-def mymemory_translate(text, source_code, target_code):
+def _get_google_chunk_executor():
+    global _google_chunk_executor
+    if _google_chunk_executor is None:
+        with _http_lock:
+            if _google_chunk_executor is None:
+                _google_chunk_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="google-chunk")
+    return _google_chunk_executor
+
+def _google_request(text, source_code, target_code):
+    """Google Translate через публичный endpoint (блокирующий запрос)."""
+    chunks = split_text_chunks(text)
+    if len(chunks) == 1:
+        chunk, sep = chunks[0]
+        return _google_post(chunk, source_code, target_code) + sep
+    executor = _get_google_chunk_executor()
+    futures = [executor.submit(_google_post, chunk, source_code, target_code) for chunk, _ in chunks]
+    return ''.join(future.result() + sep for future, (_, sep) in zip(futures, chunks))
+
+MYMEMORY_URL = 'https://api.mymemory.translated.net/get'
+
+# Публичные инстансы Lingva и LibreTranslate (перебираются по порядку)
+LINGVA_INSTANCES = [
+    'https://lingva.ml',
+    'https://translate.plausibility.cloud',
+    'https://lingva.pussthecat.org',
+]
+LIBRETRANSLATE_INSTANCES = [
+    'https://libretranslate.com',
+    'https://translate.argosopentech.com',
+    'https://translate.terraprint.co',
+]
+# Движки с несколькими инстансами; списки читаются при вызове (бенчмарк их подменяет)
+_ENGINE_INSTANCES = {'lingva': 'LINGVA_INSTANCES', 'libretranslate': 'LIBRETRANSLATE_INSTANCES'}
+
+def _instances_for(engine):
+    return globals()[_ENGINE_INSTANCES[engine]]
+
+def _available_instances(engine):
+    """Инстансы движка без блокировки после 429; QuotaExceededError, если таких нет."""
+    quota_manager = _get_quota_manager()
+    instances = [url for url in _instances_for(engine) if not quota_manager.blocked_for(url)]
+    if not instances:
+        import quota
+        raise quota.QuotaExceededError(f"All {engine} instances are throttled")
+    return instances
+
+def _mymemory_request(text, source_code, target_code):
     """MyMemory - бесплатный API (до 5000 символов/день без регистрации)."""
-    url = 'https://api.mymemory.translated.net/get'
+    url = MYMEMORY_URL
     params = {
         'q': text,
         'langpair': f'{source_code}|{target_code}',
     }
-    session = _get_http_session()
-    r = session.get(url, params=params, timeout=10)
+    r = _http_request('GET', url, engine='mymemory', params=params, timeout=10)
     r.raise_for_status()
     data = r.json()
+    translated = (data.get('responseData') or {}).get('translatedText') or ''
+    if str(data.get('responseStatus')) in ('429', '403') or translated.startswith('MYMEMORY WARNING'):
+        # Дневная квота исчерпана — до завтра MyMemory не используем
+        import quota
+        _get_quota_manager().record_exhausted('mymemory')
+        raise quota.QuotaExceededError(f"MyMemory quota exceeded: {data.get('responseDetails') or translated}")
     if data.get('responseStatus') == 200:
-        return data['responseData']['translatedText']
+        return translated
     raise Exception(f"MyMemory error: {data.get('responseDetails', 'Unknown error')}")
 
-def lingva_translate(text, source_code, target_code):
+def _lingva_request(text, source_code, target_code):
     """Lingva - прокси для Google Translate (более стабильный)."""
-    # Список публичных инстансов Lingva
-    instances = [
-        'https://lingva.ml',
-        'https://translate.plausibility.cloud',
-        'https://lingva.pussthecat.org',
-    ]
-    session = _get_http_session()
     last_error = None
-    for base_url in instances:
+    for base_url in _available_instances('lingva'):
         try:
-            url = f'{base_url}/api/v1/{source_code}/{target_code}/{requests.utils.quote(text)}'
-            r = session.get(url, timeout=8)
+            url = f'{base_url}/api/v1/{source_code}/{target_code}/{urllib.parse.quote(text)}'
+            r = _http_request('GET', url, engine='lingva', timeout=8)
             if r.status_code == 200:
                 data = r.json()
                 return data.get('translation', '')
+            last_error = f"{base_url}: HTTP {r.status_code}"
         except Exception as e:
             last_error = e
             continue
     raise Exception(f"Lingva translate failed: {last_error}")
 
-def libretranslate(text, source_code, target_code):
+def _libretranslate_request(text, source_code, target_code):
     """LibreTranslate - открытый переводчик (публичные серверы)."""
-    instances = [
-        'https://libretranslate.com',
-        'https://translate.argosopentech.com',
-        'https://translate.terraprint.co',
-    ]
-    session = _get_http_session()
     last_error = None
-    for base_url in instances:
+    for base_url in _available_instances('libretranslate'):
         try:
             url = f'{base_url}/translate'
             payload = {
@@ -347,17 +1004,168 @@ def libretranslate(text, source_code, target_code):
                 'target': target_code,
                 'format': 'text'
             }
-            r = session.post(url, json=payload, timeout=10)
+            r = _http_request('POST', url, engine='libretranslate', json=payload, timeout=10)
             if r.status_code == 200:
                 data = r.json()
                 return data.get('translatedText', '')
+            last_error = f"{base_url}: HTTP {r.status_code}"
         except Exception as e:
             last_error = e
             continue
     raise Exception(f"LibreTranslate failed: {last_error}")
 
+# --- Асинхронный клиент перевода с объединением одинаковых запросов ---
+# Блокирующие адаптеры выполняются в пуле потоков поверх общей HTTP сессии (пул
+# соединений из _get_http_session), а asyncio-цикл в отдельном потоке отвечает за
+# single-flight и лимит параллельных запросов на хост.
+
+# Сколько одновременных запросов допускаем к одному движку/хосту
+HOST_CONCURRENCY = 2
+
+_BLOCKING_ADAPTERS = {
+    'google': _google_request,
+    'mymemory': _mymemory_request,
+    'lingva': _lingva_request,
+    'libretranslate': _libretranslate_request,
+}
+
+class AsyncTranslationClient:
+    """Клиент онлайн-перевода на asyncio.
+
+    Одинаковые запросы (engine, source, target, text), выполняющиеся
+    одновременно, разделяют одну задачу. Из Qt-потоков клиент используется
+    через мост: submit() возвращает concurrent.futures.Future,
+    translate_sync() блокирует вызывающий поток до результата.
+    """
+
+    def __init__(self, max_workers=8, per_host=HOST_CONCURRENCY):
+        self.per_host = per_host
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate-http")
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> asyncio.Task (доступ только из потока цикла)
+        self._semaphores = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="translate-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _semaphore(self, engine):
+        sem = self._semaphores.get(engine)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host)
+            self._semaphores[engine] = sem
+        return sem
+
+    async def translate(self, engine, text, source_code, target_code):
+        """Корутина перевода — только в цикле клиента (из других циклов — через submit())."""
+        key = (engine, source_code, target_code, text)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(engine, text, source_code, target_code))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, key=key: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # shield: отмена одного ожидающего не отменяет запрос для остальных
+        return await asyncio.shield(task)
+
+    async def _request(self, engine, text, source_code, target_code):
+        adapter = _BLOCKING_ADAPTERS.get(engine)
+        if adapter is None:
+            raise ValueError(f"Unknown engine: {engine}")
+        # Лимиты движка: QuotaExceededError сразу, короткое ожидание токена — здесь
+        quota_manager = _get_quota_manager()
+        wait = quota_manager.reserve(engine, len(text))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._semaphore(engine):
+            self.stats["requests"] += 1
+            loop = asyncio.get_running_loop()
+            result = None
+            try:
+                result = await loop.run_in_executor(self._executor, adapter, text, source_code, target_code)
+                return result
+            finally:
+                # Нет перевода (сетевая ошибка, 429/5xx на всех инстансах, пустой ответ) —
+                # символы бюджета не израсходованы
+                if not result:
+                    quota_manager.refund(engine, len(text))
+
+    def submit(self, engine, text, source_code, target_code):
+        """Мост для потоков: запускает перевод и возвращает concurrent.futures.Future."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.translate(engine, text, source_code, target_code), loop)
+
+    def translate_sync(self, engine, text, source_code, target_code, timeout=None):
+        """Блокирующий мост (QThread, GUI-поток, обработчики хоткеев)."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("translate_sync() cannot be called from the client event loop")
+        return self.submit(engine, text, source_code, target_code).result(timeout)
+
+_translation_client = None
+_translation_client_lock = threading.Lock()
+
+def get_translation_client():
+    """Общий асинхронный клиент перевода (создаётся при первом обращении)."""
+    global _translation_client
+    if _translation_client is None:
+        with _translation_client_lock:
+            if _translation_client is None:
+                _translation_client = AsyncTranslationClient()
+    return _translation_client
+
+# Корутины для чужих циклов: работа передаётся в цикл клиента (там _inflight и
+# семафоры), вызывающий цикл только ждёт результат
+async def _translate_async(engine, text, source_code, target_code):
+    return await asyncio.wrap_future(get_translation_client().submit(engine, text, source_code, target_code))
+
+async def google_translate_async(text, source_code, target_code):
+    return await _translate_async('google', text, source_code, target_code)
+
+async def mymemory_translate_async(text, source_code, target_code):
+    return await _translate_async('mymemory', text, source_code, target_code)
+
+async def lingva_translate_async(text, source_code, target_code):
+    return await _translate_async('lingva', text, source_code, target_code)
+
+async def libretranslate_async(text, source_code, target_code):
+    return await _translate_async('libretranslate', text, source_code, target_code)
+
+# Синхронные обёртки (прежний API) — через мост клиента, с объединением запросов
+def google_translate(text, source_code, target_code):
+    """Google Translate через публичный endpoint."""
+    return get_translation_client().translate_sync('google', text, source_code, target_code)
+
+def mymemory_translate(text, source_code, target_code):
+    """MyMemory - бесплатный API (до 5000 символов/день без регистрации)."""
+    return get_translation_client().translate_sync('mymemory', text, source_code, target_code)
+
+def lingva_translate(text, source_code, target_code):
+    """Lingva - прокси для Google Translate (более стабильный)."""
+    return get_translation_client().translate_sync('lingva', text, source_code, target_code)
+
+def libretranslate(text, source_code, target_code):
+    """LibreTranslate - открытый переводчик (публичные серверы)."""
+    return get_translation_client().translate_sync('libretranslate', text, source_code, target_code)
+
 if __name__ == '__main__':
-    if HAS_ARGOS:
+    if _load_argos():
         install_models()
         _invalidate_argos_cache()  # Сбрасываем кэш после установки
         print("Попытка тестового перевода:")
@@ -0,0 +1,238 @@
+"""Общие для всех окон стили и иконки: строятся и загружаются один раз на процесс.
+
+Раньше ScreenCaptureOverlay, TranslationOverlay, диалог перевода, сообщение
+«текст не распознан» и DarkThemeApp.apply_theme собирали большие строки
+стилей при каждом создании/смене темы, а LiveTranslationOverlay._pulse каждые
+500 мс ставил индикатору новый стиль — каждый setStyleSheet разбирает CSS и
+заново полирует виджет. Иконки каждый раз читались с диска. Теперь:
+
+* get_stylesheet(key, build) — строка стиля строится один раз на ключ
+  (имя, тема, ...); apply_stylesheet() не трогает виджет, если у него уже
+  этот стиль;
+* get_icon(path) — один общий QIcon на файл;
+* пульсация индикатора Live меняет только цвет текста в палитре виджета
+  (стиль без color), стиль не разбирается и не применяется заново;
+* preload(theme) — прогрев стилей и иконок текущей темы (задача warmup.py).
+"""
+import os
+import sys
+
+_icons = {}
+_stylesheets = {}
+
+# Иконки, нужные сразу после старта (главное окно и оверлеи выделения)
+PRELOAD_ICONS = (
+    "icons/icon.ico", "icons/icon.png", "icons/Russian_flag.png", "icons/American_flag.png",
+    "icons/settings_light.png", "icons/settings_dark.png", "icons/light_home.png", "icons/dark_home.png",
+    "icons/sun.png", "icons/moon.png", "icons/faq_black_theme.png", "icons/faq_white_theme.png",
+)
+
+
+def _resource_path(relative_path):
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def get_icon(relative_path):
+    """Общий QIcon для файла из каталога ресурсов (читается с диска один раз)."""
+    icon = _icons.get(relative_path)
+    if icon is None:
+        from PyQt5.QtGui import QIcon
+        icon = QIcon(_resource_path(relative_path))
+        _icons[relative_path] = icon
+    return icon
+
+
+def get_stylesheet(key, build):
+    """Стиль по ключу; build() вызывается только при первом обращении."""
+    sheet = _stylesheets.get(key)
+    if sheet is None:
+        sheet = build()
+        _stylesheets[key] = sheet
+    return sheet
+
+
+def apply_stylesheet(widget, sheet):
+    """setStyleSheet, только если у виджета другой стиль (та же строка — всё равно полный re-polish)."""
+    if getattr(widget, "_applied_stylesheet", None) is sheet:
+        return
+    widget.setStyleSheet(sheet)
+    widget._applied_stylesheet = sheet
+
+
+# --- Стили, общие для модулей ---
+
+# Выбор языка на оверлее выделения (Photoshop-style: тёмный, с градиентом)
+OVERLAY_LANG_COMBO_STYLE = """
+    QComboBox {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(60, 60, 60, 240),
+            stop:0.5 rgba(45, 45, 45, 245),
+            stop:1 rgba(35, 35, 35, 250));
+        color: #e8e8e8;
+        border: 1px solid rgba(80, 80, 80, 200);
+        border-top: 1px solid rgba(100, 100, 100, 150);
+        border-radius: 8px;
+        padding: 10px 16px;
+        font-size: 16px;
+        font-weight: 600;
+        font-family: 'Segoe UI', Arial, sans-serif;
+        min-width: 110px;
+    }
+    QComboBox:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(75, 75, 75, 245),
+            stop:0.5 rgba(55, 55, 55, 250),
+            stop:1 rgba(45, 45, 45, 255));
+        border: 1px solid rgba(100, 100, 100, 220);
+        border-top: 1px solid rgba(130, 130, 130, 180);
+    }
+    QComboBox:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 rgba(40, 40, 40, 250),
+            stop:1 rgba(55, 55, 55, 255));
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 24px;
+        subcontrol-origin: padding;
+        subcontrol-position: right center;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        width: 0;
+    }
+    QComboBox QAbstractItemView {
+        background-color: rgba(40, 40, 40, 252);
+        color: #e8e8e8;
+        border: 1px solid rgba(80, 80, 80, 200);
+        border-radius: 6px;
+        padding: 6px;
+        selection-background-color: rgba(80, 130, 200, 180);
+        outline: none;
+    }
+    QComboBox QAbstractItemView::item {
+        padding: 10px 14px;
+        border-radius: 4px;
+        margin: 2px;
+    }
+    QComboBox QAbstractItemView::item:hover {
+        background-color: rgba(70, 70, 70, 200);
+    }
+    QComboBox QAbstractItemView::item:selected {
+        background-color: rgba(80, 130, 200, 180);
+    }
+"""
+
+# Индикатор Live режима. Цвета текста в стиле нет — пульсация меняет его в палитре
+LIVE_INDICATOR_STYLE = """
+    QLabel {
+        background-color: rgba(0, 0, 0, 150);
+        padding: 2px 6px;
+        border-radius: 3px;
+        font-size: 10px;
+        font-weight: bold;
+    }
+"""
+LIVE_INDICATOR_COLORS = ("#aa2222", "#ff4444")  # (погашен, горит)
+
+
+def message_box_stylesheet(theme):
+    """Сообщение «текст не распознан» и подобные QMessageBox."""
+    def build():
+        dark = theme == "Темная"
+        return f"""
+            QMessageBox {{
+                background-color: {"#1a1a2e" if dark else "#ffffff"};
+            }}
+            QMessageBox QLabel {{
+                color: {"#ffffff" if dark else "#333333"};
+                font-size: 14px;
+            }}
+            QPushButton {{
+                background-color: #7A5FA1;
+                color: #ffffff;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 24px;
+                min-width: 80px;
+                font-size: 14px;
+            }}
+            QPushButton:hover {{
+                background-color: #8B70B2;
+            }}
+        """
+    return get_stylesheet(("message_box", theme), build)
+
+
+def translation_overlay_stylesheet(theme, opacity):
+    """Фон и полоса прокрутки TranslationOverlay (opacity — 0..100)."""
+    def build():
+        if theme == "Темная":
+            bg_r, bg_g, bg_b = 30, 30, 46
+            scroll_bg, scroll_handle = "#2E2E3E", "#555"
+        else:
+            bg_r, bg_g, bg_b = 255, 255, 255
+            scroll_bg, scroll_handle = "#f0f0f0", "#ccc"
+        alpha = int(opacity * 2.55)
+        return f"""
+            QTextBrowser {{
+                background-color: rgba({bg_r}, {bg_g}, {bg_b}, {alpha});
+                border: none;
+                padding: 8px;
+            }}
+            QScrollBar:vertical {{
+                background: {scroll_bg}; width: 8px; border-radius: 4px;
+            }}
+            QScrollBar::handle:vertical {{
+                background: {scroll_handle}; border-radius: 4px; min-height: 20px;
+            }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
+        """
+    return get_stylesheet(("translation_overlay", theme, opacity), build)
+
+
+def translation_dialog_stylesheet(theme):
+    """Popup с переводом целиком (фон, текст, прокрутка, кнопки) — один стиль на диалог."""
+    def build():
+        if theme == "Темная":
+            bg_color, text_color = "#121212", "#E0E0E0"
+            btn_bg, btn_border, btn_hover = "#1e1e1e", "#550000", "#333333"
+            scroll_bg, scroll_handle, scroll_hover = "#1e1e1e", "#555555", "#777777"
+        else:
+            bg_color, text_color = "#ffffff", "#1a1a1a"
+            btn_bg, btn_border, btn_hover = "#f0f0f0", "#cccccc", "#e0e0e0"
+            scroll_bg, scroll_handle, scroll_hover = "#f0f0f0", "#cccccc", "#aaaaaa"
+        return f"""
+            QDialog {{ background-color: {bg_color}; }}
+            QTextBrowser {{
+                background-color: {bg_color};
+                border: none;
+                padding: 4px;
+            }}
+            QScrollBar:vertical {{
+                background: {scroll_bg}; width: 8px; border-radius: 4px;
+            }}
+            QScrollBar::handle:vertical {{
+                background: {scroll_handle}; border-radius: 4px; min-height: 20px;
+            }}
+            QScrollBar::handle:vertical:hover {{ background: {scroll_hover}; }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
+            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{ background: none; }}
+            QPushButton {{
+                background-color: {btn_bg}; color: {text_color};
+                border: 1px solid {btn_border}; padding: 8px 16px; min-width: 80px;
+            }}
+            QPushButton:hover {{ background-color: {btn_hover}; }}
+        """
+    return get_stylesheet(("translation_dialog", theme), build)
+
+
+def preload(theme, overlay_opacity=85):
+    """Иконки и стили текущей темы — до первого хоткея (задача прогрева)."""
+    for path in PRELOAD_ICONS:
+        get_icon(path)
+    message_box_stylesheet(theme)
+    translation_overlay_stylesheet(theme, overlay_opacity)
+    translation_dialog_stylesheet(theme)
@@ -0,0 +1,307 @@
+"""Фоновый прогрев после старта event loop.
+
+Вместо синхронных warm_up()/prepare_overlay() до показа окна задачи прогрева
+выполняются, когда UI уже отрисован:
+
+* задачи с GUI-объектами (оверлеи) — в главном потоке, по одной за итерацию
+  event loop (QTimer.singleShot), чтобы не блокировать отрисовку;
+* остальные (OCR движки, модели Argos, HTTP/TLS соединение) — в одном фоновом
+  потоке с пониженным приоритетом.
+
+Порядок задач зависит от того, каким хоткеем пользователь пользуется чаще
+(статистика в data/usage_stats.json). Хоткей, нажатый во время прогрева, ждёт
+только нужные ему задачи: см. WarmupScheduler.ensure_for_mode().
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from PyQt5 import QtCore
+
+# Пауза между GUI-задачами, чтобы event loop успевал обработать ввод и отрисовку
+GUI_TASK_INTERVAL_MS = 30
+
+# Какие задачи нужны режиму, чтобы хоткей сработал без задержки
+MODE_REQUIREMENTS = {
+    "copy": ("overlay:copy", "ocr_engines"),
+    "translate": ("overlay:translate", "ocr_engines", "translator"),
+    "live": ("ocr_engines", "translator"),
+    "ocr": ("overlay:ocr", "ocr_engines"),
+}
+
+
+def _get_data_file(filename):
+    if hasattr(sys, '_MEIPASS'):
+        app_dir = sys._MEIPASS
+    else:
+        app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+    data_dir = os.path.join(app_dir, "data")
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    return os.path.join(data_dir, filename)
+
+
+# --- Статистика использования хоткеев ---
+_usage_lock = threading.Lock()
+_usage_cache = None
+
+
+def load_usage_stats():
+    """Возвращает {mode: count} с числом запусков каждого режима."""
+    global _usage_cache
+    with _usage_lock:
+        if _usage_cache is None:
+            try:
+                with open(_get_data_file("usage_stats.json"), "r", encoding="utf-8") as f:
+                    _usage_cache = {k: int(v) for k, v in json.load(f).items()}
+            except Exception:
+                _usage_cache = {}
+        return dict(_usage_cache)
+
+
+def _save_usage_stats_sync(stats):
+    path = _get_data_file("usage_stats.json")
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.warning(f"Failed to save usage stats: {e}")
+
+
+def record_mode_usage(mode):
+    """Учитывает запуск режима (вызывается из обработчиков хоткеев)."""
+    load_usage_stats()
+    with _usage_lock:
+        _usage_cache[mode] = _usage_cache.get(mode, 0) + 1
+        snapshot = dict(_usage_cache)
+    threading.Thread(target=_save_usage_stats_sync, args=(snapshot,), daemon=True).start()
+
+
+class WarmupTask:
+    """Одна задача прогрева. Идемпотентна: повторный run() ничего не делает."""
+
+    def __init__(self, name, func, gui=False):
+        self.name = name
+        self.func = func
+        self.gui = gui
+        self.done = threading.Event()
+        self.started = False
+        self.error = None
+        self.duration_ms = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        with self._lock:
+            if self.started:
+                return False
+            self.started = True
+        started = time.perf_counter()
+        try:
+            self.func()
+        except Exception as e:
+            self.error = e
+            logging.warning(f"Warm-up task {self.name} failed: {e}")
+        finally:
+            self.duration_ms = (time.perf_counter() - started) * 1000
+            self.done.set()
+        return True
+
+
+class WarmupScheduler(QtCore.QObject):
+    """Планировщик прогрева с состоянием готовности по каждой задаче."""
+
+    task_ready = QtCore.pyqtSignal(str)
+    all_ready = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = {}
+        self._gui_queue = []
+        self._worker_queue = []
+        self._queue_lock = threading.Lock()
+        self._worker = None
+        self._running = False
+        self._all_ready_emitted = False
+        # Сигнал из фонового потока доставляется в поток планировщика
+        self.task_ready.connect(self._on_task_ready)
+
+    # --- регистрация ---
+    def add_task(self, name, func, gui=False):
+        task = WarmupTask(name, func, gui=gui)
+        self.tasks[name] = task
+        with self._queue_lock:
+            (self._gui_queue if gui else self._worker_queue).append(task)
+        return task
+
+    def order_by_usage(self, usage=None):
+        """Сортирует очереди: сначала задачи самого используемого режима."""
+        usage = load_usage_stats() if usage is None else usage
+        modes = sorted(MODE_REQUIREMENTS, key=lambda m: usage.get(m, 0), reverse=True)
+        rank = {}
+        for mode in modes:
+            for name in MODE_REQUIREMENTS[mode]:
+                rank.setdefault(name, len(rank))
+        with self._queue_lock:
+            # sort стабилен: задачи вне MODE_REQUIREMENTS (например, импорт модулей) идут первыми
+            self._gui_queue.sort(key=lambda t: rank.get(t.name, -1))
+            self._worker_queue.sort(key=lambda t: rank.get(t.name, -1))
+
+    # --- выполнение ---
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._worker = threading.Thread(target=self._worker_loop, name="warmup", daemon=True)
+        self._worker.start()
+        QtCore.QTimer.singleShot(0, self._run_next_gui_task)
+
+    def _run_next_gui_task(self):
+        with self._queue_lock:
+            task = self._gui_queue.pop(0) if self._gui_queue else None
+        if task is None:
+            self._check_all_ready()
+            return
+        if task.run():
+            self.task_ready.emit(task.name)
+        QtCore.QTimer.singleShot(GUI_TASK_INTERVAL_MS, self._run_next_gui_task)
+
+    def _worker_loop(self):
+        # Фоновый прогрев не должен конкурировать с UI и хоткеями
+        try:
+            import ctypes
+            THREAD_PRIORITY_BELOW_NORMAL = -1
+            ctypes.windll.kernel32.SetThreadPriority(ctypes.windll.kernel32.GetCurrentThread(), THREAD_PRIORITY_BELOW_NORMAL)
+        except Exception:
+            pass
+        while True:
+            with self._queue_lock:
+                task = self._worker_queue.pop(0) if self._worker_queue else None
+            if task is None:
+                break
+            if task.run():
+                self.task_ready.emit(task.name)
+
+    def _on_task_ready(self, name):
+        task = self.tasks.get(name)
+        if task is not None and task.duration_ms is not None:
+            logging.info(f"🔥 Warm-up: {name} ready in {task.duration_ms:.0f} ms")
+        self._check_all_ready()
+
+    def _check_all_ready(self):
+        if self._all_ready_emitted:
+            return
+        if self.tasks and all(t.done.is_set() for t in self.tasks.values()):
+            self._all_ready_emitted = True
+            self.all_ready.emit()
+
+    # --- готовность ---
+    def is_ready(self, name):
+        task = self.tasks.get(name)
+        return task is None or task.done.is_set()
+
+    def readiness(self):
+        """Состояние прогрева: {name: 'pending' | 'running' | 'ready' | 'failed'}."""
+        state = {}
+        for name, task in self.tasks.items():
+            if task.done.is_set():
+                state[name] = "failed" if task.error else "ready"
+            else:
+                state[name] = "running" if task.started else "pending"
+        return state
+
+    def ensure(self, name, timeout=None):
+        """Гарантирует готовность задачи.
+
+        Если задача ещё не начата — выполняет её сразу в текущем потоке
+        (GUI-задачи допустимо вызывать только из главного потока). Если она
+        уже выполняется в фоне — ждёт её не дольше timeout секунд.
+        """
+        task = self.tasks.get(name)
+        if task is None:
+            return True
+        if not task.started:
+            with self._queue_lock:
+                for queue in (self._gui_queue, self._worker_queue):
+                    if task in queue:
+                        queue.remove(task)
+            if task.run():
+                self.task_ready.emit(task.name)
+        return task.done.wait(timeout)
+
+    def ensure_for_mode(self, mode, timeout=2.0):
+        """Готовит всё, что нужно режиму, до показа оверлея.
+
+        В главном потоке синхронно нужны только GUI-задачи (оверлей). Фоновые
+        задачи режима переносятся в начало очереди: к отпусканию мыши они
+        успевают завершиться, а OCR/перевод сами создадут недостающее.
+        """
+        needed = MODE_REQUIREMENTS.get(mode, ())
+        with self._queue_lock:
+            for name in reversed(needed):
+                task = self.tasks.get(name)
+                if task is not None and not task.gui and task in self._worker_queue:
+                    self._worker_queue.remove(task)
+                    self._worker_queue.insert(0, task)
+        for name in needed:
+            task = self.tasks.get(name)
+            if task is not None and task.gui:
+                self.ensure(name, timeout)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """Текущий планировщик прогрева (None, если прогрев не запускался)."""
+    return _scheduler
+
+
+def start_warmup(config, preload_modules=None):
+    """Создаёт и запускает планировщик прогрева по текущей конфигурации."""
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+
+    scheduler = WarmupScheduler()
+    if preload_modules is not None:
+        scheduler.add_task("modules", preload_modules)
+
+    def warm_ocr_engines():
+        import ocr
+        ocr.warm_up()
+
+    scheduler.add_task("ocr_engines", warm_ocr_engines)
+
+    engine = config.get("translator_engine", "Google").lower()
+
+    def warm_translator():
+        import translater
+        if engine != "argos":
+            translater.warm_up_http(engine)
+        # Argos — основной движок или офлайн-фоллбек, если включена предзагрузка
+        if engine == "argos" or config.get("argos_preload", False):
+            translater.warm_up_argos()
+
+    scheduler.add_task("translator", warm_translator)
+
+    def warm_ui_resources():
+        import ui_resources
+        ui_resources.preload(config.get("theme", "Темная"), config.get("overlay_opacity", 85))
+
+    scheduler.add_task("ui_resources", warm_ui_resources, gui=True)
+
+    for mode in ("copy", "translate", "ocr"):
+        def warm_overlay(mode=mode):
+            from ocr import prepare_overlay
+            prepare_overlay(mode)
+        scheduler.add_task(f"overlay:{mode}", warm_overlay, gui=True)
+
+    scheduler.order_by_usage()
+    _scheduler = scheduler
+    scheduler.start()
+    return scheduler